@@ -1,58 +1,636 @@
 import os
+import mmap
 import zlib
 import csv
+import io
+import json
+import re
 import argparse
+import functools
 import sys
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# Prefer an accelerated CRC32 implementation when one is installed. All
+# backends use the same zip/gzip polynomial as zlib.crc32 (identical output),
+# but isal/libdeflate fold with PCLMULQDQ/VPCLMULQDQ instead of relying on
+# however the local zlib happened to be built.
+def _load_crc32_backends():
+    """Return {name: crc32 function} for every installed CRC32 backend."""
+    backends = {'zlib': zlib.crc32}
+    try:
+        from isal.isal_zlib import crc32 as isal_crc32  # python-isal (Intel ISA-L)
+        backends['isal'] = isal_crc32
+    except ImportError:
+        pass
+    try:
+        from deflate import crc32 as deflate_crc32  # libdeflate bindings
+        backends['libdeflate'] = deflate_crc32
+    except ImportError:
+        pass
+    try:
+        from fastcrc import crc32 as fastcrc_crc32  # fastcrc (Rust crc crate)
+        def fastcrc_iso_hdlc(data, value=0, _iso_hdlc=fastcrc_crc32.iso_hdlc):
+            return _iso_hdlc(data, value)
+        # Only register it if it continues a running CRC like zlib.crc32 and
+        # accepts the memoryview slices _crc32_stream passes
+        if fastcrc_iso_hdlc(memoryview(b'6789'), fastcrc_iso_hdlc(b'12345')) == zlib.crc32(b'123456789'):
+            backends['fastcrc'] = fastcrc_iso_hdlc
+    except (ImportError, TypeError, ValueError):
+        pass
+    return backends
+
+CRC32_BACKENDS = _load_crc32_backends()
+
+def _cpu_flags():
+    """Return the CPU feature flags listed in /proc/cpuinfo (empty set where unavailable)."""
+    try:
+        with open('/proc/cpuinfo', 'r', encoding='ascii', errors='replace') as f:
+            for line in f:
+                # x86 lists 'flags', ARM lists 'Features'
+                if line.startswith(('flags', 'Features')):
+                    return set(line.split(':', 1)[1].split())
+    except OSError:
+        pass
+    return set()
+
+def _select_crc32_backend(flags):
+    """Pick the fastest installed backend for a CPU with the given feature flags.
+
+    ISA-L has the widest AVX-512 VPCLMULQDQ fold; libdeflate is typically the
+    quicker PCLMULQDQ (x86) / PMULL (ARM) implementation; fastcrc is the
+    fallback accelerated backend. Only an x86 CPU without PCLMULQDQ keeps zlib;
+    without CPU information (e.g. Windows) or on other architectures the
+    accelerated backends are still preferred over zlib.
+    """
+    if 'vpclmulqdq' in flags and 'avx512f' in flags:
+        preference = ('isal', 'libdeflate', 'fastcrc')
+    elif 'pclmulqdq' in flags or 'pmull' in flags:
+        preference = ('libdeflate', 'isal', 'fastcrc')
+    elif 'sse2' in flags:
+        # x86 (every x86-64 CPU lists sse2) with no carry-less multiply
+        preference = ()
+    else:
+        preference = ('isal', 'libdeflate', 'fastcrc')
+    for name in preference:
+        if name in CRC32_BACKENDS:
+            return name
+    return 'zlib'
+
+def set_crc32_backend(name):
+    """Select the CRC32 backend by name ('auto' re-runs CPU detection)."""
+    global _crc32, CRC32_BACKEND
+    if name == 'auto':
+        name = _select_crc32_backend(_cpu_flags())
+    if name not in CRC32_BACKENDS:
+        raise ValueError(f"CRC32 backend '{name}' is not available (installed: {', '.join(sorted(CRC32_BACKENDS))})")
+    _crc32 = CRC32_BACKENDS[name]
+    CRC32_BACKEND = name
+
+set_crc32_backend('auto')
+
+# Optional CRC32C (Castagnoli, as used by iSCSI/Btrfs/ext4). The 'crc32c'
+# package maps it onto the SSE4.2 / ARMv8 CRC32 instructions. Note that
+# CRC32C values do not match the CRC32 values stored in scanner CSVs.
+try:
+    from crc32c import crc32c as _crc32c
+except ImportError:
+    _crc32c = None
+
+# Reflected generator polynomial for each supported CRC (used by crc32_combine)
+CRC_POLYNOMIALS = {'crc32': 0xEDB88320, 'crc32c': 0x82F63B78}
+
+def _crc_function(poly):
+    """Return the running-CRC function (data, crc) -> crc for poly."""
+    if poly == 'crc32':
+        return _crc32
+    if poly == 'crc32c':
+        if _crc32c is None:
+            raise RuntimeError("CRC32C requires the 'crc32c' package (pip install crc32c)")
+        return _crc32c
+    raise ValueError(f"Unsupported CRC polynomial: {poly}")
+
+# Hash memory-mapped files in large slices so the CRC backend stays in its
+# wide folding loop instead of being re-entered for every small read.
+MMAP_SLICE_SIZE = 16 * 1024 * 1024
+
+# Files at or below this size are read with a single read() call; for them
+# the mmap/munmap setup costs more syscalls than it saves.
+SMALL_FILE_SIZE = 1024 * 1024
+
+# Size of each readinto() of a streaming read
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Streaming reads fill a preallocated buffer instead of allocating a new bytes
+# object per chunk. Each thread has its own buffer, reused for every file it
+# hashes; hashing may run on several threads at once, so threads never share one.
+_thread_buffers = threading.local()
+
+def _read_buffer():
+    """Return this thread's (bytearray, memoryview) read buffer, creating it once."""
+    buffers = getattr(_thread_buffers, 'buffers', None)
+    if buffers is None or len(buffers[0]) != READ_CHUNK_SIZE:
+        read_buffer = bytearray(READ_CHUNK_SIZE)
+        buffers = _thread_buffers.buffers = (read_buffer, memoryview(read_buffer))
+    return buffers
+
+def _crc32_stream(f, crc=0, crc_func=None):
+    """Compute a running CRC32 by reading an open binary file in chunks."""
+    readinto = f.readinto
+    crc32 = crc_func or _crc32
+    read_buffer, view = _read_buffer()
+    while n := readinto(read_buffer):
+        crc = crc32(view[:n], crc)
+    return crc
+
+# Mapped files larger than one slice can be split into this many segments that
+# are hashed concurrently (zlib.crc32 releases the GIL) and then combined. Only
+# done when nothing else hashes in parallel and there is more than one CPU.
+CRC_SEGMENT_WORKERS = 4
+
+_segment_executor = None
+_segment_executor_lock = threading.Lock()
+
+def _segment_pool():
+    """Return the shared thread pool for segment hashing, or None on a single-CPU machine.
+
+    Created on first use and reused for every file, so hashing a large file
+    does not start (and join) its own threads.
+    """
+    global _segment_executor
+    if (os.cpu_count() or 1) <= 1:
+        return None
+    with _segment_executor_lock:
+        if _segment_executor is None:
+            _segment_executor = ThreadPoolExecutor(max_workers=CRC_SEGMENT_WORKERS,
+                                                   thread_name_prefix='crc-segment')
+    return _segment_executor
+
+def _gf2_matrix_times(mat, vec):
+    """Multiply a 32x32 GF(2) matrix (list of column ints) by a 32-bit vector."""
+    total = 0
+    i = 0
+    while vec:
+        if vec & 1:
+            total ^= mat[i]
+        vec >>= 1
+        i += 1
+    return total
+
+def _gf2_matrix_square(mat):
+    """Square a 32x32 GF(2) matrix."""
+    return [_gf2_matrix_times(mat, mat[n]) for n in range(32)]
+
+def crc32_combine(crc1, crc2, len2, poly='crc32'):
+    """Return the CRC32 of A+B given crc1 = CRC32(A), crc2 = CRC32(B) and len2 = len(B).
+
+    Port of zlib's crc32_combine(), which Python's zlib module does not expose.
+    Runs in O(log len2) by repeatedly squaring the "append one zero bit" operator.
+    poly selects the polynomial from CRC_POLYNOMIALS ('crc32' or 'crc32c').
+    """
+    if len2 <= 0:
+        return crc1
+
+    # Operator for one zero bit: reflected CRC polynomial, then shift
+    odd = [CRC_POLYNOMIALS[poly]] + [1 << n for n in range(31)]
+    even = _gf2_matrix_square(odd)   # two zero bits
+    odd = _gf2_matrix_square(even)   # four zero bits
+
+    # Apply len2 zero bytes to crc1 (first square yields the one-zero-byte operator)
+    while True:
+        even = _gf2_matrix_square(odd)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(even, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+        odd = _gf2_matrix_square(even)
+        if len2 & 1:
+            crc1 = _gf2_matrix_times(odd, crc1)
+        len2 >>= 1
+        if not len2:
+            break
+
+    return crc1 ^ crc2
+
+@functools.lru_cache(maxsize=64)
+def crc_of_zeros(length, poly='crc32'):
+    """Return the CRC of length zero bytes without reading or building them.
+
+    Appending zeros to the pre-inverted register is exactly what crc32_combine's
+    operator does, so the CRC is combine(~0, 0, length) with the final inversion.
+    Cached because zero-filled padding files tend to share a handful of sizes.
+    """
+    return crc32_combine(0xFFFFFFFF, 0, length, poly) ^ 0xFFFFFFFF
+
+def _crc32_slices(view, start, end, crc_func, crc=0):
+    """Continue crc over view[start:end], one MMAP_SLICE_SIZE slice per call."""
+    for offset in range(start, end, MMAP_SLICE_SIZE):
+        crc = crc_func(view[offset:min(offset + MMAP_SLICE_SIZE, end)], crc)
+    return crc
+
+def _crc32_segments(view, size, poly, executor):
+    """Compute the CRC32 of a buffer by hashing equal segments on executor's threads."""
+    crc_func = _crc_function(poly)
+    segment_size = -(-size // CRC_SEGMENT_WORKERS)  # ceiling division
+
+    def _hash_segment(start):
+        end = min(start + segment_size, size)
+        return _crc32_slices(view, start, end, crc_func), end - start
+
+    parts = list(executor.map(_hash_segment, range(0, size, segment_size)))
 
-def compute_crc32(file_path):
-    """Compute CRC32 checksum of a file."""
     crc = 0
+    for part_crc, part_len in parts:
+        crc = crc32_combine(crc, part_crc, part_len, poly)
+    return crc
+
+def _fadvise(fd, advice_name):
+    """Pass an access-pattern hint to the kernel where posix_fadvise is available (Linux/BSD)."""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, 'posix_fadvise'):
+        return
     try:
-        with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                crc = zlib.crc32(chunk, crc)
-        return format(crc & 0xFFFFFFFF, '08X')  # Return as uppercase hex
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        # Purely advisory; some filesystems reject it
+        pass
+
+# openat()-style opens: resolving each file name relative to an already-open
+# directory fd skips the full path walk and permission checks for every file in
+# a folder. Only available where os.open() supports dir_fd (Linux/BSD/macOS).
+_DIR_FD_FLAGS = None
+if os.open in os.supports_dir_fd and hasattr(os, 'O_DIRECTORY'):
+    _DIR_FD_FLAGS = os.O_DIRECTORY | getattr(os, 'O_PATH', os.O_RDONLY)
+
+class _OpenDirectory:
+    """A directory fd that is closed as soon as it is dropped."""
+    __slots__ = ('path', 'fd')
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+        self.fd = os.open(path, _DIR_FD_FLAGS)
+
+    def __del__(self):
+        if self.fd is not None:
+            os.close(self.fd)
+
+# Each hashing thread keeps the fd of the folder it last read from. Files are
+# handed out in walk order, so consecutive files usually share a folder. The
+# fd is closed when the thread moves to another folder or exits.
+_thread_directory = threading.local()
+
+def _open_in_directory(file_path):
+    """Open file_path for binary reading relative to this thread's cached directory fd."""
+    dirpath, name = os.path.split(file_path)
+    directory = getattr(_thread_directory, 'current', None)
+    if directory is None or directory.path != dirpath:
+        try:
+            directory = _OpenDirectory(dirpath)
+        except OSError:
+            return open(file_path, 'rb')
+        _thread_directory.current = directory
+    dir_fd = directory.fd
+    try:
+        return open(name, 'rb', opener=lambda path, flags: os.open(path, flags, dir_fd=dir_fd))
+    except OSError as e:
+        # Report the full path, not just the name relative to the folder fd
+        e.filename = file_path
+        raise
+
+def _release_directory():
+    """Close the current thread's cached directory fd, if any."""
+    _thread_directory.__dict__.pop('current', None)
+
+def compute_crc32_with_size(file_path, poly='crc32', reuse_dir_fd=False, trust_sparse=False, segment_pool=None):
+    """Compute the CRC32 checksum of a file and return (crc32, size).
+
+    The size comes from fstat() on the already-open file, so callers do not
+    need a separate stat() of the path. On failure returns ("ERROR: ...", size)
+    where size is '' if the file cannot be stat'ed either.
+    reuse_dir_fd: open the file relative to a per-thread cached fd of its folder
+                  (see _open_in_directory); used by scan_directory.
+    trust_sparse: treat a non-empty file with no allocated blocks (st_blocks == 0)
+                  as all zeros and compute its CRC without reading it. Only safe on
+                  filesystems that report st_blocks reliably (not FAT/exFAT, and not
+                  ones that store small files inline).
+    segment_pool: thread pool (see _segment_pool) to hash the segments of files
+                  larger than MMAP_SLICE_SIZE concurrently; only pass one when no
+                  other files are being hashed in parallel. Without it such files
+                  are hashed slice by slice on the calling thread.
+    """
+    crc = 0
+    try:
+        crc_func = _crc_function(poly)
+        use_dir_fd = reuse_dir_fd and _DIR_FD_FLAGS is not None
+        with (_open_in_directory(file_path) if use_dir_fd else open(file_path, 'rb')) as f:
+            st = os.fstat(f.fileno())
+            size = st.st_size
+            if size == 0:
+                return '00000000', 0
+            if trust_sparse and getattr(st, 'st_blocks', None) == 0:
+                # Entirely a hole: the content is known to be zeros
+                return f'{crc_of_zeros(size, poly):08X}', size
+            if size <= SMALL_FILE_SIZE:
+                # Usually a single readinto() of the thread's buffer, plus the
+                # EOF check that also picks up anything appended since fstat()
+                crc = _crc32_stream(f, 0, crc_func)
+                return f'{crc & 0xFFFFFFFF:08X}', size
+            # Larger files are read front to back exactly once: ask for aggressive
+            # readahead now and drop the pages afterwards so a big scan does not
+            # evict everything else from the page cache.
+            fd = f.fileno()
+            _fadvise(fd, 'POSIX_FADV_SEQUENTIAL')
+            try:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    if size <= MMAP_SLICE_SIZE:
+                        # Whole mapping in one C call, no Python-level loop
+                        crc = crc_func(mm)
+                    else:
+                        with memoryview(mm) as view:
+                            if segment_pool is not None:
+                                crc = _crc32_segments(view, size, poly, segment_pool)
+                            else:
+                                crc = _crc32_slices(view, 0, size, crc_func)
+            except (OSError, ValueError, OverflowError):
+                # mmap can fail on network shares or for very large files on
+                # 32-bit builds; fall back to a plain streaming read.
+                f.seek(0)
+                crc = _crc32_stream(f, 0, crc_func)
+            _fadvise(fd, 'POSIX_FADV_DONTNEED')
+        return f'{crc & 0xFFFFFFFF:08X}', size  # Return as uppercase hex
+    except Exception as e:
+        # The file may still be stat-able (e.g. permission denied on open)
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = ''
+        return f"ERROR: {e}", size
+
+def compute_crc32(file_path, poly='crc32', segment_pool=None):
+    """Compute CRC32 checksum of a file.
+
+    poly: 'crc32' (zip/gzip polynomial, default) or 'crc32c' (Castagnoli).
+    segment_pool: see compute_crc32_with_size; pass _segment_pool() only when
+                  no other files are being hashed at the same time.
+    """
+    return compute_crc32_with_size(file_path, poly, segment_pool=segment_pool)[0]
+
+def _iter_files(dirpath):
+    """Yield (dirpath, DirEntry) for every non-directory entry below dirpath.
+
+    Uses os.scandir so no separate listdir/stat pass is needed. Traversal order and
+    symlink handling match os.walk(): files of a folder first, then its
+    subfolders; symlinked folders are not descended into; unreadable folders
+    are skipped.
+    """
+    subdirs = []
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                else:
+                    yield dirpath, entry
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from _iter_files(subdir)
+
+def _collect_files(root_dir, stat_files=True):
+    """Walk root_dir and return a list of (full_path, filename, parent_folder, filesize, mtime_ns) tuples.
+
+    With stat_files=False, filesize and mtime_ns are None; the size is then
+    filled in from the open file while hashing.
+    """
+    entries = []
+    append = entries.append
+    # Fallback: use the root_dir's basename if normalization produced an empty name
+    root_folder = os.path.basename(os.path.normpath(root_dir))
+    current_dir = None
+    parent_folder = None
+    for dirpath, entry in _iter_files(root_dir):
+        # Path: use only the parent folder name as requested. It only changes when
+        # the walk moves to a new folder, so compute it once per folder.
+        if dirpath != current_dir:
+            current_dir = dirpath
+            # Normalize dirpath to remove any trailing slashes so basename() returns the folder name
+            parent_folder = os.path.basename(os.path.normpath(dirpath)) or root_folder
+
+        filesize = mtime_ns = None
+        if stat_files:
+            try:
+                st = entry.stat()
+                filesize = st.st_size
+                mtime_ns = st.st_mtime_ns
+            except OSError:
+                filesize = ''
+
+        append((entry.path, entry.name, parent_folder, filesize, mtime_ns))
+    return entries
+
+def _crc_cache_path(output_csv, poly='crc32'):
+    """Return the path of the CRC cache file kept next to output_csv."""
+    if poly == 'crc32':
+        return output_csv + '.crccache.json'
+    return output_csv + f'.{poly}cache.json'
+
+def _load_crc_cache(cache_path):
+    """Load a CRC cache written by a previous scan ({abs_path: [size, mtime_ns, crc32]}).
+
+    Returns an empty cache if the file is missing or unreadable.
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+def _save_crc_cache(cache_path, cache):
+    """Write the CRC cache atomically so an interrupted scan never leaves a torn file."""
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_path)
+
+# Rows travel from the hashing loop to the CSV writer thread through a bounded
+# queue; this sentinel tells the writer thread that no more rows are coming.
+_END_OF_ROWS = object()
+ROW_QUEUE_SIZE = 256
+# The writer thread drains up to this many queued rows per write() call
+ROW_BATCH_SIZE = 1000
+
+# Characters that force csv.writer (QUOTE_MINIMAL) to quote a field
+_CSV_QUOTE_CHARS = re.compile(r'["\r\n]')
+
+class _CSVLineFormatter:
+    """Format rows as UTF-8 CSV lines byte-for-byte identical to csv.writer's output.
+
+    Most rows (plain file names, sizes, hex CRCs) need no quoting, so they are
+    joined directly; only rows containing a comma, quote or line break inside a
+    field go through the csv module's quoting.
+    """
+
+    def __init__(self):
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def __call__(self, row):
+        fields = [str(field) for field in row]
+        line = ','.join(fields)
+        if line.count(',') == len(fields) - 1 and not _CSV_QUOTE_CHARS.search(line):
+            return (line + '\r\n').encode('utf-8')
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._writer.writerow(fields)
+        return self._buffer.getvalue().encode('utf-8')
+
+def _write_rows(csvfile, row_queue, quiet, errors):
+    """Drain row_queue into the binary csvfile (runs on a dedicated writer thread)."""
+    format_line = _CSVLineFormatter()
+    write = csvfile.write
+    get = row_queue.get
+    get_nowait = row_queue.get_nowait
+    done = False
+    try:
+        while not done:
+            # Block for the first row, then take whatever else is already queued
+            batch = []
+            row = get()
+            while row is not _END_OF_ROWS:
+                batch.append(row)
+                if len(batch) >= ROW_BATCH_SIZE:
+                    break
+                try:
+                    row = get_nowait()
+                except queue.Empty:
+                    break
+            else:
+                done = True
+
+            if batch:
+                write(b''.join([format_line(row) for row in batch]))
+                if not quiet:
+                    print('\n'.join(f"{filename} ({filesize} bytes) in '{parent_folder}' → {crc32}"
+                                    for filename, filesize, crc32, parent_folder, *_ in batch))
     except Exception as e:
-        return f"ERROR: {e}"
+        errors.append(e)
+        # Keep draining so the producer never blocks on a full queue
+        while not done and get() is not _END_OF_ROWS:
+            pass
 
-def scan_directory(root_dir, output_csv, extra_columns=None):
+def scan_directory(root_dir, output_csv, extra_columns=None, workers=None, quiet=False, use_cache=False, poly='crc32',
+                   use_processes=False, trust_sparse=False):
     """Recursively scan directory and write CRC32 values to CSV.
 
     extra_columns: list of additional column names to append to the CSV header.
+    workers: number of hashing threads (default: min(32, 2 * CPU count)), or of
+             worker processes when use_processes is set (default: CPU count).
+             Use 1 to hash files one at a time in the current thread; files over
+             MMAP_SLICE_SIZE are then split across the shared segment pool on
+             multi-CPU machines (see compute_crc32_with_size).
+    quiet: suppress the per-file progress line written to stdout.
+    use_cache: reuse CRCs from a previous scan for files whose size and mtime are
+               unchanged. The cache is stored next to the CSV as
+               <output_csv>.crccache.json and rewritten after every scan.
+    poly: 'crc32' (default, matches scanner CSVs) or 'crc32c'. With 'crc32c'
+          the checksum column is named CRC32C.
+    use_processes: hash in a process pool instead of a thread pool. Threads are
+                   usually enough since zlib.crc32 releases the GIL, and they avoid
+                   process start-up and pickling costs.
+    trust_sparse: skip reading fully sparse files (see compute_crc32_with_size).
     """
     extra_columns = extra_columns or []
+    # Fail before walking the tree if the requested polynomial is unavailable
+    _crc_function(poly)
+    hash_file = functools.partial(compute_crc32_with_size, poly=poly, reuse_dir_fd=True,
+                                  trust_sparse=trust_sparse)
 
-    with open(output_csv, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.writer(csvfile)
-        # Use canonical CSV headers compatible with CRC-FileOrganizer
-        headers = ['FileName', 'Size', 'CRC32', 'Path'] + extra_columns
-        writer.writerow(headers)
+    # Collect all files first so hashing can be fanned out across workers. Sizes
+    # come from hashing itself; only the cache needs a stat() during the walk.
+    entries = _collect_files(root_dir, stat_files=use_cache)
 
-        for dirpath, _, filenames in os.walk(root_dir):
-            for filename in filenames:
-                full_path = os.path.join(dirpath, filename)
-                crc32 = compute_crc32(full_path)
+    # Look up every file in the cache; only misses are read and hashed
+    cache_path = _crc_cache_path(output_csv, poly) if use_cache else None
+    old_cache = _load_crc_cache(cache_path) if use_cache else {}
+    new_cache = {}
+    cached_crcs = []
+    paths = []
+    for full_path, _, _, filesize, mtime_ns in entries:
+        crc32 = None
+        if use_cache and mtime_ns is not None:
+            cache_key = os.path.abspath(full_path)
+            cached = old_cache.get(cache_key)
+            # An entry of any other shape (hand-edited or older format) is just a miss
+            if (isinstance(cached, list) and len(cached) == 3 and isinstance(cached[2], str)
+                    and cached[0] == filesize and cached[1] == mtime_ns):
+                crc32 = cached[2]
+        cached_crcs.append(crc32)
+        if crc32 is None:
+            paths.append(full_path)
 
-                try:
-                    filesize = os.path.getsize(full_path)
-                except OSError:
-                    filesize = ''
+    # Rows are encoded to UTF-8 by the writer thread and written as bytes
+    with open(output_csv, 'wb', buffering=1024 * 1024) as csvfile:
+        # Use canonical CSV headers compatible with CRC-FileOrganizer
+        headers = ['FileName', 'Size', 'CRC32' if poly == 'crc32' else 'CRC32C', 'Path'] + extra_columns
+        csvfile.write(_CSVLineFormatter()(headers))
 
-                # Path: use only the parent folder name as requested
-                # Normalize dirpath to remove any trailing slashes so basename() returns the folder name
-                norm_dir = os.path.normpath(dirpath)
-                parent_folder = os.path.basename(norm_dir)
-                if not parent_folder:
-                    # Fallback: use the root_dir's basename if normalization produced an empty name
-                    parent_folder = os.path.basename(os.path.normpath(root_dir))
+        # CSV formatting and progress output happen on a separate thread so the
+        # hashing loop only hands off finished rows
+        row_queue = queue.Queue(maxsize=ROW_QUEUE_SIZE)
+        writer_errors = []
+        writer_thread = threading.Thread(target=_write_rows, args=(csvfile, row_queue, quiet, writer_errors), daemon=True)
+        writer_thread.start()
 
+        executor = None
+        try:
+            if workers == 1 or len(paths) <= 1:
+                # Nothing else is hashing, so large files may use the segment pool
+                crc_results = map(functools.partial(hash_file, segment_pool=_segment_pool()), paths)
+            elif use_processes:
+                # Worker processes re-run backend detection on import; pass on the
+                # backend chosen here in case it was overridden
+                executor = ProcessPoolExecutor(max_workers=workers, initializer=set_crc32_backend,
+                                               initargs=(CRC32_BACKEND,))
+                # executor.map yields results in submission order, so rows stay in walk order
+                crc_results = executor.map(hash_file, paths, chunksize=16)
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 4) * 2))
+                crc_results = executor.map(hash_file, paths)
+
+            put = row_queue.put
+            extra_values = [''] * len(extra_columns)
+            for (full_path, filename, parent_folder, filesize, mtime_ns), crc32 in zip(entries, cached_crcs):
+                if crc32 is None:
+                    crc32, filesize = next(crc_results)
+                if use_cache and mtime_ns is not None and not crc32.startswith('ERROR'):
+                    new_cache[os.path.abspath(full_path)] = [filesize, mtime_ns, crc32]
                 # Prepare row: FileName, Size, CRC32, Path, [extra empty columns]
-                row = [filename, filesize, crc32, parent_folder]
-                if extra_columns:
-                    row.extend([''] * len(extra_columns))
+                put([filename, filesize, crc32, parent_folder] + extra_values)
+        finally:
+            row_queue.put(_END_OF_ROWS)
+            writer_thread.join()
+            if executor is not None:
+                # Joining the pool threads also releases their directory fds
+                executor.shutdown()
+            _release_directory()
+
+        if writer_errors:
+            raise writer_errors[0]
 
-                writer.writerow(row)
-                print(f"{filename} ({filesize} bytes) in '{parent_folder}' → {crc32}")
+    # Only files seen in this scan are kept, so deleted files drop out of the cache
+    if use_cache:
+        _save_crc_cache(cache_path, new_cache)
 
 
 # --- USAGE ---
@@ -66,10 +644,32 @@ if __name__ == "__main__":
     parser.add_argument("output_csv", nargs="?", default=default_output, help="Output CSV file path")
     parser.add_argument("-c", "--column", action="append", dest="extra_columns",
                         help="Additional column name to append to CSV (can be repeated)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Number of hashing threads/processes (default: 2x CPU count threads, "
+                             "or CPU count processes with --processes; 1 = serial)")
+    parser.add_argument("--processes", action="store_true",
+                        help="Hash in worker processes instead of threads")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="Do not print a progress line for every file")
+    parser.add_argument("--cache", action="store_true",
+                        help="Reuse CRCs of unchanged files (same size and mtime) from the previous scan")
+    parser.add_argument("--poly", choices=sorted(CRC_POLYNOMIALS), default="crc32",
+                        help="Checksum polynomial: crc32 (default, matches scanner CSVs) or crc32c "
+                             "(Castagnoli, needs the 'crc32c' package; not usable by CRC-FileOrganizer)")
+    parser.add_argument("--backend", choices=["auto", "fastcrc", "isal", "libdeflate", "zlib"], default="auto",
+                        help="CRC32 implementation (default: auto-detect from CPU features and installed packages)")
+    parser.add_argument("--sparse", action="store_true",
+                        help="Do not read files with no allocated blocks; hash them as all zeros "
+                             "(do not use on FAT/exFAT, which misreport allocated blocks)")
     args = parser.parse_args()
 
     try:
-        scan_directory(args.root_dir, args.output_csv, extra_columns=args.extra_columns)
+        set_crc32_backend(args.backend)
+        if not args.quiet:
+            print(f"CRC32 backend: {CRC32_BACKEND}")
+        scan_directory(args.root_dir, args.output_csv, extra_columns=args.extra_columns,
+                       workers=args.workers, quiet=args.quiet, use_cache=args.cache,
+                       poly=args.poly, use_processes=args.processes, trust_sparse=args.sparse)
         print(f"\n✅ CRC32 report written to: {args.output_csv}")
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
@@ -21,7 +21,7 @@
 #    for CRC32) are only applied when `--repair` is provided. In validation-only
 #    mode the script tests and reports issues but does not modify field values.
 #  - The script now detects duplicate CRC32 values (with identical Size) and flags them as issues; no
-#    automatic correction is performed for duplicate values.
+#    automatic correction is performed for duplicate values (skipped in --normalize-only runs).
 #
 # New CLI flags (summary):
 #  --repair             Apply automatic repairs to invalid fields and write a
@@ -33,6 +33,22 @@
 #  --flag-nonutf8       Treat detection of a non-UTF-8 file encoding as an
 #                       issue (appends an issue entry to the log). Otherwise this
 #                       is reported to stdout but not appended as an issue.
+#  --cache              Skip CSVs that are unchanged (size, mtime, content hash)
+#                       since they last validated clean with the same options.
+#                       Only applies to runs that would not write anything for
+#                       a clean file (--dry-run or --no-rewrite-if-clean).
+#  --quote {all,minimal}
+#                       Quote every field of a repaired CSV (default) or only
+#                       the fields that need it (smaller output).
+#  --archive-compress {none,fast,default}
+#                       Zip compression used by --archive (default: fast,
+#                       deflate level 1; none stores the CSV uncompressed).
+#  --one-issue-per-group
+#                       Report each group of duplicate CRC32/Size rows as a
+#                       single issue listing every line, instead of one issue
+#                       per duplicate row (smaller logs for large duplicate sets).
+#  --workers N          Bulk mode: validate N CSV files in parallel worker
+#                       processes (default: 1 = sequential).
 #
 # Examples (recommended):
 #  - Validate only, do not modify files:
@@ -61,17 +77,155 @@
 
 # CSV Format: FileName,Size,CRC32,Path,Comment
 
+import array
+import codecs
+import contextlib
 import csv
+import hashlib
+import io
+import itertools
+import json
 import re
 import os
+import queue
 import sys
+import threading
 import zipfile
 import shutil
+from collections import Counter, defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 
+# Optional: statistical charset detection for files that are not UTF-8
+try:
+    from charset_normalizer import from_path as _charset_from_path
+except ImportError:
+    _charset_from_path = None
+
+
+# Characters that are not allowed in Windows filenames / paths (plus ASCII control
+# characters). Repairs replace each of them with '_' via str.translate, which is a
+# single C-level pass instead of a regex search followed by a regex substitution.
+_CONTROL_CHARS = ''.join(chr(i) for i in range(32))
+_INVALID_FN_SET = frozenset('<>:"|?*' + _CONTROL_CHARS)
+_INVALID_PATH_SET = frozenset('<>"|?*' + _CONTROL_CHARS)  # ':' is valid in paths (drive letters)
+_INVALID_FN_TABLE = str.maketrans({c: '_' for c in _INVALID_FN_SET})
+_INVALID_PATH_TABLE = str.maketrans({c: '_' for c in _INVALID_PATH_SET})
+
+
+class _HexOnlyTable(dict):
+    """str.translate table that keeps hex digits and deletes every other character."""
+
+    def __missing__(self, codepoint):
+        return None
+
+
+_HEX_DIGITS = '0123456789abcdefABCDEF'
+_CRC_KEEP_TABLE = _HexOnlyTable((ord(c), ord(c)) for c in _HEX_DIGITS)
+
+_HEX_SET = frozenset(_HEX_DIGITS)
+_HEX_UPPER_SET = frozenset('0123456789ABCDEF')
+
+
+def _is_hex8(value, digits=_HEX_SET):
+    """
+    Return True if value is exactly 8 characters, all of them in digits.
+
+    Not int(value, 16): that also accepts '0x' prefixes, '_' separators and
+    surrounding whitespace, and timed slower than this set check anyway.
+    """
+    return len(value) == 8 and digits.issuperset(value)
+
+
+# Remaining per-row patterns, compiled once at import
+_RE_NONDIGIT = re.compile(r'\D')
+_RE_BACKSLASHES_COMMA = re.compile(r'\\+,')
+
+
+def _supported_encodings(encodings):
+    """Return the encodings from the list that this platform's codecs can look up."""
+    supported = []
+    for e in encodings:
+        try:
+            codecs.lookup(e)
+            supported.append(e)
+        except LookupError:
+            # encoding not available on this platform (e.g. 'mbcs' outside Windows); skip
+            continue
+    return supported
+
+
+# Encodings tried in order when no BOM is present (or the BOM encoding fails)
+_FALLBACK_ENCODINGS = _supported_encodings(
+    ['utf-8-sig', 'utf-8', 'mbcs', 'cp1250', 'cp1252', 'latin-1', 'iso-8859-1', 'iso-8859-2', 'utf-16'])
+
+# Placeholder in the candidate list for the charset_normalizer guess (computed lazily)
+_DETECTED_ENCODING = object()
+
+# Codec names a charset_normalizer guess may pick from: the non-UTF-8 fallbacks.
+# Legacy 8-bit codecs decode almost any bytes, so a guess outside this list (e.g.
+# mac_latin2 or cp1006 for a cp1252 export) would pass the decode check and
+# silently corrupt the repaired CSV.
+_DETECTABLE_ENCODINGS = frozenset(codecs.lookup(e).name for e in _FALLBACK_ENCODINGS[2:])
+
+
+def _detect_encoding(path):
+    """Return charset_normalizer's best guess for the file's codec name, or None.
+
+    Guesses outside _DETECTABLE_ENCODINGS are ignored (None), leaving the
+    choice to the fixed fallback order.
+    """
+    if _charset_from_path is None:
+        return None
+    try:
+        best = _charset_from_path(path).best()
+        if best is None:
+            return None
+        name = codecs.lookup(best.encoding).name
+    except (LookupError, OSError, ValueError):
+        return None
+    return name if name in _DETECTABLE_ENCODINGS else None
+
+
+# Encoding probing looks at (and caches on) this many leading bytes of a file
+_ENCODING_PROBE_SIZE = 4096
+# (file size, digest of the leading bytes) -> (encoding, how it was detected). Lets bulk
+# runs over many similar non-UTF-8 exports try the encoding that worked before ahead
+# of charset detection (never ahead of the BOM or UTF-8 checks).
+_ENCODING_CACHE = {}
+
+
+# Canonical field names and issue types used in CSVValidationIssue entries
+FIELD_FILENAME = "FileName"
+FIELD_SIZE = "Size"
+FIELD_CRC32 = "CRC32"
+FIELD_PATH = "Path"
+FIELD_ROW = "Row"
+FIELD_FILE = "File"
+
+ISSUE_EMPTY_FILENAME = "Empty filename"
+ISSUE_INVALID_FILENAME_CHARS = "Invalid filename characters"
+ISSUE_FILENAME_CLEANED = "Whitespace trimmed or characters replaced"
+ISSUE_SIZE_NONDIGITS_REMOVED = "Non-digit characters removed"
+ISSUE_SIZE_NONDIGITS = "Non-digit characters detected"
+ISSUE_SIZE_NO_DIGITS = "Invalid size - no digits found"
+ISSUE_CRC_NONHEX_REMOVED = "Non-hex characters removed"
+ISSUE_CRC_NONHEX = "Non-hex characters present"
+ISSUE_CRC_TRUNCATED = "CRC32 truncated to 8 characters"
+ISSUE_CRC_TOO_LONG = "CRC32 too long"
+ISSUE_CRC_PADDED = "CRC32 padded with zeros"
+ISSUE_CRC_TOO_SHORT = "CRC32 too short"
+ISSUE_CRC_NO_HEX = "Invalid CRC32 - no valid hex found"
+ISSUE_PATH_CHARS_REMOVED = "Invalid path characters removed"
+ISSUE_PATH_CHARS = "Invalid path characters present"
+ISSUE_PATH_CLEANED = "Whitespace or invalid characters removed"
+
 
 class CSVValidationIssue:
     """Tracks issues found during validation."""
+
+    # Large files can produce one issue per row; slots avoid a per-instance __dict__
+    __slots__ = ('line_num', 'field_num', 'field_name', 'issue_type', 'original_value', 'repaired_value')
     
     def __init__(self, line_num, field_num, field_name, issue_type, original_value, repaired_value=None):
         self.line_num = line_num
@@ -86,6 +240,76 @@ class CSVValidationIssue:
         return f"Line {self.line_num}, Field {self.field_num} ({self.field_name}): {self.issue_type} - Original: '{self.original_value}'{repair_info}"
 
 
+def _split_csv_line(line, literal_start=0, literal_end=-1):
+    """
+    Split one CSV record (without its line terminator) into fields in a single
+    left-to-right pass, with the semantics of csv.reader's default dialect
+    (RFC 4180 quoting, doubled quotes, no skip-initial-space, non-strict).
+    Characters at positions literal_start..literal_end are taken literally:
+    neither commas nor quotes inside that span are treated as CSV syntax
+    (the default span is empty).
+    The scan jumps between delimiters with str.find, so the Python-level work
+    is per field rather than per character.
+    """
+    if '"' not in line:
+        # No quoting anywhere (the usual case): plain C-level splits around the literal span
+        if literal_start > literal_end:
+            return line.split(',')
+        fields = line[:literal_start].split(',')
+        tail = line[literal_end + 1:].split(',')
+        fields[-1] += line[literal_start:literal_end + 1] + tail[0]
+        fields.extend(tail[1:])
+        return fields
+
+    fields = []
+    append = fields.append
+    find = line.find
+    n = len(line)
+    pos = 0
+    while True:
+        if pos < n and line[pos] == '"' and not literal_start <= pos <= literal_end:
+            # Quoted field: commas are data, "" is a literal quote
+            chunks = []
+            pos += 1
+            while True:
+                quote = find('"', pos)
+                if literal_start <= quote <= literal_end:
+                    quote = find('"', literal_end + 1)
+                if quote < 0:
+                    # Unterminated quote: the field runs to the end of the line
+                    chunks.append(line[pos:])
+                    append(''.join(chunks))
+                    return fields
+                chunks.append(line[pos:quote])
+                pos = quote + 1
+                literal_next = literal_start <= pos <= literal_end
+                if pos < n and line[pos] == '"' and not literal_next:
+                    chunks.append('"')
+                    pos += 1
+                    continue
+                break
+            if pos >= n:
+                append(''.join(chunks))
+                return fields
+            if line[pos] == ',' and not literal_next:
+                append(''.join(chunks))
+                pos += 1
+                continue
+            # Text after the closing quote is kept as-is (non-strict csv behaviour)
+            prefix = ''.join(chunks)
+        else:
+            prefix = ''
+        # Unquoted field (or the unquoted tail of a quoted one): runs to the next comma
+        comma = find(',', pos)
+        if literal_start <= comma <= literal_end:
+            comma = find(',', literal_end + 1)
+        if comma < 0:
+            append(prefix + line[pos:])
+            return fields
+        append(prefix + line[pos:comma])
+        pos = comma + 1
+
+
 def parse_csv_line_with_quotes(line, line_num=None, issues=None):
     """
     Parse a CSV line respecting quoted fields that may contain commas.
@@ -98,137 +322,41 @@ def parse_csv_line_with_quotes(line, line_num=None, issues=None):
     Returns:
         list: Parsed fields
     """
-    # RFC 4180-compliant CSV line parser using Python's csv module
-    import io
     line = line.strip('\r\n')
-    # Mask commas inside backslash-delimited regions (e.g. \...\,) by replacing
-    # the entire region with indexed placeholders so the parser preserves exact
-    # text (including leading/trailing backslashes). Also mask explicit '\\,'
-    # escaped commas with a separate placeholder.
-    ESC_COMMA_PLACEHOLDER = '<<<CSV_ESC_COMMA>>>'
-    REGION_PLACEHOLDER_FMT = '<<<CSV_REGION_{idx}>>>'
-    regions = []
-
-    # NOTE: backslashes in these CSVs are literal and sequences like "\\,"
-    # represent a backslash character followed by the delimiter comma. Do
-    # NOT mask or remove the comma here — keep the original line intact so
-    # csv.reader can see the delimiter correctly.
-    temp_line = line
+    # Commas inside a backslash-delimited region (from the first backslash to the
+    # last backslash that is directly followed by a comma, e.g. \Dir, Sub\,) are
+    # part of the path, not delimiters. Backslashes in these CSVs are literal:
+    # the comma right after the region's closing backslash is still a delimiter.
+    region_start = line.find('\\')
+    region_end = line.rfind('\\,')
+    if region_start < 0 or region_end <= region_start:
+        region_start, region_end = 0, -1
 
-    try:
-        # Use greedy match so we capture the full region between the outer backslashes
-        pattern = re.compile(r'\\(.*)\\(?=,)', re.DOTALL)
-
-        def _repl(m):
-            inner_full = m.group(0)  # includes the surrounding backslashes
-            idx = len(regions)
-            regions.append(inner_full)
-            return REGION_PLACEHOLDER_FMT.format(idx=idx)
-
-        temp_line = pattern.sub(_repl, temp_line)
-    except Exception:
-        # If regex fails for any reason, keep the already-escaped temp_line
-        pass
+    fields = _split_csv_line(line, region_start, region_end)
 
-    # Use strict RFC 4180 parsing defaults: DON'T skip initial spaces after delimiter
-    # since leading spaces may be meaningful and RFC-compliant quoting should be retained.
-    reader = csv.reader(io.StringIO(temp_line), doublequote=True)
-    try:
-        fields = next(reader)
-        # Restore any region placeholders back to their original text (preserve trailing backslashes)
-        if regions:
-            for i, region_text in enumerate(regions):
-                ph = REGION_PLACEHOLDER_FMT.format(idx=i)
-                fields = [f.replace(ph, region_text) for f in fields]
-        # Finally restore escaped-comma placeholders back to a literal backslash+comma
-        # (the files use backslashes literally, do not treat them as escape characters).
-        # No escaped-comma placeholder restoration needed (we don't mask '\,')
-
-        # If any field is wrapped in quotes (e.g. '"..."') because of fallback
-        # or malformed input, unquote it here so the csv.writer does not
-        # re-quote an already-quoted string and double the quotes.
-        def _unquote_if_quoted(s):
-            if s is None:
-                return s
-            if len(s) >= 2 and s[0] == '"' and s[-1] == '"':
-                inner = s[1:-1]
-                # CSV escaping uses double double-quotes to represent a literal quote
-                return inner.replace('""', '"')
-            return s
-
-        fields = [_unquote_if_quoted(f) for f in fields]
-        # Normalize any doubled backslashes directly preceding a comma to a single
-        # backslash+comma (some combinations of region+placeholder restoration
-        # can produce a duplicate backslash). Keep this local and conservative.
-        fields = [re.sub(r'\\+,', r'\\,', f) for f in fields]
-
-        # If the original raw line used an explicit escaped-comma sequence
-        # ("\,") but the csv parser returned a single combined Path+Comment
-        # field (len==4), split that fourth field at the first comma and
-        # restore the trailing backslash to the Path. This preserves the
-        # original trailing '\' that was removed by the temporary masking
-        # while avoiding broad changes to the parsing logic.
-        if '\\,' in line and len(fields) == 4:
-            parts = fields[3].split(',', 1)
-            if len(parts) == 2:
-                # If the extracted path part already ends with a backslash, avoid appending another.
-                if parts[0].endswith('\\'):
-                    path_part = parts[0]
-                else:
-                    path_part = parts[0] + '\\'
-                comment_part = parts[1]
-                fields = [fields[0], fields[1], fields[2], path_part, comment_part]
-    except Exception as e:
-        # If parsing fails, fallback to splitting by comma and rejoin parts
-        parts = temp_line.split(',')
-        fields = []
-        cur = parts[0] if parts else ''
-        for part in parts[1:]:
-            # If the current segment ends with a backslash, it was escaping the comma
-            if cur.endswith('\\'):
-                # keep the backslash by default to preserve delimiter behavior
-                cur = cur + ',' + part
-            else:
-                fields.append(cur)
-                cur = part
-        fields.append(cur)
-        if issues is not None and line_num is not None:
-            issues.append(CSVValidationIssue(line_num, 0, "Row", f"CSV parsing error: {e}", line))
-        # After fallback parsing, restore any placeholders back to original
-        if regions:
-            for i, region_text in enumerate(regions):
-                ph = REGION_PLACEHOLDER_FMT.format(idx=i)
-                fields = [f.replace(ph, region_text) for f in fields]
-        # No escaped-comma placeholder restoration needed for fallback path
-        # Normalize any doubled backslashes directly preceding a comma to a single
-        # backslash+comma for the fallback-parsed fields as well.
-        fields = [re.sub(r'\\+,', r'\\,', f) for f in fields]
-
-        # Unquote any fully-quoted fields from the fallback path as well
-        def _unquote_if_quoted(s):
-            if s is None:
-                return s
-            if len(s) >= 2 and s[0] == '"' and s[-1] == '"':
-                inner = s[1:-1]
-                return inner.replace('""', '"')
-            return s
-        fields = [_unquote_if_quoted(f) for f in fields]
-
-        # Apply the same trailing-backslash preservation logic for fallback
-        # parsing as we did for the normal path above.
-        if '\\,' in line and len(fields) == 4:
-            parts = fields[3].split(',', 1)
-            if len(parts) == 2:
-                # Preserve existing trailing backslash if present; otherwise append one.
-                if parts[0].endswith('\\'):
-                    path_part = parts[0]
-                else:
-                    path_part = parts[0] + '\\'
-                comment_part = parts[1]
-                fields = [fields[0], fields[1], fields[2], path_part, comment_part]
+    # If any field is still wrapped in quotes (e.g. '"..."' from a tripled quote
+    # in malformed input), unquote it here so the csv.writer does not re-quote
+    # an already-quoted string and double the quotes.
+    for i, f in enumerate(fields):
+        if len(f) >= 2 and f[0] == '"' and f[-1] == '"':
+            # CSV escaping uses double double-quotes to represent a literal quote
+            fields[i] = f[1:-1].replace('""', '"')
+        # Normalize doubled backslashes directly preceding a comma to a single
+        # backslash+comma. Keep this local and conservative.
+        if '\\\\,' in fields[i]:
+            fields[i] = _RE_BACKSLASHES_COMMA.sub(r'\\,', fields[i])
+
+    # If the original raw line used an explicit escaped-comma sequence
+    # ("\,") but parsing returned a single combined Path+Comment field
+    # (len==4), split that fourth field at the first comma and restore the
+    # trailing backslash to the Path.
+    if len(fields) == 4 and '\\,' in line:
+        parts = fields[3].split(',', 1)
+        if len(parts) == 2:
+            # If the extracted path part already ends with a backslash, avoid appending another.
+            path_part = parts[0] if parts[0].endswith('\\') else parts[0] + '\\'
+            fields = [fields[0], fields[1], fields[2], path_part, parts[1]]
     # Note: We do not treat RFC-4180-style escaped quotes (""") as issues - these are valid.
-    # Only flag parsing errors or clearly invalid quote sequences (handled above via Exception).
-    # If we later decide to flag non-standard quoting, add a separate CLI option.
     return fields
 
 
@@ -238,27 +366,27 @@ def validate_filename(filename, line_num, issues, repair=True):
     
     # Check for empty filename
     if not filename or filename.strip() == "":
-        issues.append(CSVValidationIssue(line_num, 1, "FileName", "Empty filename", original))
+        issues.append(CSVValidationIssue(line_num, 1, FIELD_FILENAME, ISSUE_EMPTY_FILENAME, original))
         return "MISSING_FILENAME.jpg"
     
     # Remove leading/trailing whitespace only if repair mode enabled
     if repair:
         filename = filename.strip()
     
-    # Check for invalid filename characters (Windows-specific)
-    invalid_chars = r'[<>:"|?*\x00-\x1f]'
-    if re.search(invalid_chars, filename):
+    # Check for invalid filename characters (Windows-specific); one translate pass
+    # both detects and repairs them
+    repaired = filename.translate(_INVALID_FN_TABLE)
+    if repaired != filename:
         if repair:
-            repaired = re.sub(invalid_chars, '_', filename)
-            issues.append(CSVValidationIssue(line_num, 1, "FileName", "Invalid filename characters", original, repaired))
+            issues.append(CSVValidationIssue(line_num, 1, FIELD_FILENAME, ISSUE_INVALID_FILENAME_CHARS, original, repaired))
             filename = repaired
         else:
-            issues.append(CSVValidationIssue(line_num, 1, "FileName", "Invalid filename characters", original))
+            issues.append(CSVValidationIssue(line_num, 1, FIELD_FILENAME, ISSUE_INVALID_FILENAME_CHARS, original))
     
     # Preserve Unicode characters (important for your domain)
     # If repair was applied and value changed, log detail. If not in repair mode, we only flagged issues above.
     if repair and original != filename:
-        issues.append(CSVValidationIssue(line_num, 1, "FileName", "Whitespace trimmed or characters replaced", original, filename))
+        issues.append(CSVValidationIssue(line_num, 1, FIELD_FILENAME, ISSUE_FILENAME_CLEANED, original, filename))
     
     return filename
 
@@ -274,20 +402,20 @@ def validate_size(size, line_num, issues, repair=True):
     # Check if it's all digits
     if not size.isdigit():
         # Try to extract digits
-        digits_only = re.sub(r'\D', '', size)
+        digits_only = _RE_NONDIGIT.sub('', size)
         if digits_only:
             if repair:
-                issues.append(CSVValidationIssue(line_num, 2, "Size", "Non-digit characters removed", original, digits_only))
+                issues.append(CSVValidationIssue(line_num, 2, FIELD_SIZE, ISSUE_SIZE_NONDIGITS_REMOVED, original, digits_only))
                 return digits_only
             else:
-                issues.append(CSVValidationIssue(line_num, 2, "Size", "Non-digit characters detected", original))
+                issues.append(CSVValidationIssue(line_num, 2, FIELD_SIZE, ISSUE_SIZE_NONDIGITS, original))
                 return original
         else:
             if repair:
-                issues.append(CSVValidationIssue(line_num, 2, "Size", "Invalid size - no digits found", original, "0"))
+                issues.append(CSVValidationIssue(line_num, 2, FIELD_SIZE, ISSUE_SIZE_NO_DIGITS, original, "0"))
                 return "0"
             else:
-                issues.append(CSVValidationIssue(line_num, 2, "Size", "Invalid size - no digits found", original))
+                issues.append(CSVValidationIssue(line_num, 2, FIELD_SIZE, ISSUE_SIZE_NO_DIGITS, original))
                 return original
     
     return size
@@ -304,57 +432,48 @@ def validate_crc32(crc32, line_num, issues, repair=True):
     else:
         crc32 = crc32.strip()
     
-    # CRC32 should be exactly 8 hexadecimal characters
-    if repair:
-        if not re.match(r'^[0-9A-F]{8}$', crc32):
-            test_crc = crc32
+    # CRC32 should be exactly 8 hexadecimal characters. The common, already-valid
+    # case is a set check that returns before any of the repair logic runs. Repair
+    # mode expects uppercase (crc32 was uppercased above); validation-only mode
+    # accepts lowercase or uppercase hex digits as valid.
+    if _is_hex8(crc32, _HEX_UPPER_SET if repair else _HEX_SET):
+        return crc32
+
+    # Try to extract hex characters
+    hex_only = crc32.translate(_CRC_KEEP_TABLE).upper()
+    
+    if len(hex_only) == 8:
+        if repair:
+            issues.append(CSVValidationIssue(line_num, 3, FIELD_CRC32, ISSUE_CRC_NONHEX_REMOVED, original, hex_only))
+            return hex_only
         else:
-            test_crc = None
-    else:
-        # Non-repair mode, accept lowercase or uppercase hex digits as valid
-        if not re.match(r'^[0-9A-Fa-f]{8}$', crc32):
-            test_crc = crc32
+            issues.append(CSVValidationIssue(line_num, 3, FIELD_CRC32, ISSUE_CRC_NONHEX, original))
+            return original
+    elif len(hex_only) > 8:
+        # Truncate to 8 characters
+        truncated = hex_only[:8]
+        if repair:
+            issues.append(CSVValidationIssue(line_num, 3, FIELD_CRC32, ISSUE_CRC_TRUNCATED, original, truncated))
+            return truncated
         else:
-            test_crc = None
-
-    if test_crc is not None:
-        # Try to extract hex characters
-        hex_only = re.sub(r'[^0-9A-Fa-f]', '', crc32).upper()
-        
-        if len(hex_only) == 8:
-            if repair:
-                issues.append(CSVValidationIssue(line_num, 3, "CRC32", "Non-hex characters removed", original, hex_only))
-                return hex_only
-            else:
-                issues.append(CSVValidationIssue(line_num, 3, "CRC32", "Non-hex characters present", original))
-                return original
-        elif len(hex_only) > 8:
-            # Truncate to 8 characters
-            truncated = hex_only[:8]
-            if repair:
-                issues.append(CSVValidationIssue(line_num, 3, "CRC32", "CRC32 truncated to 8 characters", original, truncated))
-                return truncated
-            else:
-                issues.append(CSVValidationIssue(line_num, 3, "CRC32", "CRC32 too long", original))
-                return original
-        elif len(hex_only) < 8 and len(hex_only) > 0:
-            # Pad with zeros
-            padded = hex_only.zfill(8)
-            if repair:
-                issues.append(CSVValidationIssue(line_num, 3, "CRC32", "CRC32 padded with zeros", original, padded))
-                return padded
-            else:
-                issues.append(CSVValidationIssue(line_num, 3, "CRC32", "CRC32 too short", original))
-                return original
+            issues.append(CSVValidationIssue(line_num, 3, FIELD_CRC32, ISSUE_CRC_TOO_LONG, original))
+            return original
+    elif len(hex_only) < 8 and len(hex_only) > 0:
+        # Pad with zeros
+        padded = hex_only.zfill(8)
+        if repair:
+            issues.append(CSVValidationIssue(line_num, 3, FIELD_CRC32, ISSUE_CRC_PADDED, original, padded))
+            return padded
         else:
-            if repair:
-                issues.append(CSVValidationIssue(line_num, 3, "CRC32", "Invalid CRC32 - no valid hex found", original, "00000000"))
-                return "00000000"
-            else:
-                issues.append(CSVValidationIssue(line_num, 3, "CRC32", "Invalid CRC32 - no valid hex found", original))
-                return original
-    
-    return crc32
+            issues.append(CSVValidationIssue(line_num, 3, FIELD_CRC32, ISSUE_CRC_TOO_SHORT, original))
+            return original
+    else:
+        if repair:
+            issues.append(CSVValidationIssue(line_num, 3, FIELD_CRC32, ISSUE_CRC_NO_HEX, original, "00000000"))
+            return "00000000"
+        else:
+            issues.append(CSVValidationIssue(line_num, 3, FIELD_CRC32, ISSUE_CRC_NO_HEX, original))
+            return original
 
 
 def validate_path(path, line_num, issues, repair=True):
@@ -367,20 +486,19 @@ def validate_path(path, line_num, issues, repair=True):
     
     # Preserve Unicode characters (important for international character sets)
     # Just remove truly problematic characters
-    invalid_chars = r'[<>"|?*\x00-\x1f]'
-    if re.search(invalid_chars, path):
+    repaired = path.translate(_INVALID_PATH_TABLE)
+    if repaired != path:
         if repair:
-            repaired = re.sub(invalid_chars, '_', path)
-            issues.append(CSVValidationIssue(line_num, 4, "Path", "Invalid path characters removed", original, repaired))
+            issues.append(CSVValidationIssue(line_num, 4, FIELD_PATH, ISSUE_PATH_CHARS_REMOVED, original, repaired))
             path = repaired
         else:
-            issues.append(CSVValidationIssue(line_num, 4, "Path", "Invalid path characters present", original))
+            issues.append(CSVValidationIssue(line_num, 4, FIELD_PATH, ISSUE_PATH_CHARS, original))
     
     # Normalize path separators (optional - keep as-is for now)
     # path = path.replace('/', '\\')
     
     if repair and original != path and path:
-        issues.append(CSVValidationIssue(line_num, 4, "Path", "Whitespace or invalid characters removed", original, path))
+        issues.append(CSVValidationIssue(line_num, 4, FIELD_PATH, ISSUE_PATH_CLEANED, original, path))
     
     return path
 
@@ -391,7 +509,15 @@ def validate_comment(comment, line_num, issues):
     return comment.strip() if comment else ""
 
 
-def archive_csv_file(csv_file_path, archive_folder, timestamp=None, move_original=False):
+# --archive-compress choices: (zipfile compression, compresslevel)
+ARCHIVE_COMPRESSION = {
+    'none': (zipfile.ZIP_STORED, None),
+    'fast': (zipfile.ZIP_DEFLATED, 1),
+    'default': (zipfile.ZIP_DEFLATED, 6),
+}
+
+
+def archive_csv_file(csv_file_path, archive_folder, timestamp=None, move_original=False, compresslevel=1, compression=zipfile.ZIP_DEFLATED, raise_errors=False):
     """
     Archive a CSV file by creating a timestamped zip file in the Archive folder.
     
@@ -400,6 +526,12 @@ def archive_csv_file(csv_file_path, archive_folder, timestamp=None, move_origina
         archive_folder: Path to the Archive folder
         timestamp: Optional timestamp string (default: current datetime)
         move_original: If True, move original file to Archive folder after zipping
+        compresslevel: DEFLATE level 0-9 (default 1: CSV text still compresses
+                       well at the fastest level, several times quicker than 6)
+        compression: zipfile compression method; ZIP_STORED skips compression
+                     entirely and archives at disk speed
+        raise_errors: If True, let a failure propagate instead of printing a warning
+                      (used for background archiving, where the caller reports it)
     
     Returns:
         str: Path to created archive file, or None if failed
@@ -421,7 +553,7 @@ def archive_csv_file(csv_file_path, archive_folder, timestamp=None, move_origina
     
     try:
         # Create zip file with the CSV
-        with zipfile.ZipFile(archive_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        with zipfile.ZipFile(archive_path, 'w', compression, compresslevel=compresslevel) as zipf:
             zipf.write(csv_file_path, os.path.basename(csv_file_path))
         
         # Move original file to Archive folder if requested
@@ -435,11 +567,141 @@ def archive_csv_file(csv_file_path, archive_folder, timestamp=None, move_origina
         
         return archive_path
     except Exception as e:
+        if raise_errors:
+            raise
         print(f"Warning: Failed to archive {os.path.basename(csv_file_path)}: {e}")
         return None
 
 
-def validate_and_repair_csv(input_file, output_file=None, log_file=None, dry_run=False, use_subfolders=False, archive_original=False, skip_rewrite_if_clean=False, normalize_crc32=False, normalize_only=False, flag_nonutf8=False, repair=False):
+# Threads used by bulk mode to archive originals in the background
+ARCHIVE_WORKERS = 4
+
+# Validation cache kept in the folder of the validated CSVs (see --cache)
+VALIDATION_CACHE_NAME = '.validation_cache.json'
+
+# Buffer size for the input, output and log files; the default 8 KiB buffer turns
+# a large CSV into thousands of small read()/write() syscalls
+IO_BUFFER_SIZE = 1024 * 1024
+
+# --quote choices for repaired CSVs. QUOTE_ALL is the long-standing output format;
+# QUOTE_MINIMAL only quotes fields that need it and gives noticeably smaller files.
+QUOTING_MODES = {
+    'all': csv.QUOTE_ALL,
+    'minimal': csv.QUOTE_MINIMAL,
+}
+
+def _fadvise(fd, advice_name):
+    """Pass an access-pattern hint to the kernel where posix_fadvise is available (Linux/BSD)."""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        # Purely advisory; some filesystems reject it
+        pass
+
+
+# Rows handed to the background CSV writer per batch, and batches allowed in flight
+WRITE_BATCH_ROWS = 4096
+WRITE_QUEUE_BATCHES = 8
+
+
+class _BackgroundCSVWriter:
+    """
+    Write batches of rows to a CSV on a background thread.
+
+    Rows go to a temporary file next to the target that replaces it on close(),
+    so a run that fails half-way leaves any previous output untouched. The
+    bounded queue keeps at most WRITE_QUEUE_BATCHES batches in memory.
+    """
+
+    def __init__(self, path, quoting=csv.QUOTE_ALL):
+        self.path = path
+        self._quoting = quoting
+        self._tmp_path = path + '.tmp'
+        self._queue = queue.Queue(maxsize=WRITE_QUEUE_BATCHES)
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        batch = ()
+        try:
+            with open(self._tmp_path, 'w', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as outfile:
+                writerows = csv.writer(outfile, quoting=self._quoting).writerows
+                while True:
+                    batch = self._queue.get()
+                    if batch is None:
+                        break
+                    writerows(batch)
+        except Exception as e:
+            self._error = e
+            # Keep draining so the producer never blocks on a full queue
+            while batch is not None:
+                batch = self._queue.get()
+
+    def put(self, rows):
+        """Queue a list of rows for writing (blocks while the queue is full)."""
+        self._queue.put(rows)
+
+    def _finish(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def close(self):
+        """Write the remaining rows and move the file into place; re-raises a write error."""
+        self._finish()
+        if self._error is not None:
+            self.abort()
+            raise self._error
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """Stop the writer and discard the partial file."""
+        if self._thread.is_alive():
+            self._finish()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
+
+
+def _load_validation_cache(cache_path):
+    """
+    Load the validation cache ({abs_path: [size, mtime_ns, digest, options, rows]})
+    written by a previous run. Only files that validated clean are recorded.
+    Returns an empty cache if the file is missing or unreadable.
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_validation_cache(cache_path, cache):
+    """Write the validation cache atomically so an interrupted run never leaves a torn file."""
+    tmp_path = cache_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Failed to write validation cache {cache_path}: {e}")
+
+
+def _file_digest(path):
+    """Return a hex blake2b digest of the file's content."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def validate_and_repair_csv(input_file, output_file=None, log_file=None, dry_run=False, use_subfolders=False, archive_original=False, skip_rewrite_if_clean=False, normalize_crc32=False, normalize_only=False, flag_nonutf8=False, repair=False, cache=None, archive_executor=None, group_duplicates=False, archive_compress='fast', quote='all', run_timestamp=None, log_timestamp=None):
     """
     Validate and repair a CSV file.
     
@@ -450,12 +712,28 @@ def validate_and_repair_csv(input_file, output_file=None, log_file=None, dry_run
         dry_run: If True, only validate and log issues without creating output file
         use_subfolders: If True, organize output into CleanCSVs/Logs/Archive subfolders
         archive_original: If True, create timestamped zip of original CSV in Archive folder
+        cache: Optional validation cache dict (see _load_validation_cache). A file that
+               validated clean with the same options and is unchanged (size, mtime and
+               content digest) is skipped without parsing, provided this run would
+               write nothing for a clean file anyway (dry run or skip_rewrite_if_clean,
+               no archiving, no CRC normalization log). The cache is updated in place.
+        archive_executor: Optional executor to run archive_csv_file on; archive_file_path
+                          is then a Future of the archive path (used by bulk mode)
+        group_duplicates: If True, report each group of duplicate CRC32/Size rows as a
+                          single issue (on the group's first line) instead of one per row
+        archive_compress: Archive zip compression, a key of ARCHIVE_COMPRESSION
+                          ('none', 'fast' or 'default')
+        quote: Quoting of the repaired CSV, a key of QUOTING_MODES ('all' or 'minimal')
+        run_timestamp: Optional archive timestamp ('%Y%m%d_%H%M%S'); bulk mode passes one
+                       per run instead of formatting the time for every file
+        log_timestamp: Optional log header timestamp ('%Y-%m-%d %H:%M:%S'), as above
     
     Returns:
         tuple: (issues_found, rows_processed, output_file_path, archive_file_path)
     """
     # Generate timestamp for this run (used for archive if enabled)
-    run_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    if run_timestamp is None:
+        run_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
     # Generate output filenames if not provided
     if output_file is None:
@@ -489,15 +767,40 @@ def validate_and_repair_csv(input_file, output_file=None, log_file=None, dry_run
         os.makedirs(archive_folder, exist_ok=True)
     
     issues = []
+    # Output rows as tuples of str (smaller than lists; rows are never modified)
     repaired_rows = []
-    row_line_numbers = []
+    # Source line of each output row, as unboxed 4-byte ints (one per row of the file)
+    row_line_numbers = array.array('I')
     line_num = 0
     header_detected = False
+    # Set when a repair changes a field without reporting an issue (e.g. CRC32
+    # case normalization), so skip_rewrite_if_clean still writes the change
+    dirty = False
     encoding_used = 'utf-8'
     
     print(f"Validating CSV: {input_file}")
     print(f"{'DRY RUN - ' if dry_run else ''}Output will be written to: {output_file}")
     print(f"Log will be written to: {log_file}")
+
+    # Look the file up in the validation cache before doing any parsing work
+    validation_key = cache_meta = digest = None
+    if cache is not None:
+        try:
+            st = os.stat(input_file)
+        except OSError:
+            pass
+        else:
+            validation_key = os.path.abspath(input_file)
+            options = [repair, normalize_crc32, normalize_only, flag_nonutf8]
+            cache_meta = [st.st_size, st.st_mtime_ns, options]
+            cached = cache.get(validation_key)
+            writes_nothing_if_clean = (dry_run or skip_rewrite_if_clean) and not archive_original and not normalize_crc32
+            if (writes_nothing_if_clean and isinstance(cached, list) and len(cached) == 5
+                    and [cached[0], cached[1], cached[3]] == cache_meta):
+                digest = _file_digest(input_file)
+                if cached[2] == digest:
+                    print(f"Unchanged since its last clean validation; skipping (cached, {cached[4]} rows)")
+                    return [], cached[4], None, None
     if normalize_crc32:
         if normalize_only:
             print("Note: CRC32 normalization is ENABLED for this run (normalize-only mode)")
@@ -506,14 +809,15 @@ def validate_and_repair_csv(input_file, output_file=None, log_file=None, dry_run
     print()
     
     # Detect BOM first (to correctly handle UTF-16/UTF-32 with BOM)
-    file_content = None
     encoding_used = None
     try:
         with open(input_file, 'rb') as bf:
-            header = bf.read(4)
+            head = bf.read(_ENCODING_PROBE_SIZE)
+            file_size = os.fstat(bf.fileno()).st_size
     except Exception as e:
         print(f"ERROR: Unable to open file in binary mode: {e}")
         return None, 0, None, None
+    header = head[:4]
 
     # BOM signatures
     if header.startswith(b'\xff\xfe\x00\x00'):
@@ -531,190 +835,255 @@ def validate_and_repair_csv(input_file, output_file=None, log_file=None, dry_run
     else:
         detected = None
 
+    # Candidate order: the BOM-detected encoding, then UTF-8, then the encoding that
+    # worked for a previous file with the same size and leading bytes, then (if
+    # charset_normalizer is installed) its guess, then the remaining common encodings
+    # (including utf-16 fallback). The cached guess only comes after UTF-8: the key
+    # covers just the first bytes, and a legacy codec that decoded an earlier file
+    # would also "decode" valid UTF-8 into mojibake. A cached guess that fails
+    # simply falls through.
+    # Each candidate is checked by decoding the whole file in chunks without keeping
+    # it; the rows are then streamed from a fresh handle below.
+    encoding_key = (file_size, hashlib.blake2b(head, digest_size=8).digest())
+    candidates = []
     if detected:
-        try:
-            with open(input_file, 'r', newline='', encoding=detected) as test_file:
-                file_content = test_file.readlines()
-                encoding_used = detected
-                if detected not in ('utf-8', 'utf-8-sig'):
-                    print(f"Note: File encoding detected as {detected} (via BOM)")
-                    if flag_nonutf8:
-                        issues.append(CSVValidationIssue(0, 0, "File", f"Non-UTF-8 encoding detected: {detected}", input_file))
-        except Exception:
-            # Fall through to try other encodings below
-            file_content = None
-
-    # If no BOM-detected encoding succeeded, try common encodings (including utf-16 fallback)
-    if file_content is None:
-        encodings_to_try = ['utf-8-sig', 'utf-8', 'mbcs', 'cp1250', 'cp1252', 'latin-1', 'iso-8859-1', 'iso-8859-2', 'utf-16']
-        # 'mbcs' is a Windows-only codec; skip it on non-Windows platforms to avoid LookupError
-        if sys.platform != 'win32':
-            encodings_to_try = [e for e in encodings_to_try if e.lower() != 'mbcs']
-        # Filter encodings list to only those supported on this platform
-        try:
-            import codecs
-            supported_encodings = []
-            for e in encodings_to_try:
-                try:
-                    codecs.lookup(e)
-                    supported_encodings.append(e)
-                except LookupError:
-                    # encoding not available on this platform; skip
-                    continue
-            encodings_to_try = supported_encodings
-        except Exception:
-            # If codecs isn't usable for some reason, fall back to original list
-            pass
+        candidates.append((detected, 'via BOM'))
+    candidates.extend((e, 'fallback') for e in _FALLBACK_ENCODINGS[:2])
+    if encoding_key in _ENCODING_CACHE:
+        candidates.append(_ENCODING_CACHE[encoding_key])
+    candidates.append((_DETECTED_ENCODING, 'via charset detection'))
+    candidates.extend((e, 'fallback') for e in _FALLBACK_ENCODINGS[2:])
 
-        for encoding in encodings_to_try:
-            try:
-                with open(input_file, 'r', newline='', encoding=encoding) as test_file:
-                    file_content = test_file.readlines()
-                    encoding_used = encoding
-                    if encoding not in ('utf-8', 'utf-8-sig'):
-                        print(f"Note: File encoding detected as {encoding} (fallback)")
-                        if flag_nonutf8:
-                            issues.append(CSVValidationIssue(0, 0, "File", f"Non-UTF-8 encoding detected: {encoding}", input_file))
-                    break
-            except (UnicodeDecodeError, UnicodeError, LookupError):
-                # Unicode/LUT errors mean this encoding isn't suitable on this platform
+    tried = set()
+    for encoding, source in candidates:
+        if encoding is _DETECTED_ENCODING:
+            # Only reached for files that are not valid UTF-8
+            encoding = _detect_encoding(input_file)
+            if encoding is None:
                 continue
+        if encoding in tried:
+            continue
+        tried.add(encoding)
+        try:
+            with open(input_file, 'r', newline='', encoding=encoding) as test_file:
+                _fadvise(test_file.fileno(), 'POSIX_FADV_SEQUENTIAL')
+                while test_file.read(1024 * 1024):
+                    pass
+        except (UnicodeDecodeError, UnicodeError, LookupError):
+            # Unicode/LUT errors mean this encoding isn't suitable on this platform
+            continue
+        except Exception:
+            # Only the common-encodings pass lets other errors (e.g. I/O) propagate
+            if source == 'fallback':
+                raise
+            continue
+        encoding_used = encoding
+        _ENCODING_CACHE[encoding_key] = (encoding, source)
+        if encoding not in ('utf-8', 'utf-8-sig'):
+            print(f"Note: File encoding detected as {encoding} ({source})")
+            if flag_nonutf8:
+                issues.append(CSVValidationIssue(0, 0, FIELD_FILE, f"Non-UTF-8 encoding detected: {encoding}", input_file))
+        break
     
-    if file_content is None:
+    if encoding_used is None:
         print(f"ERROR: Could not decode file with any supported encoding")
         return None, 0, None, None
 
-    # Strip a possible leading BOM character from the first line if present (safeguard)
-    if file_content and len(file_content) > 0:
-        file_content[0] = file_content[0].lstrip('\ufeff')
-    
-    try:
-        for raw_line in file_content:
-            # Skip blank/empty lines BEFORE incrementing line_num
-            if not raw_line.strip():
-                continue
-            line_num += 1
-            # Parse the line respecting quoted fields, passing line_num and issues for logging
-            fields = parse_csv_line_with_quotes(raw_line, line_num=line_num, issues=issues)
-            # Skip lines that result in no fields (edge case)
-            if not fields or (len(fields) == 1 and not fields[0]):
-                continue
-            # Check if this is a header row
-            if line_num == 1 and len(fields) >= 3:
-                if fields[0].lower() in ['filename', 'file', 'name'] or fields[2].lower() in ['crc32', 'crc', 'checksum']:
-                    header_detected = True
-                    print(f"Header row detected on line {line_num}, skipping validation")
-                    repaired_rows.append(fields)
-                    row_line_numbers.append(line_num)
-                    continue
-            # Validate we have at least 4 fields (FileName, Size, CRC32, Path)
-            if len(fields) < 4:
-                issues.append(CSVValidationIssue(line_num, 0, "Row", f"Insufficient fields (found {len(fields)}, expected at least 4)", raw_line.strip()))
-                while len(fields) < 4:
-                    fields.append("")
-            # Validate and repair each field
-            filename = validate_filename(fields[0], line_num, issues, repair=repair)
-            size = validate_size(fields[1], line_num, issues, repair=repair)
-            # Determine per-field repair behavior. If `normalize_only` is set we
-            # only apply normalization to CRC32 and avoid changing other fields.
-            filename_repair = repair and not normalize_only
-            size_repair = repair and not normalize_only
-            path_repair = repair and not normalize_only
-            crc_repair = normalize_crc32 or repair
-
-            filename = validate_filename(fields[0], line_num, issues, repair=filename_repair)
-            size = validate_size(fields[1], line_num, issues, repair=size_repair)
-            crc32 = validate_crc32(fields[2], line_num, issues, repair=crc_repair)
-            path = validate_path(fields[3], line_num, issues, repair=path_repair)
-            # Merge all remaining fields into comment (handles unquoted comments with commas)
-            if len(fields) >= 5:
-                # Join fields 4 onwards with commas (they were split due to unquoted commas in comment)
-                comment = ','.join(fields[4:])
-                comment = validate_comment(comment, line_num, issues)
-            else:
-                comment = ""
-            # Build repaired row
-            repaired_row = [filename, size, crc32, path, comment]
-            repaired_rows.append(repaired_row)
-            row_line_numbers.append(line_num)
-        
-        # After processing all rows, check for duplicate CRC32 values (validation-only flagging)
-        crc_map = {}
-        for idx, row in enumerate(repaired_rows):
-            # Skip header row if present
-            if header_detected and idx == 0 and row_line_numbers[idx] == 1:
-                continue
+    # Determine per-field repair behavior once per file. If `normalize_only` is
+    # set we only apply normalization to CRC32 and avoid changing other fields.
+    filename_repair = repair and not normalize_only
+    size_repair = repair and not normalize_only
+    path_repair = repair and not normalize_only
+    crc_repair = normalize_crc32 or repair
+    # CRC digits a clean row may use without validate_crc32 changing it
+    crc_digits = _HEX_UPPER_SET if crc_repair else _HEX_SET
+    # Local aliases for the per-row hot loop (avoids repeated global/attribute lookups)
+    parse_line = parse_csv_line_with_quotes
+    add_row = repaired_rows.append
+    add_line_number = row_line_numbers.append
+
+    # Duplicate CRC32 detection (validation-only flagging) groups rows by (CRC, Size).
+    # Normalize-only runs just want the CRC32 column rewritten, so they skip it.
+    # Entries are (row index, CRC as written) so rows need not be kept for the report.
+    crc_map = None if normalize_only else defaultdict(list)
+    keep_hex = _CRC_KEEP_TABLE
+
+    def collect_duplicates(rows, offset):
+        # Row 0 is the header when one was detected
+        start = 1 if header_detected and offset == 0 else 0
+        groups = crc_map
+        for idx, row in enumerate(itertools.islice(rows, start, None), offset + start):
             # Ensure row has a CRC field and a Size field
-            crc_field = row[2] if len(row) >= 3 else ''
-            size_field = row[1] if len(row) >= 2 else ''
+            if len(row) < 3:
+                continue
             # Normalize CRC by extracting hex characters and uppercasing and zero-pad/truncate to 8
-            hex_only = re.sub(r'[^0-9A-Fa-f]', '', str(crc_field))
+            hex_only = row[2].translate(keep_hex)
             if not hex_only:
                 continue
             norm = hex_only.upper().zfill(8)[:8]
             # Normalize size: try to convert to int, fallback to string
             try:
-                norm_size = int(str(size_field).strip())
-            except Exception:
-                norm_size = str(size_field).strip()
+                norm_size = int(row[1])
+            except ValueError:
+                norm_size = row[1].strip()
             # Only consider duplicates if both CRC and Size are identical
-            key = f"{norm}:{norm_size}"
-            crc_map.setdefault(key, []).append(idx)
-
-        # Flag duplicates for any CRC that occurs more than once
-        for key, indices in crc_map.items():
-            if len(indices) > 1:
-                # prepare list of line numbers
-                lines_list = [row_line_numbers[i] for i in indices]
-                lines_str = ", ".join(str(ln) for ln in lines_list)
-                # key format: CRC:SIZE
-                crc_part, size_part = key.split(':', 1)
-                for i in indices:
-                    line_num_i = row_line_numbers[i]
-                    orig_val = repaired_rows[i][2] if len(repaired_rows[i]) >= 3 else ''
-                    issues.append(CSVValidationIssue(line_num_i, 3, "CRC32", f"Duplicate CRC32 value found; CRC={crc_part}, Size={size_part}; also used on lines: {lines_str}", orig_val))
+            groups[(norm, norm_size)].append((idx, row[2]))
+
+    # When the output will be written regardless of the issues found, it is
+    # streamed to a writer thread in batches while later rows are still being
+    # validated; skip_rewrite_if_clean needs every issue first, so it buffers.
+    writer = None
+    if not dry_run and not skip_rewrite_if_clean:
+        writer = _BackgroundCSVWriter(output_file, QUOTING_MODES[quote])
+    row_offset = 0
+
+    try:
+        # Read in IO_BUFFER_SIZE chunks with a sequential read-ahead hint rather
+        # than the default 8 KiB buffer
+        with open(input_file, 'r', newline='', encoding=encoding_used, buffering=IO_BUFFER_SIZE) as csv_lines:
+            _fadvise(csv_lines.fileno(), 'POSIX_FADV_SEQUENTIAL')
+            # Strip a possible leading BOM character from the first line if present (safeguard)
+            first_line = csv_lines.readline().lstrip('\ufeff')
+            lines = itertools.chain((first_line,), csv_lines)
+            # Header detection only applies to the first non-blank line, so it is
+            # peeled off here instead of being tested on every row of the loop below
+            for raw_line in lines:
+                if not raw_line.strip():
+                    continue
+                fields = parse_line(raw_line, 1, issues)
+                if len(fields) >= 3 and (fields[0].lower() in ['filename', 'file', 'name'] or fields[2].lower() in ['crc32', 'crc', 'checksum']):
+                    header_detected = True
+                    line_num = 1
+                    print(f"Header row detected on line {line_num}, skipping validation")
+                    add_row(tuple(fields))
+                    add_line_number(line_num)
+                else:
+                    # Not a header: validate it as the first data row
+                    lines = itertools.chain((raw_line,), lines)
+                break
+            for raw_line in lines:
+                if writer is not None and len(repaired_rows) >= WRITE_BATCH_ROWS:
+                    if crc_map is not None:
+                        collect_duplicates(repaired_rows, row_offset)
+                    writer.put(repaired_rows)
+                    row_offset += len(repaired_rows)
+                    repaired_rows = []
+                    add_row = repaired_rows.append
+                # Skip blank/empty lines BEFORE incrementing line_num
+                if not raw_line.strip():
+                    continue
+                line_num += 1
+                # Parse the line respecting quoted fields, passing line_num and issues for logging
+                fields = parse_line(raw_line, line_num, issues)
+                # Skip lines that result in no fields (edge case)
+                if not fields or (len(fields) == 1 and not fields[0]):
+                    continue
+                # Fast path for rows the validators would accept unchanged and without
+                # issues: no surrounding whitespace, digits-only size, 8-digit hex CRC
+                # and no invalid characters in filename or path.
+                if 4 <= len(fields) <= 5:
+                    name, size, crc32, path = fields[0], fields[1], fields[2], fields[3]
+                    if (size.isdigit() and _is_hex8(crc32, crc_digits)
+                            and name and name == name.strip() and path == path.strip()
+                            and _INVALID_FN_SET.isdisjoint(name) and _INVALID_PATH_SET.isdisjoint(path)):
+                        if len(fields) == 5:
+                            comment = fields[4].strip()
+                            if comment != fields[4]:
+                                dirty = True
+                        else:
+                            comment = ""
+                        add_row((name, size, crc32, path, comment))
+                        add_line_number(line_num)
+                        continue
+                # Validate we have at least 4 fields (FileName, Size, CRC32, Path)
+                if len(fields) < 4:
+                    issues.append(CSVValidationIssue(line_num, 0, FIELD_ROW, f"Insufficient fields (found {len(fields)}, expected at least 4)", raw_line.strip()))
+                    while len(fields) < 4:
+                        fields.append("")
+                # Validate and repair each field
+                filename = validate_filename(fields[0], line_num, issues, repair=filename_repair)
+                size = validate_size(fields[1], line_num, issues, repair=size_repair)
+                crc32 = validate_crc32(fields[2], line_num, issues, repair=crc_repair)
+                path = validate_path(fields[3], line_num, issues, repair=path_repair)
+                # Merge all remaining fields into comment (handles unquoted comments with commas)
+                if len(fields) >= 5:
+                    # Join fields 4 onwards with commas (they were split due to unquoted commas in comment)
+                    raw_comment = ','.join(fields[4:])
+                    comment = validate_comment(raw_comment, line_num, issues)
+                    if comment != raw_comment or len(fields) > 5:
+                        dirty = True
+                else:
+                    comment = ""
+                if filename != fields[0] or size != fields[1] or crc32 != fields[2] or path != fields[3]:
+                    dirty = True
+                # Build repaired row
+                add_row((filename, size, crc32, path, comment))
+                add_line_number(line_num)
+        
+        # After processing all rows, flag duplicate CRC32 values; only groups with
+        # more than one row are looked at again.
+        if crc_map is not None:
+            collect_duplicates(repaired_rows, row_offset)
+            for (crc_part, size_part), entries in crc_map.items():
+                if len(entries) > 1:
+                    # prepare list of line numbers
+                    group_lines = [row_line_numbers[i] for i, _ in entries]
+                    lines_str = ", ".join(map(str, group_lines))
+                    if group_duplicates:
+                        issues.append(CSVValidationIssue(group_lines[0], 3, FIELD_CRC32, f"Duplicate CRC32 group; CRC={crc_part}, Size={size_part}; {len(entries)} rows on lines: {lines_str}", entries[0][1]))
+                        continue
+                    for group_line, (_, value) in zip(group_lines, entries):
+                        issues.append(CSVValidationIssue(group_line, 3, FIELD_CRC32, f"Duplicate CRC32 value found; CRC={crc_part}, Size={size_part}; also used on lines: {lines_str}", value))
+
+        # Validation-only runs trim values just to check them; only a repair or
+        # normalize run changes fields on purpose, so only those can leave a file dirty
+        if not (repair or normalize_crc32):
+            dirty = False
 
         # Write output CSV if not dry run && either (we found issues) or the caller explicitly allows rewriting clean files
         if not dry_run:
-            if skip_rewrite_if_clean and not issues:
+            if skip_rewrite_if_clean and not issues and not dirty:
                 print("No issues found; skipping rewrite of the original CSV as requested.")
                 # If skipping rewrite, keep the original output_file value None to indicate no file was written
                 output_file = None
+            elif writer is not None:
+                writer.put(repaired_rows)
+                writer.close()
+                writer = None
             else:
-                with open(output_file, 'w', newline='', encoding='utf-8') as outfile:
-                    writer = csv.writer(outfile, quoting=csv.QUOTE_ALL)
-                    for row in repaired_rows:
-                        # Ensure all fields are str and encode/decode to preserve Unicode
-                        safe_row = [str(field) if field is not None else '' for field in row]
-                        writer.writerow(safe_row)
+                # Every field is already a str (parser output or validator result), so the
+                # rows go to csv.writer in one writerows() call through a large buffer
+                with open(output_file, 'w', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as outfile:
+                    csv.writer(outfile, quoting=QUOTING_MODES[quote]).writerows(repaired_rows)
         # Write log file if issues were found or if CRC normalization was requested
         if issues or normalize_crc32:
-            with open(log_file, 'w', encoding='utf-8') as logf:
-                logf.write("CSV Validation and Repair Log\n")
-                logf.write("" + ('=' * 80) + "\n")
-                logf.write(f"Input File: {input_file}\n")
-                logf.write(f"Output File: {output_file}\n")
-                logf.write(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                logf.write(f"Mode: {'DRY RUN (validation only)' if dry_run else 'REPAIR'}\n")
-                logf.write(f"Normalize CRC32: {'Yes' if normalize_crc32 else 'No'}\n")
-                logf.write(f"Normalize Only: {'Yes' if normalize_only else 'No'}\n")
-                logf.write(f"\nTotal Rows Processed: {line_num}\n")
-                logf.write(f"Total Issues Found: {len(issues)}\n")
-                logf.write(f"Header Row Detected: {'Yes' if header_detected else 'No'}\n")
-                logf.write(f"\n{'=' * 80}\n\n")
-                logf.write("Issues Found:\n")
-                logf.write("-" * 80 + "\n")
-                for issue in issues:
-                    logf.write(str(issue) + "\n")
+            # Build the whole log in memory and hand it to the file in one write
+            parts = [
+                "CSV Validation and Repair Log\n",
+                "" + ('=' * 80) + "\n",
+                f"Input File: {input_file}\n",
+                f"Output File: {output_file}\n",
+                f"Timestamp: {log_timestamp or datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n",
+                f"Mode: {'DRY RUN (validation only)' if dry_run else 'REPAIR'}\n",
+                f"Normalize CRC32: {'Yes' if normalize_crc32 else 'No'}\n",
+                f"Normalize Only: {'Yes' if normalize_only else 'No'}\n",
+                f"\nTotal Rows Processed: {line_num}\n",
+                f"Total Issues Found: {len(issues)}\n",
+                f"Header Row Detected: {'Yes' if header_detected else 'No'}\n",
+                f"\n{'=' * 80}\n\n",
+                "Issues Found:\n",
+                "-" * 80 + "\n",
+            ]
+            parts.extend([f"{issue}\n" for issue in issues])
+            with open(log_file, 'w', encoding='utf-8', buffering=IO_BUFFER_SIZE) as logf:
+                logf.write("".join(parts))
         # Print summary
         print(f"\nValidation Complete!")
         print(f"  Rows processed: {line_num}")
         print(f"  Issues found: {len(issues)}")
         if issues:
             print(f"\n  Issue breakdown:")
-            issue_types = {}
-            for issue in issues:
-                issue_types[issue.issue_type] = issue_types.get(issue.issue_type, 0) + 1
+            issue_types = Counter(issue.issue_type for issue in issues)
             for issue_type, count in sorted(issue_types.items()):
                 print(f"    - {issue_type}: {count}")
             print(f"\nDetailed log written to: {log_file}")
@@ -729,21 +1098,103 @@ def validate_and_repair_csv(input_file, output_file=None, log_file=None, dry_run
                 input_dir = os.path.dirname(input_file) if os.path.dirname(input_file) else "."
                 archive_folder = os.path.join(input_dir, "Archive")
             
-            archive_path = archive_csv_file(input_file, archive_folder, run_timestamp, move_original=True)
-            if archive_path:
-                print(f"Original CSV archived to: {archive_path}")
-                print(f"Original CSV moved to Archive folder")
+            compression, compresslevel = ARCHIVE_COMPRESSION[archive_compress]
+            if archive_executor is not None:
+                # Zip and move in the background while the caller validates the next file
+                archive_path = archive_executor.submit(archive_csv_file, input_file, archive_folder, run_timestamp, move_original=True, compresslevel=compresslevel, compression=compression, raise_errors=True)
+            else:
+                archive_path = archive_csv_file(input_file, archive_folder, run_timestamp, move_original=True, compresslevel=compresslevel, compression=compression)
+                if archive_path:
+                    print(f"Original CSV archived to: {archive_path}")
+                    print(f"Original CSV moved to Archive folder")
         
+        # Remember clean results so an unchanged file can be skipped next time
+        if validation_key is not None:
+            if issues or archive_path or dirty:
+                cache.pop(validation_key, None)
+            else:
+                if digest is None:
+                    digest = _file_digest(input_file)
+                size, mtime_ns, options = cache_meta
+                cache[validation_key] = [size, mtime_ns, digest, options, line_num]
+
         return issues, line_num, output_file, archive_path
     
     except Exception as e:
+        if writer is not None:
+            writer.abort()
         print(f"ERROR: Failed to process CSV file: {e}")
         import traceback
         traceback.print_exc()
         return None, 0, None, None
 
 
-def process_folder_bulk(folder_path, output_folder=None, dry_run=False, use_subfolders=True, archive_originals=False, skip_rewrite_if_clean=False, normalize_crc32=False, normalize_only=False, flag_nonutf8=False, repair=False):
+def _process_one(job, options, cache=None, archive_executor=None):
+    """
+    Validate one CSV of a bulk run.
+
+    Args:
+        job: (idx, total, csv_file, input_path, output_path, log_path) tuple
+        options: validate_and_repair_csv keyword arguments shared by every file
+
+    Returns:
+        tuple: (issue_count or None on failure, rows, archive_path)
+    """
+    idx, total, csv_file, input_path, output_path, log_path = job
+    print(f"\n[{idx}/{total}] Processing: {csv_file}")
+    print("-" * 80)
+    issues, rows, output, archive_path = validate_and_repair_csv(
+        input_path,
+        output_file=output_path,
+        log_file=log_path,
+        cache=cache,
+        archive_executor=archive_executor,
+        **options
+    )
+    return (None if issues is None else len(issues)), rows, archive_path
+
+
+def _process_one_worker(job, options, cache):
+    """
+    ProcessPoolExecutor entry point for _process_one.
+
+    Output is captured and handed back so the parent can print each file's
+    report in order; cache is the (possibly empty) slice of the validation
+    cache for this file, returned updated so the parent can merge it.
+    """
+    out = io.StringIO()
+    result = error = None
+    with contextlib.redirect_stdout(out):
+        try:
+            result = _process_one(job, options, cache)
+        except Exception as e:
+            error = str(e)
+    return out.getvalue(), result, error, cache
+
+
+@contextlib.contextmanager
+def _block_buffered_stdout():
+    """
+    Switch a line-buffered stdout (a console) to block buffering for the duration.
+
+    Bulk runs print dozens of lines per file; without line buffering they are
+    flushed once per file instead of once per line.
+    """
+    stream = sys.stdout
+    reconfigure = getattr(stream, 'reconfigure', None)
+    if reconfigure is None or not getattr(stream, 'line_buffering', False):
+        yield
+        return
+    reconfigure(line_buffering=False)
+    try:
+        yield
+    finally:
+        stream.flush()
+        reconfigure(line_buffering=True)
+
+
+@_block_buffered_stdout()
+def process_folder_bulk(folder_path, output_folder=None, dry_run=False, use_subfolders=True, archive_originals=False, skip_rewrite_if_clean=False, normalize_crc32=False, normalize_only=False, flag_nonutf8=False, repair=False, use_cache=False, workers=1, group_duplicates=False, archive_compress='fast', quote='all'):
     """
     Process all CSV files in a folder in bulk mode.
     
@@ -753,6 +1204,14 @@ def process_folder_bulk(folder_path, output_folder=None, dry_run=False, use_subf
         dry_run: If True, only validate without creating output files
         use_subfolders: If True, organize output into CleanCSVs/Logs/Archive subfolders
         archive_originals: If True, create timestamped zips of original CSVs in Archive folder
+        use_cache: If True, skip CSVs that are unchanged since they last validated clean
+                   (cache stored as .validation_cache.json in folder_path)
+        workers: Number of worker processes; files are independent, so values > 1
+                 validate several CSVs at once (each file's report is printed as
+                 it completes, in folder order)
+        group_duplicates: If True, report one issue per duplicate CRC32 group per file
+        archive_compress: Archive zip compression ('none', 'fast' or 'default')
+        quote: Quoting of repaired CSVs ('all' or 'minimal')
     
     Returns:
         dict: Summary statistics for all processed files
@@ -787,13 +1246,17 @@ def process_folder_bulk(folder_path, output_folder=None, dry_run=False, use_subf
             print(f"Created output folder: {output_folder}")
     
     # Find all CSV files (excluding already repaired files and missing files reports)
-    csv_files = [
-        f for f in os.listdir(folder_path)
-        if f.endswith('.csv')
-        and not f.endswith('_repaired.csv')
-        and '_missing_files.csv' not in f
-        and os.path.isfile(os.path.join(folder_path, f))
-    ]
+    # scandir's DirEntry.is_file() uses the type returned with the listing, so
+    # there is no extra stat() per entry; the name filters run first anyway
+    with os.scandir(folder_path) as entries:
+        csv_entries = [
+            entry for entry in entries
+            if entry.name.endswith('.csv')
+            and not entry.name.endswith('_repaired.csv')
+            and '_missing_files.csv' not in entry.name
+            and entry.is_file()
+        ]
+    csv_files = [entry.name for entry in csv_entries]
     
     if not csv_files:
         print(f"No CSV files found in: {folder_path}")
@@ -803,6 +1266,27 @@ def process_folder_bulk(folder_path, output_folder=None, dry_run=False, use_subf
     print(f"BULK MODE: Processing {len(csv_files)} CSV file(s) from: {folder_path}")
     print(f"{'=' * 80}\n")
     
+    cache_path = os.path.join(folder_path, VALIDATION_CACHE_NAME) if use_cache else None
+    cache = _load_validation_cache(cache_path) if use_cache else None
+    # Archiving (deflate + move) is I/O bound and independent of validating the
+    # next file, so it runs on a small thread pool. Each archive is reported (in
+    # file order, from this thread) as soon as it is done, and the rest at the end.
+    workers = max(1, min(workers or 1, len(csv_files)))
+    # With worker processes each worker archives its own file instead.
+    archive_pool = ThreadPoolExecutor(max_workers=ARCHIVE_WORKERS) if archive_originals and not dry_run and workers <= 1 else None
+    pending_archives = deque()  # (csv_file, Future) of background archives, in file order
+
+    def report_archive(csv_file, future):
+        try:
+            archive_path = future.result()
+        except Exception as e:
+            print(f"Warning: Failed to archive {csv_file}: {e}")
+            return
+        if archive_path:
+            results['archived_count'] += 1
+            print(f"Original CSV archived to: {archive_path}")
+            print(f"Original CSV moved to Archive folder")
+
     # Process each CSV
     results = {
         'total_files': len(csv_files),
@@ -815,39 +1299,103 @@ def process_folder_bulk(folder_path, output_folder=None, dry_run=False, use_subf
         'files': []
     }
     
-    for idx, csv_file in enumerate(csv_files, 1):
-        input_path = os.path.join(folder_path, csv_file)
-        
-        # Set output paths based on subfolder mode
-        if use_subfolders:
-            output_path = os.path.join(output_folder, "CleanCSVs", csv_file) if not dry_run else None
-            log_path = os.path.join(output_folder, "Logs", f"{os.path.splitext(csv_file)[0]}_repair_log.txt")
-        else:
-            output_path = os.path.join(output_folder, csv_file) if not dry_run else None
-            log_path = os.path.join(output_folder, f"{os.path.splitext(csv_file)[0]}_repair_log.txt")
-        
-        print(f"\n[{idx}/{len(csv_files)}] Processing: {csv_file}")
-        print("-" * 80)
+    run_started = datetime.now()
+    options = {
+        'dry_run': dry_run,
+        'use_subfolders': False,  # Already handled paths above
+        'archive_original': archive_originals,
+        'skip_rewrite_if_clean': skip_rewrite_if_clean,
+        'normalize_crc32': normalize_crc32,
+        'normalize_only': normalize_only,
+        'flag_nonutf8': flag_nonutf8,
+        'repair': repair,
+        'group_duplicates': group_duplicates,
+        'archive_compress': archive_compress,
+        'quote': quote,
+        # One timestamp for the whole run (archives and log headers)
+        'run_timestamp': run_started.strftime('%Y%m%d_%H%M%S'),
+        'log_timestamp': run_started.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    # Output locations depend only on subfolder mode, so they are joined once
+    if use_subfolders:
+        clean_dir = os.path.join(output_folder, "CleanCSVs")
+        logs_dir = os.path.join(output_folder, "Logs")
+    else:
+        clean_dir = logs_dir = output_folder
+    total = len(csv_files)
+    jobs = []
+    for idx, entry in enumerate(csv_entries, 1):
+        csv_file = entry.name
+        stem = csv_file[:-4]  # every discovered name ends in '.csv'
+        output_path = os.path.join(clean_dir, csv_file) if not dry_run else None
+        log_path = os.path.join(logs_dir, f"{stem}_repair_log.txt")
+        jobs.append((idx, total, csv_file, entry.path, output_path, log_path))
+    
+    def run_serial():
+        for job in jobs:
+            try:
+                result, error = _process_one(job, options, cache, archive_pool), None
+            except Exception as e:
+                result, error = None, str(e)
+            yield job[2], result, error
+    
+    def run_parallel(pool):
+        # Archiving happens inside each worker; the cache is sliced per file
+        # (only picklable data crosses the process boundary) and merged back.
+        futures = []
+        for job in jobs:
+            if cache is None:
+                file_cache = None
+            else:
+                key = os.path.abspath(job[3])
+                file_cache = {key: cache[key]} if key in cache else {}
+            futures.append(pool.submit(_process_one_worker, job, options, file_cache))
+        for job, future in zip(jobs, futures):
+            try:
+                output, result, error, file_cache = future.result()
+            except Exception as e:
+                # The worker itself failed (crashed child, broken pool, pickling
+                # error): record this file as an error and carry on with the rest
+                yield job[2], None, str(e) or type(e).__name__
+                continue
+            sys.stdout.write(output)
+            if file_cache is not None:
+                cache.pop(os.path.abspath(job[3]), None)
+                cache.update(file_cache)
+            yield job[2], result, error
+    
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    # Shut both pools down even if result handling fails or the run is interrupted;
+    # on that path queued work is cancelled instead of waited for
+    completed = False
+    try:
+        outcomes = run_parallel(pool) if pool is not None else run_serial()
+    
+        for csv_file, result, error in outcomes:
+            # Report archives of earlier files that have finished in the meantime
+            while pending_archives and pending_archives[0][1].done():
+                report_archive(*pending_archives.popleft())
+            # Show each file's report as soon as it is complete
+            sys.stdout.flush()
+            if error is not None:
+                print(f"ERROR processing {csv_file}: {error}")
+                results['failed'] += 1
+                results['files'].append({
+                    'name': csv_file,
+                    'status': 'ERROR',
+                    'issues': 0,
+                    'rows': 0,
+                    'error': error
+                })
+                continue
         
-        try:
-            issues, rows, output, archive_path = validate_and_repair_csv(
-                input_path,
-                output_file=output_path,
-                log_file=log_path,
-                dry_run=dry_run,
-                use_subfolders=False,  # Already handled paths above
-                archive_original=archive_originals,
-                skip_rewrite_if_clean=skip_rewrite_if_clean,
-                normalize_crc32=normalize_crc32,
-                normalize_only=normalize_only,
-                flag_nonutf8=flag_nonutf8,
-                repair=repair
-            )
-            
-            if archive_path:
+            issue_count, rows, archive_path = result
+            if isinstance(archive_path, Future):
+                pending_archives.append((csv_file, archive_path))
+            elif archive_path:
                 results['archived_count'] += 1
-            
-            if issues is None:
+        
+            if issue_count is None:
                 results['failed'] += 1
                 results['files'].append({
                     'name': csv_file,
@@ -855,14 +1403,14 @@ def process_folder_bulk(folder_path, output_folder=None, dry_run=False, use_subf
                     'issues': 0,
                     'rows': 0
                 })
-            elif len(issues) > 0:
+            elif issue_count > 0:
                 results['with_issues'] += 1
-                results['total_issues'] += len(issues)
+                results['total_issues'] += issue_count
                 results['total_rows'] += rows
                 results['files'].append({
                     'name': csv_file,
                     'status': 'ISSUES_FOUND',
-                    'issues': len(issues),
+                    'issues': issue_count,
                     'rows': rows
                 })
             else:
@@ -875,17 +1423,19 @@ def process_folder_bulk(folder_path, output_folder=None, dry_run=False, use_subf
                     'rows': rows
                 })
         
-        except Exception as e:
-            print(f"ERROR processing {csv_file}: {e}")
-            results['failed'] += 1
-            results['files'].append({
-                'name': csv_file,
-                'status': 'ERROR',
-                'issues': 0,
-                'rows': 0,
-                'error': str(e)
-            })
-    
+        if archive_pool is not None:
+            while pending_archives:
+                report_archive(*pending_archives.popleft())
+        completed = True
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=not completed)
+        if archive_pool is not None:
+            archive_pool.shutdown(cancel_futures=not completed)
+
+    if use_cache:
+        _save_validation_cache(cache_path, cache)
+
     # Print summary
     print(f"\n{'=' * 80}")
     print("BULK PROCESSING SUMMARY")
@@ -921,7 +1471,12 @@ def process_folder_bulk(folder_path, output_folder=None, dry_run=False, use_subf
     return results
 
 
-if __name__ == "__main__":
+def main(argv=None):
+    """
+    Command-line entry point; argv defaults to sys.argv[1:].
+
+    Exits via sys.exit() with 0 (clean), 2 (issues found) or 1 (errors).
+    """
     import argparse
     
     parser = argparse.ArgumentParser(
@@ -941,13 +1496,18 @@ if __name__ == "__main__":
     parser.add_argument('--no-subfolders', action='store_true', help='Disable subfolder organization (use flat structure)')
     parser.add_argument('--use-subfolders', action='store_true', help='Enable subfolder organization for single file mode')
     parser.add_argument('--archive', action='store_true', help='Archive original CSV files as timestamped zips')
+    parser.add_argument('--quote', choices=sorted(QUOTING_MODES), default='all', help='Quoting of repaired CSV fields: all (every field quoted, default) or minimal (only fields containing commas, quotes or newlines)')
+    parser.add_argument('--archive-compress', choices=sorted(ARCHIVE_COMPRESSION), default='fast', help='Compression for --archive zips: none (stored, fastest), fast (deflate level 1, default) or default (deflate level 6)')
     parser.add_argument('--no-rewrite-if-clean', action='store_true', help='Skip rewriting CSV files when no issues are detected (useful with --repair)')
     parser.add_argument('--flag-nonutf8', action='store_true', help='Treat detection of non-UTF-8 encoding as an issue (default: show informative message only)')
     parser.add_argument('--normalize-crc32', action='store_true', help='Force normalization of CRC32 values when writing repaired CSVs (uppercase, hex-only, zero-pad/truncate to 8).')
-    parser.add_argument('--normalize-only', action='store_true', help='Only normalize CRC32 values (do not apply other repairs even if --repair is specified).')
+    parser.add_argument('--normalize-only', action='store_true', help='Only normalize CRC32 values (do not apply other repairs even if --repair is specified; duplicate CRC32 detection is skipped).')
     parser.add_argument('--repair', action='store_true', help='Enable repairs (modify fields and write repaired CSV files). By default the script is validation-only.')
+    parser.add_argument('--one-issue-per-group', action='store_true', help='Report each group of duplicate CRC32 values as one issue listing all its lines (default: one issue per duplicate row)')
+    parser.add_argument('--workers', type=int, default=1, metavar='N', help='Bulk mode: number of CSV files to validate in parallel worker processes (default: 1 = sequential)')
+    parser.add_argument('--cache', action='store_true', help=f'Skip CSVs unchanged since they last validated clean (with --dry-run or --no-rewrite-if-clean; cache kept in {VALIDATION_CACHE_NAME} next to the CSVs)')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Bulk mode processing
     if args.bulk:
@@ -968,7 +1528,12 @@ if __name__ == "__main__":
             normalize_crc32=args.normalize_crc32,
             normalize_only=args.normalize_only,
             flag_nonutf8=args.flag_nonutf8,
-            repair=args.repair
+            repair=args.repair,
+            use_cache=args.cache,
+            workers=args.workers,
+            group_duplicates=args.one_issue_per_group,
+            archive_compress=args.archive_compress,
+            quote=args.quote
         )
         
         if results is None:
@@ -995,6 +1560,9 @@ if __name__ == "__main__":
         # In single file mode, subfolders are OFF by default unless --use-subfolders is specified
         use_subfolders = args.use_subfolders
         
+        cache_path = os.path.join(os.path.dirname(args.input_file) or '.', VALIDATION_CACHE_NAME)
+        cache = _load_validation_cache(cache_path) if args.cache else None
+
         # Run validation and repair
         issues, rows, output, archive_path = validate_and_repair_csv(
             args.input_file,
@@ -1007,8 +1575,14 @@ if __name__ == "__main__":
             normalize_crc32=args.normalize_crc32,
             normalize_only=args.normalize_only,
             flag_nonutf8=args.flag_nonutf8,
-            repair=args.repair
+            repair=args.repair,
+            cache=cache,
+            group_duplicates=args.one_issue_per_group,
+            archive_compress=args.archive_compress,
+            quote=args.quote
         )
+        if args.cache:
+            _save_validation_cache(cache_path, cache)
         
         # Exit with appropriate code
         if issues is None:
@@ -1017,3 +1591,7 @@ if __name__ == "__main__":
             sys.exit(2)  # Issues found
         else:
             sys.exit(0)  # Success, no issues
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Expected CRC32 values for file contents reused across the Python tests.
+
+Computed once at import with zlib.crc32 (the same CRC CRC32_Folder_Calc.py
+writes), so tests can check scan output against known values directly.
+"""
+
+import zlib
+
+
+def expected_crc_hex(data):
+    """Return the CRC32 of data formatted like the scan output (8 uppercase hex digits)."""
+    return f"{zlib.crc32(data) & 0xFFFFFFFF:08X}"
+
+
+EXPECTED = {
+    content: expected_crc_hex(content)
+    for content in (
+        b"Test",
+        b"Content",
+        b"Content 1",
+        b"Content 2",
+        b"Unicode content",
+        b"\xFF\xD8\xFF\xE0",
+    )
+}
@@ -0,0 +1,45 @@
+"""
+Filesystem helpers shared by the Python tests.
+"""
+
+import os
+
+
+_WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+
+def write_file(path, data):
+    """Create or replace path with data (bytes) using one os.open/os.write/os.close."""
+    fd = os.open(path, _WRITE_FLAGS, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def bulk_create(root, entries):
+    """
+    Create files under root from (name, bytes) pairs.
+
+    Each file is one os.open/os.write/os.close with already-encoded bytes,
+    skipping pathlib's per-call wrapper and text encoding.
+    """
+    root = os.fspath(root)
+    for name, data in entries:
+        write_file(os.path.join(root, name), data)
+
+
+# Canonical fill buffers keyed by (pattern, count). bytes are immutable, so
+# every test asking for the same synthetic content can share one object.
+_FILL_CACHE = {}
+
+
+def fill(pattern, count):
+    """Return pattern * count, building each distinct buffer only once per session."""
+    key = (pattern, count)
+    data = _FILL_CACHE.get(key)
+    if data is None:
+        data = _FILL_CACHE.setdefault(key, pattern * count)
+    return data
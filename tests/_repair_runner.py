@@ -0,0 +1,72 @@
+"""
+In-process CSV-Validate-Repair.py runner for the test suite.
+
+The CLI tests load the script once and call its main() directly, mapping
+SystemExit to an exit code, instead of starting a new interpreter per run.
+"""
+
+import contextlib
+import importlib.util
+import io
+import sys
+import traceback
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'CSV-Validate-Repair.py'
+SCRIPT_STR = str(SCRIPT)
+# Import name of the loaded script (its file name has hyphens)
+MODULE_NAME = 'csv_validate_repair'
+
+
+_module = None
+
+
+def load_module():
+    """Return CSV-Validate-Repair.py as a module, executing it only on the first call."""
+    global _module
+    if _module is None:
+        spec = importlib.util.spec_from_file_location(MODULE_NAME, SCRIPT_STR)
+        mod = importlib.util.module_from_spec(spec)
+        # Registered so bulk-mode worker processes can unpickle its functions by
+        # name (spawned workers import it through tests/csv_validate_repair.py)
+        sys.modules[MODULE_NAME] = mod
+        spec.loader.exec_module(mod)
+        _module = mod
+    return _module
+
+
+class DiscardWriter(io.TextIOBase):
+    """Text stream that drops everything written to it."""
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        return len(s)
+
+
+def run_main(mod, args, capture=True):
+    """
+    Run mod.main(args) and return (returncode, stdout, stderr).
+
+    With capture=False the script's output is discarded instead of collected,
+    and stdout/stderr come back as None.
+    """
+    if capture:
+        stdout, stderr = io.StringIO(), io.StringIO()
+    else:
+        stdout = stderr = DiscardWriter()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            mod.main(args)
+            returncode = 0
+        except SystemExit as e:
+            returncode = e.code if isinstance(e.code, int) else int(e.code is not None)
+        except Exception:
+            # An uncaught exception would make `python script.py` exit with 1
+            traceback.print_exc()
+            returncode = 1
+    if not capture:
+        return returncode, None, None
+    return returncode, stdout.getvalue(), stderr.getvalue()
+
@@ -0,0 +1,81 @@
+"""
+Shared pytest configuration for the Python tests.
+"""
+
+import itertools
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from _repair_runner import SCRIPT_STR, load_module, run_main
+
+# RAM-backed folder for pytest's temp directories, where the OS has one
+TMPFS_ROOT = "/dev/shm"
+
+
+def pytest_configure(config):
+    """
+    Put tmp_path/tmp_path_factory directories on tmpfs when it is available.
+
+    The tests write and re-read many small files; on tmpfs that costs no disk
+    writes. Only the temp root moves: pytest still creates its numbered
+    pytest-of-<user>/pytest-N folders below /dev/shm and keeps its usual
+    retention, so concurrent runs do not clear each other's folders. An
+    explicit --basetemp or PYTEST_DEBUG_TEMPROOT wins, and without a writable
+    /dev/shm (e.g. Windows, macOS) the system temp folder is kept.
+    """
+    if config.option.basetemp or os.environ.get("PYTEST_DEBUG_TEMPROOT"):
+        return
+    if not os.path.isdir(TMPFS_ROOT) or not os.access(TMPFS_ROOT, os.W_OK | os.X_OK):
+        return
+    # Read lazily by pytest's tmp_path factory, the first time a temp dir is needed
+    os.environ["PYTEST_DEBUG_TEMPROOT"] = TMPFS_ROOT
+    config.add_cleanup(lambda: os.environ.pop("PYTEST_DEBUG_TEMPROOT", None))
+
+
+@pytest.fixture(scope="session")
+def csv_validate_module():
+    """CSV-Validate-Repair.py loaded once per session, for tests that call its functions."""
+    return load_module()
+
+
+@pytest.fixture(scope="session")
+def run_repair(csv_validate_module):
+    """
+    Run CSV-Validate-Repair.py commands in-process through its main().
+
+    Returns call(csv_path, extra_args=None, capture=False), which gives back a
+    subprocess.CompletedProcess like running the script would. stdout/stderr
+    are only collected with capture=True; otherwise they are None.
+    """
+    def call(csv_path, extra_args=None, capture=False):
+        args = [os.fspath(csv_path)] + list(extra_args or [])
+        returncode, stdout, stderr = run_main(csv_validate_module, args, capture)
+        return subprocess.CompletedProcess([sys.executable, SCRIPT_STR] + args, returncode, stdout, stderr)
+
+    return call
+
+
+@pytest.fixture(scope="session")
+def _shared_tmp_root(tmp_path_factory):
+    return tmp_path_factory.mktemp("shared", numbered=False), itertools.count()
+
+
+@pytest.fixture
+def shared_tmp(_shared_tmp_root, request):
+    """
+    A fresh, empty directory for this test inside one session-wide folder.
+
+    Costs a single mkdir, where tmp_path also has to number a new folder and
+    update pytest's bookkeeping. Meant for tests that only write and read a
+    few small files. The folder is removed with the rest of the session's
+    temp root, under pytest's usual retention.
+    """
+    root, counter = _shared_tmp_root
+    name = re.sub(r"\W", "_", request.node.name)[:30]
+    path = root / f"{next(counter):04d}_{name}"
+    path.mkdir()
+    return path
@@ -0,0 +1,13 @@
+"""
+Importable name for CSV-Validate-Repair.py, whose file name has hyphens.
+
+Bulk-mode worker processes started with the spawn method (the default on
+Windows and macOS) unpickle their jobs by module name and import this; it
+resolves to the same module _repair_runner.load_module() registers.
+"""
+
+import sys
+
+from _repair_runner import load_module
+
+sys.modules[__name__] = load_module()
@@ -1,5 +1,5 @@
 """
-Unit tests for CRC32_Folder_Calc.py
+Unit tests for crc32_folder_calc.py
 
 Tests cover:
 - CRC32 computation accuracy
@@ -16,13 +16,25 @@ import pytest
 import sys
 import os
 import csv
+import io
+import json
+import re
+import zlib
 import tempfile
+import threading
 import shutil
+from dataclasses import dataclass
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-from CRC32_Folder_Calc import compute_crc32, scan_directory
+from _crc_fixtures import EXPECTED as EXPECTED_CRC, expected_crc_hex
+from _fs_helpers import bulk_create, fill
+import CRC32_Folder_Calc as crc32_folder_calc
+from CRC32_Folder_Calc import compute_crc32, compute_crc32_with_size, scan_directory, crc32_combine, CRC32_BACKEND, CRC32_BACKENDS
+
+# CRC32 column format: exactly 8 uppercase hex digits
+_HEX8_RE = re.compile(r'[0-9A-F]{8}')
 
 
 def test_compute_crc32_known_value(tmp_path):
@@ -52,21 +64,65 @@ def test_compute_crc32_binary_file(tmp_path):
     
     crc = compute_crc32(str(test_file))
     # Verify it's 8 uppercase hex characters
-    assert len(crc) == 8, f"CRC should be 8 characters, got {len(crc)}"
-    assert crc.isupper(), "CRC should be uppercase"
-    assert all(c in '0123456789ABCDEF' for c in crc), "CRC should be hex"
-
-
-def test_compute_crc32_large_file(tmp_path):
-    """Test CRC32 computation on file larger than buffer size."""
-    test_file = tmp_path / "large.bin"
-    # Write 2MB of data (larger than 8KB buffer)
-    data = b'A' * (2 * 1024 * 1024)
+    assert _HEX8_RE.fullmatch(crc) is not None, f"Bad CRC: {crc!r}"
+
+
+@pytest.mark.parametrize("size", [8191, 8192, 8193, 16384, 65536])
+def test_compute_crc32_buffer_boundaries(tmp_path, monkeypatch, size):
+    """Test CRC32 across the small-read, mmap and sliced-mmap size boundaries."""
+    # Shrink the module's 1 MB / 16 MB thresholds so kilobyte files cross them
+    monkeypatch.setattr(crc32_folder_calc, 'SMALL_FILE_SIZE', 8192)
+    monkeypatch.setattr(crc32_folder_calc, 'READ_CHUNK_SIZE', 8192)
+    monkeypatch.setattr(crc32_folder_calc, 'MMAP_SLICE_SIZE', 8192)
+    test_file = tmp_path / "boundary.bin"
+    data = fill(b'A', size)
     test_file.write_bytes(data)
     
     crc = compute_crc32(str(test_file))
-    assert len(crc) == 8, "CRC should be 8 characters"
-    assert crc.isupper(), "CRC should be uppercase"
+    assert crc == expected_crc_hex(data), f"Wrong CRC for {size} bytes"
+
+
+def test_large_file_segmenting_only_when_hashing_serially(tmp_path, monkeypatch):
+    """Test large files use the shared segment pool only for serial hashing on multi-CPU machines."""
+    monkeypatch.setattr(crc32_folder_calc, 'SMALL_FILE_SIZE', 8192)
+    monkeypatch.setattr(crc32_folder_calc, 'MMAP_SLICE_SIZE', 8192)
+    data = fill(b'A', 65536) + b'tail'
+    for name in ("a.bin", "b.bin"):
+        (tmp_path / name).write_bytes(data)
+    path = str(tmp_path / "a.bin")
+
+    # Segmented and slice-by-slice hashing agree
+    expected = (expected_crc_hex(data), len(data))
+    pool = crc32_folder_calc._segment_pool()
+    if pool is not None:
+        assert compute_crc32_with_size(path, segment_pool=pool) == expected
+    assert compute_crc32_with_size(path) == expected
+
+    segmented = []
+    real_segments = crc32_folder_calc._crc32_segments
+    def record_segments(*args):
+        segmented.append(args[1])
+        return real_segments(*args)
+    monkeypatch.setattr(crc32_folder_calc, '_crc32_segments', record_segments)
+    monkeypatch.setattr(crc32_folder_calc.os, 'cpu_count', lambda: 4)
+
+    # Parallel file hashing must not nest segment threads inside the scan's pool
+    scan_directory(str(tmp_path), str(tmp_path / "parallel.csv"), workers=2, quiet=True)
+    assert segmented == []
+    scan_directory(str(tmp_path), str(tmp_path / "serial.csv"), workers=1, quiet=True)
+    assert segmented == [len(data), len(data)]
+
+    # compute_crc32 may be called from several threads, so it only segments when asked to
+    assert compute_crc32(path) == expected[0]
+    assert segmented == [len(data), len(data)]
+    assert compute_crc32(path, segment_pool=crc32_folder_calc._segment_pool()) == expected[0]
+    assert segmented == [len(data)] * 3
+
+    # A single CPU gains nothing from segment threads
+    monkeypatch.setattr(crc32_folder_calc.os, 'cpu_count', lambda: 1)
+    assert crc32_folder_calc._segment_pool() is None
+    scan_directory(str(tmp_path), str(tmp_path / "single.csv"), workers=1, quiet=True)
+    assert segmented == [len(data)] * 3
 
 
 def test_compute_crc32_nonexistent_file(tmp_path):
@@ -87,39 +143,137 @@ def test_compute_crc32_unicode_filename(tmp_path):
     assert crc.isupper(), "CRC should be uppercase"
 
 
-def test_scan_directory_basic(tmp_path):
-    """Test basic directory scanning produces correct CSV."""
-    # Create test structure
-    test_dir = tmp_path / "source"
+def read_rows(path):
+    """Return (header, rows) of a scan CSV as plain lists, for positional checks."""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        return header, list(reader)
+
+
+# One tree shared by the tests that only inspect rows of a plain scan: it is
+# built and scanned once per module instead of once per test.
+SHARED_TREE_FILES = {
+    "file1.txt": "Content 1".encode('utf-8'),
+    "file2.txt": "Content 2".encode('utf-8'),
+    "small.txt": fill(b'X', 10),
+    "medium.txt": fill(b'X', 1000),
+    "large.txt": fill(b'X', 100000),
+    "test.jpg": fill(b'\xFF\xD8\xFF\xE0', 100),  # Fake JPEG
+    "text.txt": "Text".encode('utf-8'),
+    "image.jpg": b'\xFF\xD8\xFF\xE0',
+    "data.bin": b'\x00\x01\x02\x03',
+    "script.ps1": "Write-Host 'Test'".encode('utf-8'),
+    "tëst_äöü.txt": "Unicode content".encode('utf-8'),
+    "日本語.txt": "Unicode content".encode('utf-8'),
+    "файл.txt": "Unicode content".encode('utf-8'),
+    "émilie_café.txt": "Unicode content".encode('utf-8'),
+}
+
+
+@dataclass
+class ScannedTree:
+    output_csv: Path
+    fieldnames: list
+    rows: dict  # FileName -> row dict
+
+
+@pytest.fixture(scope="module")
+def scanned_tree(tmp_path_factory):
+    """Scan SHARED_TREE_FILES (in a folder named 'source') once and parse the CSV."""
+    base = tmp_path_factory.mktemp("shared")
+    test_dir = base / "source"
     test_dir.mkdir()
-    (test_dir / "file1.txt").write_text("Content 1", encoding='utf-8')
-    (test_dir / "file2.txt").write_text("Content 2", encoding='utf-8')
-    
-    output_csv = tmp_path / "output.csv"
-    scan_directory(str(test_dir), str(output_csv))
-    
-    # Verify CSV exists
-    assert output_csv.exists(), "Output CSV should be created"
-    
-    # Parse and validate CSV
+    bulk_create(test_dir, SHARED_TREE_FILES.items())
+
+    output_csv = base / "output.csv"
+    scan_directory(str(test_dir), str(output_csv), quiet=True)
+
     with open(output_csv, 'r', encoding='utf-8', newline='') as f:
         reader = csv.DictReader(f)
         rows = list(reader)
+    assert len(rows) == len(SHARED_TREE_FILES), f"Expected {len(SHARED_TREE_FILES)} rows, got {len(rows)}"
+    return ScannedTree(output_csv, reader.fieldnames, {row['FileName']: row for row in rows})
+
+
+def test_scan_directory_basic(scanned_tree):
+    """Test basic directory scanning produces correct CSV."""
+    # Verify CSV exists
+    assert scanned_tree.output_csv.exists(), "Output CSV should be created"
     
     # Check header
-    assert reader.fieldnames == ['FileName', 'Size', 'CRC32', 'Path'], \
-        f"Expected standard headers, got {reader.fieldnames}"
+    assert scanned_tree.fieldnames == ['FileName', 'Size', 'CRC32', 'Path'], \
+        f"Expected standard headers, got {scanned_tree.fieldnames}"
     
-    # Check row count
-    assert len(rows) == 2, f"Expected 2 rows, got {len(rows)}"
+    # Check every file is listed exactly once
+    assert set(scanned_tree.rows) == set(SHARED_TREE_FILES)
     
     # Validate each row
-    for row in rows:
-        assert row['FileName'] in ['file1.txt', 'file2.txt']
+    for row in scanned_tree.rows.values():
         assert row['Size'].isdigit(), f"Size should be numeric, got {row['Size']}"
         assert len(row['CRC32']) == 8, f"CRC32 should be 8 chars, got {row['CRC32']}"
         assert row['CRC32'].isupper(), "CRC32 should be uppercase"
         assert row['Path'] == 'source', f"Path should be 'source', got {row['Path']}"
+    assert scanned_tree.rows["file1.txt"]['CRC32'] == EXPECTED_CRC[b"Content 1"]
+    assert scanned_tree.rows["file2.txt"]['CRC32'] == EXPECTED_CRC[b"Content 2"]
+
+
+def test_scan_directory_unicode_filenames(scanned_tree):
+    """Test scanning files with unicode characters."""
+    files = [
+        "tëst_äöü.txt",
+        "日本語.txt",
+        "файл.txt",
+        "émilie_café.txt"
+    ]
+    
+    # Verify all filenames preserved correctly
+    missing = [name for name in files if name not in scanned_tree.rows]
+    assert not missing, f"Unicode filenames not preserved correctly: {missing}"
+    for name in files:
+        assert scanned_tree.rows[name]['CRC32'] == EXPECTED_CRC[b"Unicode content"]
+
+
+def test_scan_directory_size_accuracy(scanned_tree):
+    """Test file size is accurately reported."""
+    sizes = {
+        "small.txt": 10,
+        "medium.txt": 1000,
+        "large.txt": 100000
+    }
+    
+    # Verify sizes match
+    for filename, expected_size in sizes.items():
+        actual_size = int(scanned_tree.rows[filename]['Size'])
+        assert actual_size == expected_size, \
+            f"{filename}: expected {expected_size}, got {actual_size}"
+
+
+def test_scan_directory_csv_compatibility(scanned_tree):
+    """Test CSV output is compatible with CRC-FileOrganizer expectations."""
+    row = scanned_tree.rows["test.jpg"]
+    fieldnames = scanned_tree.fieldnames
+    
+    # Validate format matches CRC-FileOrganizer expectations
+    assert 'FileName' in fieldnames, "Must have FileName column"
+    assert 'Size' in fieldnames, "Must have Size column"
+    assert 'CRC32' in fieldnames, "Must have CRC32 column"
+    assert 'Path' in fieldnames, "Must have Path column"
+    
+    # CRC32 format: 8 uppercase hex
+    assert _HEX8_RE.fullmatch(row['CRC32']) is not None, f"Bad CRC32: {row['CRC32']!r}"
+    
+    # Size format: numeric string
+    assert row['Size'].isdigit(), "Size must be numeric"
+
+
+def test_scan_directory_mixed_file_types(scanned_tree):
+    """Test scanning directory with various file types."""
+    # All file types should be included, each with a valid CRC
+    for filename in ["text.txt", "image.jpg", "data.bin", "script.ps1"]:
+        assert filename in scanned_tree.rows, f"{filename} missing from scan"
+        assert len(scanned_tree.rows[filename]['CRC32']) == 8, f"Invalid CRC for {filename}"
+    assert scanned_tree.rows["image.jpg"]['CRC32'] == EXPECTED_CRC[b'\xFF\xD8\xFF\xE0']
 
 
 def test_scan_directory_recursive(tmp_path):
@@ -176,6 +330,7 @@ def test_scan_directory_extra_columns(tmp_path):
     
     # Check extra columns are empty
     row = rows[0]
+    assert row['CRC32'] == EXPECTED_CRC[b"Test"]
     assert row['Comment'] == '', "Extra column 'Comment' should be empty"
     assert row['Tags'] == '', "Extra column 'Tags' should be empty"
 
@@ -190,17 +345,13 @@ def test_scan_directory_multiple_extra_columns(tmp_path):
     extra = ['Col1', 'Col2', 'Col3', 'Col4']
     scan_directory(str(test_dir), str(output_csv), extra_columns=extra)
     
-    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    header, rows = read_rows(output_csv)
     
     expected = ['FileName', 'Size', 'CRC32', 'Path'] + extra
-    assert reader.fieldnames == expected
+    assert header == expected
     
     # All extra columns should be empty
-    row = rows[0]
-    for col in extra:
-        assert row[col] == '', f"Extra column '{col}' should be empty"
+    assert rows[0][4:] == [''] * len(extra), "Extra columns should be empty"
 
 
 def test_scan_directory_parent_folder_extraction(tmp_path):
@@ -213,44 +364,10 @@ def test_scan_directory_parent_folder_extraction(tmp_path):
     output_csv = tmp_path / "paths.csv"
     scan_directory(str(root), str(output_csv))
     
-    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    header, rows = read_rows(output_csv)
     
     # Path should be the immediate parent folder name
-    assert rows[0]['Path'] == 'level3', f"Expected 'level3', got {rows[0]['Path']}"
-
-
-def test_scan_directory_unicode_filenames(tmp_path):
-    """Test scanning files with unicode characters."""
-    test_dir = tmp_path / "unicode"
-    test_dir.mkdir()
-    
-    # Create files with various unicode characters
-    files = [
-        "tëst_äöü.txt",
-        "日本語.txt",
-        "файл.txt",
-        "émilie_café.txt"
-    ]
-    
-    for filename in files:
-        (test_dir / filename).write_text("Unicode content", encoding='utf-8')
-    
-    output_csv = tmp_path / "unicode.csv"
-    scan_directory(str(test_dir), str(output_csv))
-    
-    # Parse CSV with UTF-8 encoding
-    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-    
-    assert len(rows) == len(files), f"Expected {len(files)} files, got {len(rows)}"
-    
-    # Verify all filenames preserved correctly
-    found_names = {row['FileName'] for row in rows}
-    expected_names = set(files)
-    assert found_names == expected_names, f"Unicode filenames not preserved correctly"
+    assert rows[0][3] == 'level3', f"Expected 'level3', got {rows[0][3]}"
 
 
 def test_scan_directory_special_chars_in_filenames(tmp_path):
@@ -265,96 +382,35 @@ def test_scan_directory_special_chars_in_filenames(tmp_path):
         "comma,separated.txt"
     ]
     
-    for filename in files:
-        (test_dir / filename).write_text("Content", encoding='utf-8')
+    bulk_create(test_dir, ((filename, b"Content") for filename in files))
     
     output_csv = tmp_path / "special.csv"
     scan_directory(str(test_dir), str(output_csv))
     
-    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    header, rows = read_rows(output_csv)
     
-    found_names = {row['FileName'] for row in rows}
+    found_names = {row[0] for row in rows}
     expected_names = set(files)
     assert found_names == expected_names, "Special characters not preserved"
+    assert {row[2] for row in rows} == {EXPECTED_CRC[b"Content"]}
 
 
-def test_scan_directory_empty_directory(tmp_path):
-    """Test scanning empty directory produces header-only CSV."""
-    test_dir = tmp_path / "empty"
-    test_dir.mkdir()
-    
-    output_csv = tmp_path / "empty.csv"
-    scan_directory(str(test_dir), str(output_csv))
-    
-    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-    
-    # Should have header but no data rows
-    assert reader.fieldnames == ['FileName', 'Size', 'CRC32', 'Path']
-    assert len(rows) == 0, "Empty directory should produce no data rows"
-
-
-def test_scan_directory_size_accuracy(tmp_path):
-    """Test file size is accurately reported."""
-    test_dir = tmp_path / "sizes"
-    test_dir.mkdir()
-    
-    # Create files of known sizes
-    sizes = {
-        "small.txt": 10,
-        "medium.txt": 1000,
-        "large.txt": 100000
-    }
-    
-    for filename, size in sizes.items():
-        (test_dir / filename).write_bytes(b'X' * size)
-    
-    output_csv = tmp_path / "sizes.csv"
-    scan_directory(str(test_dir), str(output_csv))
-    
-    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-    
-    # Verify sizes match
-    for row in rows:
-        expected_size = sizes[row['FileName']]
-        actual_size = int(row['Size'])
-        assert actual_size == expected_size, \
-            f"{row['FileName']}: expected {expected_size}, got {actual_size}"
+@pytest.fixture(scope="session")
+def empty_scan_output(tmp_path_factory):
+    """(header, rows) of one scan of an empty folder, shared by structural tests."""
+    test_dir = tmp_path_factory.mktemp("empty")
+    output_csv = tmp_path_factory.mktemp("empty_out") / "empty.csv"
+    scan_directory(str(test_dir), str(output_csv), quiet=True)
+    return read_rows(output_csv)
 
 
-def test_scan_directory_csv_compatibility(tmp_path):
-    """Test CSV output is compatible with CRC-FileOrganizer expectations."""
-    test_dir = tmp_path / "compat"
-    test_dir.mkdir()
-    (test_dir / "test.jpg").write_bytes(b'\xFF\xD8\xFF\xE0' * 100)  # Fake JPEG
-    
-    output_csv = tmp_path / "compat.csv"
-    scan_directory(str(test_dir), str(output_csv))
-    
-    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-    
-    row = rows[0]
-    
-    # Validate format matches CRC-FileOrganizer expectations
-    assert 'FileName' in reader.fieldnames, "Must have FileName column"
-    assert 'Size' in reader.fieldnames, "Must have Size column"
-    assert 'CRC32' in reader.fieldnames, "Must have CRC32 column"
-    assert 'Path' in reader.fieldnames, "Must have Path column"
-    
-    # CRC32 format: 8 uppercase hex
-    assert len(row['CRC32']) == 8, "CRC32 must be 8 characters"
-    assert row['CRC32'].isupper(), "CRC32 must be uppercase"
-    assert all(c in '0123456789ABCDEF' for c in row['CRC32']), "CRC32 must be hex"
+def test_scan_directory_empty_directory(empty_scan_output):
+    """Test scanning empty directory produces header-only CSV."""
+    header, rows = empty_scan_output
     
-    # Size format: numeric string
-    assert row['Size'].isdigit(), "Size must be numeric"
+    # Should have header but no data rows
+    assert header == ['FileName', 'Size', 'CRC32', 'Path']
+    assert rows == [], "Empty directory should produce no data rows"
 
 
 def test_scan_directory_path_normalization(tmp_path):
@@ -367,39 +423,11 @@ def test_scan_directory_path_normalization(tmp_path):
     # Test with trailing slash
     scan_directory(str(test_dir) + os.sep, str(output_csv))
     
-    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    header, rows = read_rows(output_csv)
     
     # Should still extract folder name correctly
-    assert rows[0]['Path'] == 'normalize', \
-        f"Path normalization failed: got {rows[0]['Path']}"
-
-
-def test_scan_directory_mixed_file_types(tmp_path):
-    """Test scanning directory with various file types."""
-    test_dir = tmp_path / "mixed"
-    test_dir.mkdir()
-    
-    # Create different file types
-    (test_dir / "text.txt").write_text("Text", encoding='utf-8')
-    (test_dir / "image.jpg").write_bytes(b'\xFF\xD8\xFF\xE0')
-    (test_dir / "data.bin").write_bytes(b'\x00\x01\x02\x03')
-    (test_dir / "script.ps1").write_text("Write-Host 'Test'", encoding='utf-8')
-    
-    output_csv = tmp_path / "mixed.csv"
-    scan_directory(str(test_dir), str(output_csv))
-    
-    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-    
-    # All file types should be included
-    assert len(rows) == 4, f"Expected 4 files, got {len(rows)}"
-    
-    # Verify each has valid CRC
-    for row in rows:
-        assert len(row['CRC32']) == 8, f"Invalid CRC for {row['FileName']}"
+    assert rows[0][3] == 'normalize', \
+        f"Path normalization failed: got {rows[0][3]}"
 
 
 def test_compute_crc32_identical_content(tmp_path):
@@ -416,6 +444,7 @@ def test_compute_crc32_identical_content(tmp_path):
     crc2 = compute_crc32(str(file2))
     
     assert crc1 == crc2, "Identical content should produce identical CRCs"
+    assert crc1 == expected_crc_hex(content.encode('utf-8'))
 
 
 def test_compute_crc32_different_content(tmp_path):
@@ -430,6 +459,386 @@ def test_compute_crc32_different_content(tmp_path):
     crc2 = compute_crc32(str(file2))
     
     assert crc1 != crc2, "Different content should produce different CRCs"
+    assert crc1 == expected_crc_hex(b"Content A")
+    assert crc2 == expected_crc_hex(b"Content B")
+
+
+@pytest.mark.parametrize("use_processes", [False, True], ids=["threads", "processes"])
+def test_scan_directory_parallel_matches_serial(tmp_path, use_processes):
+    """Test pooled hashing produces the same rows, in the same order, as serial hashing."""
+    test_dir = tmp_path / "parallel"
+    test_dir.mkdir()
+    bulk_create(test_dir, ((f"file{i:02d}.bin", bytes([i]) * (i * 97 + 1)) for i in range(40)))
+
+    serial_csv = tmp_path / "serial.csv"
+    parallel_csv = tmp_path / "parallel.csv"
+    scan_directory(str(test_dir), str(serial_csv), workers=1)
+    scan_directory(str(test_dir), str(parallel_csv), workers=4, use_processes=use_processes)
+
+    with open(serial_csv, 'r', encoding='utf-8', newline='') as f:
+        serial_rows = list(csv.reader(f))
+    with open(parallel_csv, 'r', encoding='utf-8', newline='') as f:
+        parallel_rows = list(csv.reader(f))
+
+    assert len(serial_rows) == 41, f"Expected header + 40 rows, got {len(serial_rows)}"
+    assert parallel_rows == serial_rows, "Parallel scan should match serial scan exactly"
+
+
+def test_scan_directory_quiet_suppresses_progress(tmp_path, capsys):
+    """Test quiet=True suppresses the per-file progress output."""
+    test_dir = tmp_path / "quiet"
+    test_dir.mkdir()
+    (test_dir / "file.txt").write_text("Test", encoding='utf-8')
+
+    scan_directory(str(test_dir), str(tmp_path / "loud.csv"))
+    assert "file.txt" in capsys.readouterr().out
+
+    scan_directory(str(test_dir), str(tmp_path / "quiet.csv"), quiet=True)
+    assert capsys.readouterr().out == ""
+
+
+def test_compute_crc32_backend_matches_zlib(tmp_path):
+    """Test the selected CRC32 backend agrees with zlib.crc32."""
+    assert CRC32_BACKEND in CRC32_BACKENDS
+    data = bytes(range(256)) * 1000
+    test_file = tmp_path / "backend.bin"
+    test_file.write_bytes(data)
+
+    expected = format(zlib.crc32(data) & 0xFFFFFFFF, '08X')
+    assert compute_crc32(str(test_file)) == expected
+
+
+@pytest.mark.parametrize("small_file_size", [1 << 20, 0], ids=["small", "mmap"])
+@pytest.mark.parametrize("backend", sorted(CRC32_BACKENDS))
+def test_every_crc32_backend_matches_zlib(tmp_path, monkeypatch, backend, small_file_size):
+    """Test each installed CRC32 backend agrees with zlib.crc32 on the read and mmap paths."""
+    data = bytes(range(256)) * 1000
+    test_file = tmp_path / "backend.bin"
+    test_file.write_bytes(data)
+
+    monkeypatch.setattr(crc32_folder_calc, '_crc32', CRC32_BACKENDS[backend])
+    monkeypatch.setattr(crc32_folder_calc, 'SMALL_FILE_SIZE', small_file_size)
+    expected = format(zlib.crc32(data) & 0xFFFFFFFF, '08X')
+    assert compute_crc32_with_size(str(test_file)) == (expected, len(data))
+
+
+def test_compute_crc32_mmap_failure_falls_back_to_streaming(tmp_path, monkeypatch):
+    """Test compute_crc32 still returns the right CRC when mmap is unavailable."""
+    test_file = tmp_path / "fallback.txt"
+    test_file.write_text("Hello World!", encoding='utf-8')
+
+    def _no_mmap(*args, **kwargs):
+        raise OSError("mmap not supported")
+
+    monkeypatch.setattr(crc32_folder_calc, 'SMALL_FILE_SIZE', 0)
+    monkeypatch.setattr(crc32_folder_calc.mmap, 'mmap', _no_mmap)
+    assert compute_crc32(str(test_file)) == "1C291CA3"
+
+
+def test_compute_crc32_multiple_mmap_slices(tmp_path, monkeypatch):
+    """Test CRC32 is carried correctly across mmap slice boundaries."""
+    data = bytes(range(256)) * 40 + b'tail'
+    test_file = tmp_path / "slices.bin"
+    test_file.write_bytes(data)
+
+    monkeypatch.setattr(crc32_folder_calc, 'SMALL_FILE_SIZE', 0)
+    monkeypatch.setattr(crc32_folder_calc, 'MMAP_SLICE_SIZE', 1000)
+    assert compute_crc32(str(test_file)) == format(zlib.crc32(data) & 0xFFFFFFFF, '08X')
+
+
+def test_compute_crc32_small_and_mapped_paths_agree(tmp_path, monkeypatch):
+    """Test the single-read small-file path and the mmap path give the same CRC."""
+    data = fill(b'0123456789', 5000)
+    test_file = tmp_path / "paths.bin"
+    test_file.write_bytes(data)
+
+    small_path_crc = compute_crc32(str(test_file))
+    monkeypatch.setattr(crc32_folder_calc, 'SMALL_FILE_SIZE', 0)
+    mapped_path_crc = compute_crc32(str(test_file))
+
+    assert small_path_crc == mapped_path_crc == format(zlib.crc32(data) & 0xFFFFFFFF, '08X')
+
+
+def test_scan_directory_matches_os_walk_order(tmp_path):
+    """Test the scandir-based walk visits the same files, in the same order, as os.walk."""
+    test_dir = tmp_path / "walk"
+    (test_dir / "b" / "deep").mkdir(parents=True)
+    (test_dir / "a").mkdir()
+    (test_dir / "root.txt").write_text("root", encoding='utf-8')
+    (test_dir / "a" / "a1.txt").write_text("a1", encoding='utf-8')
+    (test_dir / "b" / "b1.txt").write_text("b1", encoding='utf-8')
+    (test_dir / "b" / "deep" / "d1.txt").write_text("d1", encoding='utf-8')
+
+    output_csv = tmp_path / "walk.csv"
+    scan_directory(str(test_dir), str(output_csv), workers=1)
+
+    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
+        scanned = [row['FileName'] for row in csv.DictReader(f)]
+    walked = [name for _, _, names in os.walk(str(test_dir)) for name in names]
+    assert scanned == walked
+
+
+def test_compute_crc32_streaming_spans_multiple_reads(tmp_path, monkeypatch):
+    """Test the streaming fallback carries the CRC across several buffer refills."""
+    data = bytes(range(251)) * (crc32_folder_calc.READ_CHUNK_SIZE // 100)
+    test_file = tmp_path / "stream.bin"
+    test_file.write_bytes(data)
+
+    def _no_mmap(*args, **kwargs):
+        raise OSError("mmap not supported")
+
+    monkeypatch.setattr(crc32_folder_calc, 'SMALL_FILE_SIZE', 0)
+    monkeypatch.setattr(crc32_folder_calc.mmap, 'mmap', _no_mmap)
+    assert compute_crc32(str(test_file)) == format(zlib.crc32(data) & 0xFFFFFFFF, '08X')
+
+
+def test_crc32_combine_matches_concatenation():
+    """Test crc32_combine reproduces the CRC32 of concatenated data."""
+    part_a = b'The quick brown fox '
+    part_b = b'jumps over the lazy dog' * 37
+
+    combined = crc32_combine(zlib.crc32(part_a), zlib.crc32(part_b), len(part_b))
+    assert combined == zlib.crc32(part_a + part_b)
+    assert crc32_combine(zlib.crc32(part_a), 0, 0) == zlib.crc32(part_a)
+    assert crc32_combine(0, zlib.crc32(part_b), len(part_b)) == zlib.crc32(part_b)
+
+
+def test_scan_directory_cache_skips_unchanged_files(tmp_path, monkeypatch):
+    """Test use_cache only rehashes files whose size or mtime changed."""
+    test_dir = tmp_path / "cached"
+    test_dir.mkdir()
+    (test_dir / "same.txt").write_text("unchanged", encoding='utf-8')
+    (test_dir / "changed.txt").write_text("before", encoding='utf-8')
+
+    output_csv = tmp_path / "cached.csv"
+    scan_directory(str(test_dir), str(output_csv), workers=1, use_cache=True)
+    assert (tmp_path / "cached.csv.crccache.json").exists(), "Cache file should be written"
+
+    (test_dir / "changed.txt").write_text("after the edit", encoding='utf-8')
+    hashed = []
+    real_compute = crc32_folder_calc.compute_crc32_with_size
+
+    def _recording_compute(path, poly='crc32', **kwargs):
+        hashed.append(os.path.basename(path))
+        return real_compute(path, poly, **kwargs)
+
+    monkeypatch.setattr(crc32_folder_calc, 'compute_crc32_with_size', _recording_compute)
+    scan_directory(str(test_dir), str(output_csv), workers=1, use_cache=True)
+    monkeypatch.undo()
+
+    assert hashed == ['changed.txt'], f"Only the modified file should be rehashed, got {hashed}"
+    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
+        crcs = {row['FileName']: row['CRC32'] for row in csv.DictReader(f)}
+    assert crcs['same.txt'] == compute_crc32(str(test_dir / "same.txt"))
+    assert crcs['changed.txt'] == compute_crc32(str(test_dir / "changed.txt"))
+
+
+
+def test_scan_directory_cache_ignores_malformed_entries(tmp_path):
+    """Test malformed CRC cache entries are rehashed instead of aborting the scan."""
+    test_dir = tmp_path / "malformed"
+    test_dir.mkdir()
+    names = ["dict.txt", "short.txt", "string.txt", "number.txt"]
+    bulk_create(test_dir, ((name, name.encode('utf-8')) for name in names))
+
+    output_csv = tmp_path / "malformed.csv"
+    bad_entries = [{"size": 8}, [8], "ABCDEF12", None]
+    cache = {os.path.abspath(test_dir / name): entry for name, entry in zip(names, bad_entries)}
+    # Right size and mtime, but the CRC is not a string
+    st = os.stat(test_dir / "number.txt")
+    cache[os.path.abspath(test_dir / "number.txt")] = [st.st_size, st.st_mtime_ns, 12345678]
+    with open(f"{output_csv}.crccache.json", 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+
+    scan_directory(str(test_dir), str(output_csv), workers=1, use_cache=True, quiet=True)
+    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
+        crcs = {row['FileName']: row['CRC32'] for row in csv.DictReader(f)}
+    assert crcs == {name: expected_crc_hex(name.encode('utf-8')) for name in names}
+
+def test_scan_directory_batched_writes_keep_every_row(tmp_path, monkeypatch, capsys):
+    """Test rows split across several writerows() batches are all written in order."""
+    test_dir = tmp_path / "batched"
+    test_dir.mkdir()
+    names = [f"file{i}.txt" for i in range(7)]
+    bulk_create(test_dir, ((name, name.encode('utf-8')) for name in names))
+
+    monkeypatch.setattr(crc32_folder_calc, 'ROW_BATCH_SIZE', 2)
+    output_csv = tmp_path / "batched.csv"
+    scan_directory(str(test_dir), str(output_csv), workers=1)
+
+    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
+        written = [row['FileName'] for row in csv.DictReader(f)]
+    walked = [name for _, _, files in os.walk(str(test_dir)) for name in files]
+    assert written == walked
+    assert capsys.readouterr().out.count(' bytes) in ') == len(names)
+
+
+def _crc32c_reference(data, value=0):
+    """Bitwise CRC32C (Castagnoli) with the same running-value API as the crc32c package."""
+    crc = value ^ 0xFFFFFFFF
+    for byte in bytes(data):
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ (0x82F63B78 if crc & 1 else 0)
+    return crc ^ 0xFFFFFFFF
+
+
+def test_crc32c_poly_uses_castagnoli(tmp_path, monkeypatch):
+    """Test poly='crc32c' hashes with CRC32C and labels the column CRC32C."""
+    monkeypatch.setattr(crc32_folder_calc, '_crc32c', _crc32c_reference)
+    test_dir = tmp_path / "castagnoli"
+    test_dir.mkdir()
+    (test_dir / "check.txt").write_bytes(b'123456789')
+
+    # Standard CRC32C check value for "123456789"
+    assert compute_crc32(str(test_dir / "check.txt"), poly='crc32c') == "E3069283"
+
+    output_csv = tmp_path / "crc32c.csv"
+    scan_directory(str(test_dir), str(output_csv), workers=1, poly='crc32c')
+    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        rows = list(reader)
+    assert reader.fieldnames == ['FileName', 'Size', 'CRC32C', 'Path']
+    assert rows[0]['CRC32C'] == "E3069283"
+
+    part_a, part_b = b'1234', b'56789'
+    assert crc32_combine(_crc32c_reference(part_a), _crc32c_reference(part_b), len(part_b), poly='crc32c') == 0xE3069283
+
+
+def test_crc32c_poly_without_package_fails_early(tmp_path, monkeypatch):
+    """Test requesting CRC32C without the crc32c package raises before scanning."""
+    monkeypatch.setattr(crc32_folder_calc, '_crc32c', None)
+    with pytest.raises(RuntimeError, match="crc32c"):
+        scan_directory(str(tmp_path), str(tmp_path / "out.csv"), poly='crc32c')
+    assert not (tmp_path / "out.csv").exists()
+
+
+def test_compute_crc32_with_size_reports_size(tmp_path):
+    """Test compute_crc32_with_size returns the CRC together with the file size."""
+    test_file = tmp_path / "sized.txt"
+    test_file.write_text("Hello World!", encoding='utf-8')
+
+    assert compute_crc32_with_size(str(test_file)) == ("1C291CA3", 12)
+
+    crc, size = compute_crc32_with_size(str(tmp_path / "missing.txt"))
+    assert crc.startswith("ERROR:")
+    assert size == ''
+
+
+def test_compute_crc32_reuse_dir_fd(tmp_path):
+    """Test opening relative to a cached directory fd gives the same results and releases the fd."""
+    first = tmp_path / "one"
+    second = tmp_path / "two"
+    first.mkdir()
+    second.mkdir()
+    (first / "a.txt").write_text("Hello World!", encoding='utf-8')
+    (first / "b.txt").write_text("Content A", encoding='utf-8')
+    (second / "a.txt").write_text("Content B", encoding='utf-8')
+
+    for path in [first / "a.txt", first / "b.txt", second / "a.txt", first / "missing.txt"]:
+        assert compute_crc32_with_size(str(path), reuse_dir_fd=True) == compute_crc32_with_size(str(path))
+
+    crc32_folder_calc._release_directory()
+    assert getattr(crc32_folder_calc._thread_directory, 'current', None) is None
+
+
+def test_crc32_backend_selection(monkeypatch):
+    """Test backend auto-detection follows CPU flags and only picks installed backends."""
+    fake_backends = {'zlib': zlib.crc32, 'isal': zlib.crc32, 'libdeflate': zlib.crc32}
+    monkeypatch.setattr(crc32_folder_calc, 'CRC32_BACKENDS', fake_backends)
+    select = crc32_folder_calc._select_crc32_backend
+    assert select({'avx512f', 'vpclmulqdq', 'pclmulqdq'}) == 'isal'
+    assert select({'pclmulqdq', 'sse4_2'}) == 'libdeflate'
+    assert select({'sse2'}) == 'zlib'
+    assert select(set()) == 'isal'
+    # aarch64 /proc/cpuinfo 'Features'
+    assert select({'fp', 'asimd', 'pmull', 'crc32'}) == 'libdeflate'
+    assert select({'fp', 'asimd'}) == 'isal'
+
+    monkeypatch.setattr(crc32_folder_calc, 'CRC32_BACKENDS', {'zlib': zlib.crc32})
+    assert select({'avx512f', 'vpclmulqdq'}) == 'zlib'
+
+    monkeypatch.setattr(crc32_folder_calc, 'CRC32_BACKENDS', {'zlib': zlib.crc32, 'fastcrc': zlib.crc32})
+    assert select({'pclmulqdq'}) == 'fastcrc'
+    assert select({'sse2'}) == 'zlib'
+
+
+def test_set_crc32_backend_override(monkeypatch):
+    """Test an explicit backend can be chosen and unknown backends are rejected."""
+    monkeypatch.setattr(crc32_folder_calc, '_crc32', crc32_folder_calc._crc32)
+    monkeypatch.setattr(crc32_folder_calc, 'CRC32_BACKEND', crc32_folder_calc.CRC32_BACKEND)
+
+    crc32_folder_calc.set_crc32_backend('zlib')
+    assert crc32_folder_calc.CRC32_BACKEND == 'zlib'
+    assert crc32_folder_calc._crc32 is zlib.crc32
+
+    with pytest.raises(ValueError, match="not available"):
+        crc32_folder_calc.set_crc32_backend('no-such-backend')
+
+
+def test_csv_line_formatter_matches_csv_writer():
+    """Test the direct bytes CSV formatter produces exactly what csv.writer writes."""
+    rows = [
+        ['FileName', 'Size', 'CRC32', 'Path'],
+        ['plain.jpg', 1234, '1C291CA3', 'folder'],
+        ['comma,separated.txt', 5, 'ABCDEF01', 'folder'],
+        ['say "cheese".jpg', 5, 'ABCDEF01', 'fol,der'],
+        ['line\nbreak.txt', '', 'ERROR: boom, failed', 'folder', '', ''],
+        ['tëst_文件.txt', 7, '00000000', 'ünïcode'],
+    ]
+    format_line = crc32_folder_calc._CSVLineFormatter()
+    for row in rows:
+        expected = io.StringIO()
+        csv.writer(expected).writerow(row)
+        assert format_line(row) == expected.getvalue().encode('utf-8'), row
+
+
+def test_read_buffer_reused_per_thread(tmp_path):
+    """Test each thread reuses one read buffer across files and threads do not share it."""
+    first = crc32_folder_calc._read_buffer()
+    data = b"reused buffer " * 5000
+    for i in range(3):
+        path = tmp_path / f"file{i}.bin"
+        path.write_bytes(data[i:])
+        assert compute_crc32(str(path)) == f"{zlib.crc32(data[i:]):08X}"
+    assert crc32_folder_calc._read_buffer()[0] is first[0]
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(crc32_folder_calc._read_buffer()[0]))
+    thread.start()
+    thread.join()
+    assert other[0] is not first[0]
+
+
+def test_crc_of_zeros_matches_reading():
+    """Test the computed CRC of zero bytes matches hashing real zeros."""
+    for length in (1, 7, 4096, 1 << 20):
+        assert crc32_folder_calc.crc_of_zeros(length) == zlib.crc32(bytes(length))
+    assert crc32_folder_calc.crc_of_zeros(32, 'crc32c') == _crc32c_reference(bytes(32))
+
+
+def test_sparse_file_not_read_when_trusted(tmp_path, monkeypatch):
+    """Test trust_sparse hashes a hole-only file as zeros without reading it."""
+    sparse = tmp_path / "padding.bin"
+    with open(sparse, "wb") as f:
+        f.truncate(3 * 1024 * 1024)
+    # st_blocks is POSIX-only; Windows has no way to tell a hole apart here
+    if getattr(os.stat(sparse), "st_blocks", None) != 0:
+        pytest.skip("filesystem does not create sparse files (or report st_blocks)")
+
+    expected = f"{zlib.crc32(bytes(3 * 1024 * 1024)):08X}"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("sparse file should not be read")
+
+    # Trusted first: tmp_path is on tmpfs on Linux (see conftest.py), where
+    # reading the holes (mmap faults) allocates pages and the file stops being sparse
+    with monkeypatch.context() as patched:
+        patched.setattr(crc32_folder_calc, "_crc32_stream", fail)
+        patched.setattr(crc32_folder_calc.mmap, "mmap", fail)
+        assert compute_crc32_with_size(str(sparse), trust_sparse=True) == (expected, 3 * 1024 * 1024)
+
+    assert compute_crc32_with_size(str(sparse)) == (expected, 3 * 1024 * 1024)
 
 
 if __name__ == "__main__":
@@ -9,23 +9,44 @@ This test file ensures that the CSV-Validate-Repair script properly:
 """
 
 import csv
+import mmap
 import os
 import subprocess
 import sys
 import tempfile
 from pathlib import Path
 
+import pytest
 
-REPO_ROOT = Path(__file__).resolve().parent.parent
-SCRIPT = REPO_ROOT / 'CSV-Validate-Repair.py'
+from _repair_runner import SCRIPT_STR, load_module, run_main
 
 
-def run_script(csv_path, extra_args=None):
-    args = [sys.executable, str(SCRIPT), str(csv_path)]
+# Loaded once; tests call its main() in-process
+csv_module = load_module()
+
+
+def run_script(csv_path, extra_args=None, capture=False):
+    """
+    Run the script's main() with these arguments, returning a subprocess.CompletedProcess.
+
+    Output is only collected with capture=True; no test here reads it, so by
+    default it is discarded and stdout/stderr are None.
+    """
+    args = [os.fspath(csv_path)]
     if extra_args:
         args += extra_args
-    proc = subprocess.run(args, capture_output=True, text=True)
-    return proc
+    returncode, stdout, stderr = run_main(csv_module, args, capture)
+    return subprocess.CompletedProcess([sys.executable, SCRIPT_STR] + args, returncode, stdout, stderr)
+
+
+def row_line(cells):
+    """Return one CSV line, quoting (QUOTE_MINIMAL style) only cells that need it."""
+    quoted = []
+    for cell in cells:
+        if ',' in cell or '"' in cell:
+            cell = '"' + cell.replace('"', '""') + '"'
+        quoted.append(cell)
+    return ','.join(quoted) + '\n'
 
 
 def read_csv_rows(path):
@@ -35,148 +56,37 @@ def read_csv_rows(path):
         return [row for row in reader]
 
 
-def test_comment_with_single_comma(tmp_path):
-    """Test that comments with a single comma are preserved."""
-    csv_file = tmp_path / 'single_comma.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['file1.jpg', '1000', 'ABCD1234', '\\path\\', 'This is a comment, with one comma'])
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    
-    repaired = tmp_path / 'single_comma_repaired.csv'
-    assert repaired.exists()
-    
-    rows = read_csv_rows(repaired)
-    assert len(rows) == 1
-    assert rows[0][4] == 'This is a comment, with one comma'
+LONG_COMMENT = 'This is a very long comment with many words, multiple commas, and "quotes" to test that the entire content is preserved without any truncation or data loss even when it spans many characters and contains special CSV characters like commas and quotes.'
 
 
-def test_comment_with_multiple_commas(tmp_path):
-    """Test that comments with multiple commas are preserved."""
-    csv_file = tmp_path / 'multi_comma.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['file2.jpg', '2000', 'DEADBEEF', '\\path\\', 'Comment with, multiple, commas, here'])
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    
-    repaired = tmp_path / 'multi_comma_repaired.csv'
-    assert repaired.exists()
-    
-    rows = read_csv_rows(repaired)
-    assert len(rows) == 1
-    assert rows[0][4] == 'Comment with, multiple, commas, here'
-
-
-def test_comment_with_embedded_quotes(tmp_path):
-    """Test that comments with embedded double quotes are preserved."""
-    csv_file = tmp_path / 'quoted_comment.csv'
-    comment_text = 'Comment with "quoted" text inside'
-    
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['file3.jpg', '3000', 'CAFEBABE', '\\path\\', comment_text])
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    
-    repaired = tmp_path / 'quoted_comment_repaired.csv'
-    assert repaired.exists()
-    
-    rows = read_csv_rows(repaired)
-    assert len(rows) == 1
-    assert rows[0][4] == comment_text
-
-
-def test_comment_with_quotes_and_commas(tmp_path):
-    """Test the complex case: comments with both quotes and commas."""
-    csv_file = tmp_path / 'complex_comment.csv'
-    comment_text = 'In the "2006-09-16" folder, check files'
-    
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['file4.jpg', '4000', '12345678', '\\path\\', comment_text])
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    
-    repaired = tmp_path / 'complex_comment_repaired.csv'
-    assert repaired.exists()
-    
-    rows = read_csv_rows(repaired)
-    assert len(rows) == 1
-    assert rows[0][4] == comment_text
-
-
-def test_long_comment_not_truncated(tmp_path):
-    """Test that long comments are not truncated."""
-    csv_file = tmp_path / 'long_comment.csv'
-    long_comment = 'This is a very long comment with many words, multiple commas, and "quotes" to test that the entire content is preserved without any truncation or data loss even when it spans many characters and contains special CSV characters like commas and quotes.'
-    
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['file5.jpg', '5000', '9ABCDEF0', '\\path\\', long_comment])
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    
-    repaired = tmp_path / 'long_comment_repaired.csv'
-    assert repaired.exists()
-    
-    rows = read_csv_rows(repaired)
-    assert len(rows) == 1
-    assert rows[0][4] == long_comment
-
-
-def test_empty_comment_preserved(tmp_path):
-    """Test that empty comments remain empty."""
-    csv_file = tmp_path / 'empty_comment.csv'
-    
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['file6.jpg', '6000', 'FEDCBA98', '\\path\\', ''])
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    
-    repaired = tmp_path / 'empty_comment_repaired.csv'
-    assert repaired.exists()
-    
-    rows = read_csv_rows(repaired)
-    assert len(rows) == 1
-    assert rows[0][4] == ''
-
-
-def test_comment_with_whitespace(tmp_path):
-    """Test that comments with leading/trailing whitespace are trimmed."""
-    csv_file = tmp_path / 'whitespace_comment.csv'
-    
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['file7.jpg', '7000', '11223344', '\\path\\', '  Comment with spaces  '])
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    
-    repaired = tmp_path / 'whitespace_comment_repaired.csv'
-    assert repaired.exists()
-    
-    rows = read_csv_rows(repaired)
-    assert len(rows) == 1
+@pytest.mark.parametrize("comment_in,comment_out", [
+    pytest.param('This is a comment, with one comma', 'This is a comment, with one comma', id='single_comma'),
+    pytest.param('Comment with, multiple, commas, here', 'Comment with, multiple, commas, here', id='multiple_commas'),
+    pytest.param('Comment with "quoted" text inside', 'Comment with "quoted" text inside', id='embedded_quotes'),
+    pytest.param('In the "2006-09-16" folder, check files', 'In the "2006-09-16" folder, check files', id='quotes_and_commas'),
+    pytest.param(LONG_COMMENT, LONG_COMMENT, id='long_not_truncated'),
+    pytest.param('', '', id='empty'),
     # validate_comment() trims whitespace
-    assert rows[0][4] == 'Comment with spaces'
+    pytest.param('  Comment with spaces  ', 'Comment with spaces', id='whitespace_trimmed'),
+])
+def test_comment_roundtrip(comment_in, comment_out):
+    """Test that a comment survives parsing (commas, quotes, length, empty; outer whitespace trimmed)."""
+    # Same steps validate_and_repair_csv applies to a comment; the full --repair
+    # pipeline is covered by the multi-row and header tests below.
+    issues = []
+    fields = csv_module.parse_csv_line_with_quotes(
+        row_line(['file1.jpg', '1000', 'ABCD1234', '\\path\\', comment_in]), line_num=1, issues=issues)
+    comment = csv_module.validate_comment(','.join(fields[4:]), 1, issues)
+    assert fields[:4] == ['file1.jpg', '1000', 'ABCD1234', '\\path\\']
+    assert comment == comment_out
+    assert issues == []
 
 
 def test_all_fields_quoted_in_output(tmp_path):
     """Test that ALL fields are quoted in the output (QUOTE_ALL behavior)."""
     csv_file = tmp_path / 'quote_all.csv'
     
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['simple.jpg', '8000', 'AABBCCDD', '\\path\\', 'Simple comment'])
+    csv_file.write_bytes(b'simple.jpg,8000,AABBCCDD,\\path\\,Simple comment\n')
 
     proc = run_script(csv_file, extra_args=['--repair'])
     assert proc.returncode in (0, 2)
@@ -184,32 +94,26 @@ def test_all_fields_quoted_in_output(tmp_path):
     repaired = tmp_path / 'quote_all_repaired.csv'
     assert repaired.exists()
     
-    # Read raw content to verify all fields are quoted
-    with open(repaired, 'r', encoding='utf-8') as f:
-        raw_content = f.read()
-    
-    # All fields should be wrapped in quotes (QUOTE_ALL)
-    assert '"simple.jpg"' in raw_content
-    assert '"8000"' in raw_content  # Even numeric fields should be quoted
-    assert '"AABBCCDD"' in raw_content
-    assert '"\\path\\"' in raw_content or '"\\\\path\\\\"' in raw_content  # May have escaped backslashes
-    assert '"Simple comment"' in raw_content
+    # Search the raw bytes to verify all fields are quoted (no decode needed)
+    with open(repaired, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as raw:
+        # All fields should be wrapped in quotes (QUOTE_ALL)
+        assert raw.find(b'"simple.jpg"') != -1
+        assert raw.find(b'"8000"') != -1  # Even numeric fields should be quoted
+        assert raw.find(b'"AABBCCDD"') != -1
+        assert raw.find(b'"\\path\\"') != -1 or raw.find(b'"\\\\path\\\\"') != -1  # May have escaped backslashes
+        assert raw.find(b'"Simple comment"') != -1
 
 
 def test_multiple_rows_with_varied_comments(tmp_path):
     """Test multiple rows with different comment patterns."""
     csv_file = tmp_path / 'multi_rows.csv'
     
-    rows_data = [
-        ['file1.jpg', '1000', 'AAAAAAAA', '\\path1\\', 'Simple'],
-        ['file2.jpg', '2000', 'BBBBBBBB', '\\path2\\', 'With, comma'],
-        ['file3.jpg', '3000', 'CCCCCCCC', '\\path3\\', 'With "quotes"'],
-        ['file4.jpg', '4000', 'DDDDDDDD', '\\path4\\', ''],
-    ]
-    
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerows(rows_data)
+    csv_file.write_bytes(
+        b'file1.jpg,1000,AAAAAAAA,\\path1\\,Simple\n'
+        b'file2.jpg,2000,BBBBBBBB,\\path2\\,"With, comma"\n'
+        b'file3.jpg,3000,CCCCCCCC,\\path3\\,"With ""quotes"""\n'
+        b'file4.jpg,4000,DDDDDDDD,\\path4\\,\n'
+    )
 
     proc = run_script(csv_file, extra_args=['--repair'])
     assert proc.returncode in (0, 2)
@@ -229,10 +133,10 @@ def test_comment_preservation_with_header(tmp_path):
     """Test comment preservation when CSV has a header row."""
     csv_file = tmp_path / 'with_header.csv'
     
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['FileName', 'Size', 'CRC32', 'Path', 'Comment'])
-        writer.writerow(['data.jpg', '9000', 'EEFFAABB', '\\data\\', 'Important, note, here'])
+    csv_file.write_bytes(
+        b'FileName,Size,CRC32,Path,Comment\n'
+        b'data.jpg,9000,EEFFAABB,\\data\\,"Important, note, here"\n'
+    )
 
     proc = run_script(csv_file, extra_args=['--repair'])
     assert proc.returncode in (0, 2)
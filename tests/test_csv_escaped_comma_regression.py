@@ -1,23 +1,8 @@
-import os
-import importlib.util
 import re
 
 
-def load_module_from_path(path):
-    spec = importlib.util.spec_from_file_location("csv_validate_repair", path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
-
-
-def test_escaped_comma_trailing_backslash():
-    # Locate the CSV-Validate-Repair.py script relative to the repo root
-    repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-    module_path = os.path.join(repo_root, 'CSV-Validate-Repair.py')
-    assert os.path.exists(module_path), f"Module not found: {module_path}"
-
-    mod = load_module_from_path(module_path)
-    parse = getattr(mod, 'parse_csv_line_with_quotes')
+def test_escaped_comma_trailing_backslash(csv_validate_module):
+    parse = csv_validate_module.parse_csv_line_with_quotes
 
     # Line with an escaped comma sequence (literal backslash+comma) inside the Path field
     raw = 'file.pdf,12345,ABCDEF12,\\Some\\Path\\With\\Comma\\,Comment text\n'
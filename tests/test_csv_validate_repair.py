@@ -1,21 +1,29 @@
+import contextlib
 import csv
 import os
+import shutil
 import subprocess
 import sys
 import tempfile
+from dataclasses import dataclass
 from pathlib import Path
 
+import pytest
 
-REPO_ROOT = Path(__file__).resolve().parent.parent
-SCRIPT = REPO_ROOT / 'CSV-Validate-Repair.py'
+from _fs_helpers import write_file
+from _repair_runner import SCRIPT_STR, DiscardWriter
 
 
-def run_script(csv_path, extra_args=None):
-    args = [sys.executable, str(SCRIPT), str(csv_path)]
-    if extra_args:
-        args += extra_args
-    proc = subprocess.run(args, capture_output=True, text=True)
-    return proc
+@pytest.fixture
+def tmp_path(shared_tmp):
+    """Tests here only write a few small files; use the cheaper shared_tmp (see conftest.py)."""
+    return shared_tmp
+
+
+@pytest.fixture
+def run_script(run_repair):
+    """Run the script's main() in-process (see conftest.py)."""
+    return run_repair
 
 
 def read_csv_rows(path):
@@ -24,41 +32,144 @@ def read_csv_rows(path):
         return [row for row in reader]
 
 
-def test_single_slash_path_repair(tmp_path):
-    # Create CSV with a single slash in Path field
-    csv_file = tmp_path / 'slash_test.csv'
-    lines = [
-        ['FileName', 'Size', 'CRC32', 'Path', 'Comment'],
-        ['sample.jpg', '123', 'ABCDEF12', '/', 'slash in path'],
-    ]
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerows(lines)
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    # Repair run should finish (even if there are no issues) with exit code 0 or 2
-    assert proc.returncode in (0, 2)
-
-    repaired = tmp_path / 'slash_test_repaired.csv'
-    assert repaired.exists(), 'Repaired CSV must be written by default'
-    rows = read_csv_rows(repaired)
+def read_plain_rows(path):
+    """
+    Split a QUOTE_ALL repaired CSV without the csv module.
+
+    Only for outputs whose fields contain no quotes, commas or line breaks;
+    use read_csv_rows() for anything else.
+    """
+    text = path.read_text(encoding='utf-8')
+    return [line[1:-1].split('","') for line in text.splitlines()]
+
+
+# Small input CSVs shared by several tests: kind -> (file name, bytes). Each
+# is written once per session by minimal_csv_factory and copied where needed.
+MINIMAL_CSVS = {
+    'slash': ('slash_test.csv', b'FileName,Size,CRC32,Path,Comment\r\nsample.jpg,123,ABCDEF12,/,slash in path\r\n'),
+    # Path with a literal backslash+comma sequence
+    'esc_comma': ('esc_comma.csv', b'FileName,Size,CRC32,Path,Comment\nsample.jpg,123,ABCDEF12,folder\\,,comment with comma\n'),
+    # Two rows with identical CRC and Size
+    'dup_crc': ('dup_crc.csv', b'FileName,Size,CRC32,Path,Comment\r\na.jpg,100,AAAABBBB,p1,\r\nb.jpg,100,AAAABBBB,p2,\r\n'),
+    'short_row': ('short_row.csv', b'file,size,crc\nimg.jpg,200,DEADBEEF\n'),
+    # Quoted field with an embedded newline (physical multi-line field)
+    'multi_line_field': ('multi_line_field.csv', b'FileName,Size,CRC32,Path,Comment\n"file.jpg",10,ABCDEF12,"multi\nline",note\n'),
+    # BEL control character in Path
+    'ctrl': ('ctrl_chars.csv', b'FileName,Size,CRC32,Path,Comment\r\na.jpg,1,A1B2C3D4,folder\x07inner,\r\n'),
+    'utf16': ('utf16.csv', 'FileName,Size,CRC32,Path,Comment\nimg.jpg,30,0BADF00D,folder,ok\n'.encode('utf-16')),
+    # 5000-character FileName
+    'long': ('long.csv', b'FileName,Size,CRC32,Path,Comment\r\n' + b'a' * 5000 + b',1,ABCDEF01,.,\r\n'),
+    'header': ('header.csv', b'FileName,Size,CRC32,Path,Comment\nimg.jpg,50,CAFEBABE,folder,ok\n'),
+    'bom': ('bom.csv', 'FileName,Size,CRC32,Path,Comment\nimg.jpg,20,FEEDFACE,folder,ok\n'.encode('utf-8-sig')),
+    'clean': ('clean.csv', b'img.jpg,10,01234567,folder,\n'),
+    'dry': ('dry.csv', b'img.jpg,10,89ABCDEF,folder,\n'),
+}
+
+# Non-UTF-8 input for --flag-nonutf8, encoded once at import
+CP1252_CSV = 'img.jpg,15,ABCDEF01,folder,é\n'.encode('cp1252')
+
+# Inputs that only need a plain --repair: repaired together by one bulk run
+BULK_REPAIR_KINDS = ('slash', 'esc_comma', 'dup_crc', 'short_row', 'multi_line_field', 'ctrl', 'utf16', 'long', 'header', 'bom')
+
+
+@pytest.fixture(scope="session")
+def minimal_csv_factory(tmp_path_factory):
+    """Return make(kind) -> read-only source Path of MINIMAL_CSVS[kind], written on first use."""
+    fixtures_dir = tmp_path_factory.mktemp("fixtures")
+    made = {}
+
+    def make(kind):
+        path = made.get(kind)
+        if path is None:
+            name, data = MINIMAL_CSVS[kind]
+            path = made[kind] = fixtures_dir / name
+            write_file(path, data)
+        return path
+
+    return make
+
+
+@pytest.fixture
+def minimal_csv(minimal_csv_factory, tmp_path):
+    """Return copy(kind) -> a private copy of MINIMAL_CSVS[kind] in tmp_path, under its usual name."""
+    def copy(kind):
+        src = minimal_csv_factory(kind)
+        return Path(shutil.copy(src, tmp_path / src.name))
+
+    return copy
+
+
+@dataclass
+class BulkRepairRun:
+    """Outputs of one process_folder_bulk(repair=True) run over BULK_REPAIR_KINDS."""
+    output_dir: Path
+    files: dict  # CSV name -> that file's entry in results['files']
+    written: frozenset  # names in output_dir, listed once instead of a stat per check
+
+    def status(self, kind):
+        return self.files[MINIMAL_CSVS[kind][0]]
+
+    def repaired(self, kind):
+        # Bulk mode writes the repaired CSV under its original name
+        return self.output_dir / MINIMAL_CSVS[kind][0]
+
+    def log(self, kind):
+        return self.output_dir / (MINIMAL_CSVS[kind][0][:-4] + '_repair_log.txt')
+
+    def wrote(self, path):
+        return path.name in self.written
+
+
+@pytest.fixture(scope="module")
+def bulk_repair(tmp_path_factory, minimal_csv_factory, csv_validate_module):
+    """Repair every BULK_REPAIR_KINDS input in a single bulk-mode call."""
+    source_dir = tmp_path_factory.mktemp("bulk_src")
+    for kind in BULK_REPAIR_KINDS:
+        shutil.copy(minimal_csv_factory(kind), source_dir)
+    output_dir = tmp_path_factory.mktemp("bulk_out")
+    with contextlib.redirect_stdout(DiscardWriter()):
+        results = csv_validate_module.process_folder_bulk(
+            str(source_dir), output_folder=str(output_dir), use_subfolders=False, repair=True)
+    assert results['total_files'] == len(BULK_REPAIR_KINDS)
+    return BulkRepairRun(output_dir, {entry['name']: entry for entry in results['files']},
+                         frozenset(os.listdir(output_dir)))
+
+
+# Plain repairs whose output only needs one cell checked. The repaired CSV is
+# QUOTE_ALL, so a quoted-and-delimited byte needle pins a cell without parsing:
+# kind -> needle, or None when only the file must exist
+REPAIRED_OUTPUT_NEEDLES = {
     # Path should be preserved (no conversion to comma)
-    assert rows[1][3] == '/', f'Unexpected Path normalization: {rows[1][3]}'
-
-
-def test_escaped_comma_preserved(tmp_path):
+    'slash': b',"/",',
+    # Row with only 3 fields is padded; no specific cell to check
+    'short_row': None,
+    'utf16': None,
+    'bom': None,
+    # 5000-char FileName must not break the row; Path ('.') is still followed by Comment
+    'long': b',".",',
+    # First row should still be the header (checked as a prefix, see below)
+    'header': b'"FileName","Size","CRC32","Path","Comment"',
+}
+
+
+@pytest.mark.parametrize("kind", list(REPAIRED_OUTPUT_NEEDLES))
+def test_bulk_repaired_output(bulk_repair, kind):
+    # Repair should finish with or without issues and write the repaired CSV
+    assert bulk_repair.status(kind)['status'] in ('CLEAN', 'ISSUES_FOUND')
+    repaired = bulk_repair.repaired(kind)
+    assert bulk_repair.wrote(repaired), 'Repaired CSV must be written by default'
+    needle = REPAIRED_OUTPUT_NEEDLES[kind]
+    if needle is not None:
+        data = repaired.read_bytes()
+        found = data.startswith(needle) if kind == 'header' else needle in data
+        assert found, f'{needle!r} not found in repaired CSV: {data[:200]!r}'
+
+
+def test_escaped_comma_preserved(bulk_repair):
     # Path contains a backslash+comma sequence which should be preserved
-    csv_file = tmp_path / 'esc_comma.csv'
-    # Write a row where the Path field contains an explicit '\,' sequence
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write('FileName,Size,CRC32,Path,Comment\n')
-        # This line intentionally contains a backslash followed by a comma within the Path
-        f.write('sample.jpg,123,ABCDEF12,folder\\,,comment with comma\n')
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    repaired = tmp_path / 'esc_comma_repaired.csv'
-    assert repaired.exists()
+    assert bulk_repair.status('esc_comma')['status'] in ('CLEAN', 'ISSUES_FOUND')
+    repaired = bulk_repair.repaired('esc_comma')
+    assert bulk_repair.wrote(repaired)
     rows = read_csv_rows(repaired)
     # locate the first non-header row (some runs may preserve header row)
     data_row = None
@@ -67,156 +178,78 @@ def test_escaped_comma_preserved(tmp_path):
             data_row = r
             break
     assert data_row is not None, f'No data row found in repaired CSV: {rows}'
-    rows = read_csv_rows(repaired)
     # The script attempts to preserve trailing backslash for escaped-comma sequences
     # CRC should remain unchanged for this row
     assert data_row[2] == 'ABCDEF12'
     assert data_row[3].endswith('\\') or '\\,' in ','.join(data_row) or data_row[3].endswith(','), 'Escaped comma/backslash should be preserved in Path'
 
 
-def test_duplicate_crc_flagging(tmp_path):
+def test_duplicate_crc_flagging(bulk_repair):
     # Two rows with identical CRC and Size should be flagged as issues
-    csv_file = tmp_path / 'dup_crc.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['FileName', 'Size', 'CRC32', 'Path', 'Comment'])
-        writer.writerow(['a.jpg', '100', 'AAAABBBB', 'p1', ''])
-        writer.writerow(['b.jpg', '100', 'AAAABBBB', 'p2', ''])
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    # The script exits with code 2 when issues are found
-    assert proc.returncode == 2, f'Expected exit code 2 for duplicate CRC issues, got {proc.returncode} stdout:{proc.stdout} stderr:{proc.stderr}'
-    log_file = tmp_path / 'dup_crc_repair_log.txt'
+    status = bulk_repair.status('dup_crc')
+    assert status['issues'] > 0, f'Expected duplicate CRC issues, got {status}'
+    log_file = bulk_repair.log('dup_crc')
     # When issues are present, a log file should be created
-    assert log_file.exists(), 'Repair run with issues should write a log file'
+    assert bulk_repair.wrote(log_file), 'Repair run with issues should write a log file'
     txt = log_file.read_text(encoding='utf-8')
     assert 'Duplicate CRC32' in txt or 'Duplicate CRC32 value' in txt
 
 
-def test_insufficient_fields_are_extended(tmp_path):
-    # Row with only 3 fields should be padded to 5 fields in the repaired CSV
-    csv_file = tmp_path / 'short_row.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write('file,size,crc\n')
-        f.write('img.jpg,200,DEADBEEF\n')
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    repaired = tmp_path / 'short_row_repaired.csv'
-    assert repaired.exists()
-
-
-def test_embedded_newline_in_quoted_field_flags_issue(tmp_path):
+def test_embedded_newline_in_quoted_field_flags_issue(bulk_repair):
     # A quoted field containing an embedded newline (physical multi-line field)
     # is an edge-case for this line-by-line parser; the script should flag an issue
-    csv_file = tmp_path / 'multi_line_field.csv'
-    content = 'FileName,Size,CRC32,Path,Comment\n"file.jpg",10,ABCDEF12,"multi\nline",note\n'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write(content)
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    # Expect the script to detect a parsing/fallback issue and return exit code 2
-    assert proc.returncode == 2
-    log_file = tmp_path / 'multi_line_field_repair_log.txt'
-    assert log_file.exists()
+    assert bulk_repair.status('multi_line_field')['issues'] > 0
+    log_file = bulk_repair.log('multi_line_field')
+    assert bulk_repair.wrote(log_file)
     txt = log_file.read_text(encoding='utf-8')
     assert 'CSV parsing error' in txt or 'Insufficient fields' in txt or 'Issues Found' in txt
 
 
-def test_control_characters_removed_on_repair(tmp_path):
-    # Path contains control characters which should be replaced when --repair is used
-    csv_file = tmp_path / 'ctrl_chars.csv'
-    bad_path = 'folder' + chr(7) + 'inner'  # BEL/control char in path
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['FileName', 'Size', 'CRC32', 'Path', 'Comment'])
-        writer.writerow(['a.jpg', '1', 'A1B2C3D4', bad_path, ''])
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode == 2 or proc.returncode == 0
-    repaired = tmp_path / 'ctrl_chars_repaired.csv'
-    assert repaired.exists()
-    rows = read_csv_rows(repaired)
+def test_control_characters_removed_on_repair(bulk_repair):
+    # Path contains control characters (BEL) which should be replaced when repairing
+    assert bulk_repair.status('ctrl')['status'] in ('CLEAN', 'ISSUES_FOUND')
+    repaired = bulk_repair.repaired('ctrl')
+    assert bulk_repair.wrote(repaired)
     # Invalid control char should have been replaced by '_' by the repair logic
-    assert '_' in rows[1][3]
-    log_file = tmp_path / 'ctrl_chars_repair_log.txt'
-    assert log_file.exists()
+    assert b',"folder_inner",' in repaired.read_bytes()
+    log_file = bulk_repair.log('ctrl')
+    assert bulk_repair.wrote(log_file)
     assert 'Invalid path characters removed' in log_file.read_text(encoding='utf-8')
 
 
-def test_utf16_bom_handling(tmp_path):
-    csv_file = tmp_path / 'utf16.csv'
-    # Write as UTF-16 with BOM
-    with open(csv_file, 'w', newline='', encoding='utf-16') as f:
-        f.write('FileName,Size,CRC32,Path,Comment\n')
-        f.write('img.jpg,30,0BADF00D,folder,ok\n')
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    repaired = tmp_path / 'utf16_repaired.csv'
-    assert repaired.exists()
-
-
-def test_very_long_fields(tmp_path):
-    csv_file = tmp_path / 'long.csv'
-    long_name = 'a' * 5000
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.writer(f)
-        writer.writerow(['FileName', 'Size', 'CRC32', 'Path', 'Comment'])
-        writer.writerow([long_name, '1', 'ABCDEF01', '.', ''])
+@pytest.mark.parametrize("kind,returncode", [
+    # Duplicate CRC issues and a multi-line field both exit 2 (issues found)
+    ('dup_crc', 2),
+    ('multi_line_field', 2),
+    ('clean', 0),
+])
+def test_single_file_repair_exit_code(tmp_path, run_script, minimal_csv, kind, returncode):
+    # End-to-end single-file `--repair` run through main(): the shared bulk run
+    # above reports per-file statuses and never reaches these exit codes
+    csv_file = minimal_csv(kind)
 
     proc = run_script(csv_file, extra_args=['--repair'])
-    # Should not crash; accept success or issues
-    assert proc.returncode in (0, 2)
-    repaired = tmp_path / 'long_repaired.csv'
-    assert repaired.exists()
-    rows = read_csv_rows(repaired)
-    # The repaired row should have been extended to include Path and Comment (we wrote '.' as Path)
-    assert len(rows[1]) >= 5
-    assert rows[1][3] == '.'
-
+    assert proc.returncode == returncode, f'Expected exit code {returncode} for {kind}, got {proc.returncode}'
+    log_file = tmp_path / (csv_file.stem + '_repair_log.txt')
+    assert log_file.exists() == (returncode == 2)
 
-def test_header_row_preserved(tmp_path):
-    csv_file = tmp_path / 'header.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write('FileName,Size,CRC32,Path,Comment\n')
-        f.write('img.jpg,50,CAFEBABE,folder,ok\n')
 
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    repaired = tmp_path / 'header_repaired.csv'
-    assert repaired.exists()
-    rows = read_csv_rows(repaired)
-    # First row should still be the header
-    assert rows[0][0].lower() in ['filename', 'file', 'name']
-
-
-def test_normalize_crc32_flag(tmp_path):
+def test_normalize_crc32_flag(tmp_path, run_script):
     csv_file = tmp_path / 'norm_crc.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write('img.jpg,10,deadbeef,.,\n')
+    write_file(csv_file, b'img.jpg,10,deadbeef,.,\n')
 
     proc = run_script(csv_file, extra_args=['--repair', '--normalize-crc32'])
     # Should complete (may write a log); accept 0 or 2 conservatively
     assert proc.returncode in (0, 2)
     repaired = tmp_path / 'norm_crc_repaired.csv'
     assert repaired.exists()
-    rows = read_csv_rows(repaired)
-    # locate the first non-header row (some runs may preserve header row)
-    data_row = None
-    for r in rows:
-        if len(r) >= 3 and not (r[0].lower() in ['filename', 'file', 'name'] or r[2].lower() in ['crc32', 'crc', 'checksum']):
-            data_row = r
-            break
-    assert data_row is not None, f'No data row found in repaired CSV: {rows}'
-    assert data_row[2] == 'DEADBEEF'
+    # Lowercase CRC should come back upper-cased in its own quoted cell
+    assert b',"DEADBEEF",' in repaired.read_bytes()
 
 
-def test_no_rewrite_if_clean(tmp_path):
-    # Create a clean CSV that should not be rewritten when --no-rewrite-if-clean is used
-    csv_file = tmp_path / 'clean.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write('img.jpg,10,01234567,folder,\n')
+def test_no_rewrite_if_clean(tmp_path, run_script, minimal_csv):
+    # A clean CSV that should not be rewritten when --no-rewrite-if-clean is used
+    csv_file = minimal_csv('clean')
 
     proc = run_script(csv_file, extra_args=['--repair', '--no-rewrite-if-clean'])
     # If the file is clean, the script reports and skips rewrite
@@ -225,10 +258,8 @@ def test_no_rewrite_if_clean(tmp_path):
     assert not repaired.exists(), 'No repaired file should be written when --no-rewrite-if-clean is used and CSV is clean'
 
 
-def test_dry_run_does_not_write(tmp_path):
-    csv_file = tmp_path / 'dry.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write('img.jpg,10,89ABCDEF,folder,\n')
+def test_dry_run_does_not_write(tmp_path, run_script, minimal_csv):
+    csv_file = minimal_csv('dry')
 
     proc = run_script(csv_file, extra_args=['--repair', '--dry-run'])
     assert proc.returncode in (0, 2)
@@ -236,64 +267,62 @@ def test_dry_run_does_not_write(tmp_path):
     assert not repaired.exists()
 
 
-def test_nonutf8_flag_reports_issue(tmp_path):
+def test_nonutf8_flag_reports_issue(tmp_path, csv_validate_module):
     csv_file = tmp_path / 'cp1252.csv'
-    # Write a cp1252-encoded CSV (contains a Latin-1/CP1252 character)
-    text = 'img.jpg,15,ABCDEF01,folder,é\n'
-    with open(csv_file, 'w', newline='', encoding='cp1252') as f:
-        f.write(text)
+    log_file = tmp_path / 'cp1252_repair_log.txt'
+    # A cp1252-encoded CSV (contains a Latin-1/CP1252 character)
+    write_file(csv_file, CP1252_CSV)
 
-    proc = run_script(csv_file, extra_args=['--repair', '--flag-nonutf8'])
+    issues, _, _, _ = csv_validate_module.validate_and_repair_csv(
+        str(csv_file),
+        log_file=str(log_file),
+        flag_nonutf8=True,
+        repair=True
+    )
     # Expect issues found due to non-UTF8 encoding detection
-    assert proc.returncode == 2, f'Expected exit code 2 for non-UTF8 flagged run, got {proc.returncode} stdout:{proc.stdout} stderr:{proc.stderr}'
-    log_file = tmp_path / 'cp1252_repair_log.txt'
+    assert len(issues) > 0
     assert log_file.exists()
     txt = log_file.read_text(encoding='utf-8')
     assert 'Non-UTF-8 encoding detected' in txt
 
 
-def test_bom_handling_utf8sig(tmp_path):
-    csv_file = tmp_path / 'bom.csv'
-    # Write with UTF-8 BOM
-    with open(csv_file, 'w', newline='', encoding='utf-8-sig') as f:
-        f.write('FileName,Size,CRC32,Path,Comment\n')
-        f.write('img.jpg,20,FEEDFACE,folder,ok\n')
+def test_cli_subprocess_smoke(tmp_path):
+    # One real `python CSV-Validate-Repair.py ...` run covers the __main__ entry
+    # point that the in-process run_script() bypasses
+    csv_file = tmp_path / 'smoke.csv'
+    write_file(csv_file, b'img.jpg,10,89abcdef,folder,ok\n')
 
-    proc = run_script(csv_file, extra_args=['--repair'])
+    # close_fds=False lets CPython use posix_spawn on Linux; pytest's own fds are
+    # non-inheritable (PEP 446), so nothing leaks into the child
+    proc = subprocess.run([sys.executable, SCRIPT_STR, str(csv_file), '--repair'],
+                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, close_fds=False)
     assert proc.returncode in (0, 2)
-    repaired = tmp_path / 'bom_repaired.csv'
-    assert repaired.exists()
-import importlib.util
-import csv
-from pathlib import Path
+    rows = read_plain_rows(tmp_path / 'smoke_repaired.csv')
+    assert rows == [['img.jpg', '10', '89ABCDEF', 'folder', 'ok']]
 
 
-def load_module():
-    src = Path(__file__).parent.parent / 'CSV-Validate-Repair.py'
-    spec = importlib.util.spec_from_file_location('csv_validate_repair', str(src))
-    mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)
-    return mod
-
-
-def test_validate_crc32_normalization():
-    mod = load_module()
-    issues = []
+@pytest.mark.parametrize("raw,expected", [
     # lower-case short hex should be uppercased and zero-padded to 8
-    out = mod.validate_crc32('1a', 1, issues, repair=True)
-    assert out == '0000001A'
+    ('1a', '0000001A'),
+    ('0x1a', '0000001A'),
+    ('abcd1234', 'ABCD1234'),
+    ('ABCD1234', 'ABCD1234'),
+    ('  abcd1234  ', 'ABCD1234'),
+])
+def test_validate_crc32_normalization(csv_validate_module, raw, expected):
+    issues = []
+    out = csv_validate_module.validate_crc32(raw, 1, issues, repair=True)
+    assert out == expected
 
 
-def test_validate_and_repair_csv_normalize_only(tmp_path):
-    mod = load_module()
+def test_validate_and_repair_csv_normalize_only(tmp_path, csv_validate_module):
+    mod = csv_validate_module
     input_csv = tmp_path / 'input.csv'
     output_csv = tmp_path / 'output_repaired.csv'
     log_file = tmp_path / 'repair_log.txt'
 
-    # Write a simple CSV with header and one row; CRC is short and lower-case
-    content = 'FileName,Size,CRC32,Path,Comment\n'
-    content += 'test.jpg,123,1a2b3c,\\path\\,\n'
-    input_csv.write_text(content, encoding='utf-8')
+    # A simple CSV with header and one row; CRC is short and lower-case
+    write_file(input_csv, b'FileName,Size,CRC32,Path,Comment\ntest.jpg,123,1a2b3c,\\path\\,\n')
 
     issues, rows, out_path, archive = mod.validate_and_repair_csv(
         str(input_csv),
@@ -16,25 +16,23 @@ import os
 import csv
 import json
 import zipfile
-import importlib.util
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
+from _repair_runner import load_module
 
-def load_module():
-    """Load CSV-Validate-Repair.py module."""
-    src = Path(__file__).parent.parent / 'CSV-Validate-Repair.py'
-    spec = importlib.util.spec_from_file_location('csv_validate_repair', str(src))
-    mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(mod)
-    return mod
 
-
-# Load the module and get functions
+# Load the module (shared with the other test files) and get functions
 csv_module = load_module()
 validate_and_repair_csv = csv_module.validate_and_repair_csv
 process_folder_bulk = csv_module.process_folder_bulk
 archive_csv_file = csv_module.archive_csv_file
 
+# Non-UTF-8 inputs, encoded once at import: 'é' is a single non-UTF-8 byte in both
+LATIN1_CSV = "FileName,Size,CRC32,Path\nfilé.txt,100,12345678,\\path\\".encode('latin-1')
+CP1252_CSV = "FileName,Size,CRC32,Path\ncaf\u00e9.jpg,1,ABCDEF12,\\a\\\n".encode('cp1252')
+
 
 def test_archive_original_creates_zip(tmp_path):
     """Test archiving original CSV creates timestamped zip."""
@@ -155,8 +153,7 @@ def test_encoding_detection_fallback_chain(tmp_path):
     """Test encoding detection tries multiple encodings."""
     # Create file with Latin-1 encoding (not UTF-8)
     input_csv = tmp_path / "latin1.csv"
-    content = "FileName,Size,CRC32,Path\nfilé.txt,100,12345678,\\path\\"
-    input_csv.write_bytes(content.encode('latin-1'))
+    input_csv.write_bytes(LATIN1_CSV)
     
     output_csv = tmp_path / "repaired.csv"
     
@@ -184,8 +181,7 @@ def test_flag_nonutf8_treats_as_issue(tmp_path):
     # Create Latin-1 encoded file with non-ASCII characters
     input_csv = tmp_path / "latin1.csv"
     # Include Latin-1 specific characters (like é) that aren't valid UTF-8
-    content = "FileName,Size,CRC32,Path\nfilé.txt,100,12345678,\\path\\"
-    input_csv.write_bytes(content.encode('latin-1'))
+    input_csv.write_bytes(LATIN1_CSV)
     
     output_csv = tmp_path / "repaired.csv"
     log_file = tmp_path / "repair.log"
@@ -497,5 +493,546 @@ def test_insufficient_fields_extended(tmp_path):
         assert 'Comment' in row
 
 
+def test_invalid_character_repairs_match_regex(tmp_path):
+    """Test translation-table repairs replace the same characters the old regexes did."""
+    import re
+
+    samples = ['ok_名前.jpg', 'a<b>c:d"e|f?g*h.jpg', 'tab\there\x00\x1f.jpg', 'C:\\dir|x\\']
+    for value in samples:
+        issues = []
+        expected = re.sub(r'[<>:"|?*\x00-\x1f]', '_', value.strip())
+        assert csv_module.validate_filename(value, 1, issues, repair=True) == expected
+        issues = []
+        expected = re.sub(r'[<>"|?*\x00-\x1f]', '_', value.strip())
+        assert csv_module.validate_path(value, 1, issues, repair=True) == expected
+
+    # Hex extraction drops every non-hex character, including non-ASCII ones
+    issues = []
+    assert csv_module.validate_crc32('zé12ab-9F', 1, issues, repair=True) == '0012AB9F'
+
+
+@pytest.mark.parametrize("line", [
+    'a,b,c',
+    'a,b,',
+    '"quoted, comma",2,"say ""hi""",x',
+    '"unterminated, quote',
+    '"closed"tail,next',
+    'mid"quote,"",""""',
+    '',
+    ',',
+])
+def test_split_csv_line_matches_csv_reader(line):
+    """Test the single-pass splitter agrees with csv.reader's default dialect."""
+    import io
+    expected = next(csv.reader(io.StringIO(line)), [''])
+    assert csv_module._split_csv_line(line) == expected
+
+
+def test_backslash_region_keeps_commas_in_path():
+    """Test commas between a path's backslashes are not treated as delimiters."""
+    fields = csv_module.parse_csv_line_with_quotes('img.jpg,10,ABCDEF12,\\Set, Part 1\\,comment, more\n')
+    assert fields == ['img.jpg', '10', 'ABCDEF12', '\\Set, Part 1\\', 'comment', ' more']
+
+
+def test_duplicate_crc_requires_same_size(tmp_path):
+    """Test duplicates are grouped by normalized CRC and Size together."""
+    input_csv = tmp_path / "dupes.csv"
+    input_csv.write_text(
+        "FileName,Size,CRC32,Path\n"
+        "a.jpg,100,abcdef12,\\a\\\n"
+        "b.jpg,100,ABCDEF12,\\b\\\n"
+        "c.jpg,200,ABCDEF12,\\c\\\n"
+        "d.jpg,5,1A,\\d\\\n"
+        "e.jpg,5,0000001a,\\e\\\n",
+        encoding='utf-8'
+    )
+
+    issues, _, _, _ = validate_and_repair_csv(str(input_csv), dry_run=True)
+
+    duplicates = sorted((i.line_num, i.issue_type) for i in issues if i.issue_type.startswith("Duplicate"))
+    assert [line for line, _ in duplicates] == [2, 3, 5, 6]
+    assert "CRC=ABCDEF12, Size=100; also used on lines: 2, 3" in duplicates[0][1]
+    assert "CRC=0000001A, Size=5; also used on lines: 5, 6" in duplicates[2][1]
+
+
+def test_encoding_cache_falls_back_when_guess_fails(tmp_path):
+    """Test a cached encoding is only a first guess and never forces a bad decode."""
+    head = "FileName,Size,CRC32,Path\n" + "a.jpg,1,ABCDEF12,\\a\\\n" * 300
+    utf8_csv = tmp_path / "utf8.csv"
+    utf8_csv.write_bytes(head.encode('utf-8') + b"z.jpg,1,ABCDEF13,\\z\\\n")
+    # Same size and same leading bytes, but a cp1252 byte after the probed prefix
+    cp1252_csv = tmp_path / "cp1252.csv"
+    cp1252_csv.write_bytes(head.encode('utf-8') + b"\xe9.jpg,1,ABCDEF13,\\z\\\n")
+
+    csv_module._ENCODING_CACHE.clear()
+    validate_and_repair_csv(str(utf8_csv), dry_run=True)
+    assert len(csv_module._ENCODING_CACHE) == 1
+
+    issues, rows, _, _ = validate_and_repair_csv(str(cp1252_csv), dry_run=True, flag_nonutf8=True)
+    assert rows == 302
+    assert any("Non-UTF-8 encoding detected" in i.issue_type for i in issues)
+
+
+def test_encoding_cache_never_overrides_utf8(tmp_path):
+    """Test a cached legacy encoding is not applied to a same-prefix file that is valid UTF-8."""
+    head = "FileName,Size,CRC32,Path\n" + "a.jpg,1,ABCDEF12,\\a\\\n" * 300
+    # Same size and same leading bytes; only the byte(s) after the probed prefix differ
+    latin1_csv = tmp_path / "latin1.csv"
+    latin1_csv.write_bytes(head.encode('utf-8') + b"caf\xe9e.jpg,1,ABCDEF13,\\z\\\n")
+    utf8_csv = tmp_path / "utf8.csv"
+    utf8_csv.write_bytes(head.encode('utf-8') + "café.jpg,1,ABCDEF13,\\z\\\n".encode('utf-8'))
+    assert latin1_csv.stat().st_size == utf8_csv.stat().st_size
+
+    csv_module._ENCODING_CACHE.clear()
+    validate_and_repair_csv(str(latin1_csv), dry_run=True)
+    assert [encoding for encoding, _ in csv_module._ENCODING_CACHE.values()] != ['utf-8']
+
+    output_csv = tmp_path / "utf8_repaired.csv"
+    issues, _, _, _ = validate_and_repair_csv(str(utf8_csv), str(output_csv), repair=True, flag_nonutf8=True)
+    assert not any("Non-UTF-8 encoding detected" in i.issue_type for i in issues)
+    assert '"café.jpg"' in output_csv.read_text(encoding='utf-8')
+
+
+@pytest.mark.parametrize("value,repair,expected,issue_count", [
+    ('ABCDEF12', True, 'ABCDEF12', 0),
+    (' abcdef12 ', True, 'ABCDEF12', 0),
+    ('abcdef12', False, 'abcdef12', 0),
+    ('ABCDEF1G', False, 'ABCDEF1G', 1),
+    ('ABCDEF1', True, '0ABCDEF1', 1),
+    ('ABCDEF1234', True, 'ABCDEF12', 1),
+])
+def test_validate_crc32_fast_path(value, repair, expected, issue_count):
+    """Test already-valid CRCs return unchanged without issues and others still get repaired."""
+    issues = []
+    assert csv_module.validate_crc32(value, 1, issues, repair=repair) == expected
+    assert len(issues) == issue_count
+
+
+def test_validation_cache_skips_unchanged_clean_files(tmp_path, monkeypatch):
+    """Test bulk --cache skips clean unchanged CSVs and revalidates changed ones."""
+    folder = tmp_path / "csvs"
+    folder.mkdir()
+    clean = folder / "clean.csv"
+    clean.write_text("FileName,Size,CRC32,Path\na.jpg,1,ABCDEF12,\\a\\\n", encoding='utf-8')
+    dirty = folder / "dirty.csv"
+    dirty.write_text("FileName,Size,CRC32,Path\nb.jpg,x,ABCDEF13,\\b\\\n", encoding='utf-8')
+
+    first = process_folder_bulk(str(folder), skip_rewrite_if_clean=True, use_cache=True)
+    assert first['successful'] == 1 and first['with_issues'] == 1
+    cache = json.loads((folder / csv_module.VALIDATION_CACHE_NAME).read_text(encoding='utf-8'))
+    assert list(cache) == [os.path.abspath(clean)]
+
+    parsed = []
+    real_parse = csv_module.parse_csv_line_with_quotes
+    monkeypatch.setattr(csv_module, "parse_csv_line_with_quotes",
+                        lambda line, *args: parsed.append(line) or real_parse(line, *args))
+    second = process_folder_bulk(str(folder), skip_rewrite_if_clean=True, use_cache=True)
+    assert second['successful'] == 1 and second['with_issues'] == 1
+    assert [f['rows'] for f in second['files'] if f['name'] == 'clean.csv'] == [2]
+    assert not any('a.jpg' in line for line in parsed), "clean file should come from the cache"
+
+    # Any change to the content invalidates the entry
+    clean.write_text("FileName,Size,CRC32,Path\na.jpg,2,ABCDEF12,\\a\\\n", encoding='utf-8')
+    parsed.clear()
+    process_folder_bulk(str(folder), skip_rewrite_if_clean=True, use_cache=True)
+    assert any('a.jpg' in line for line in parsed)
+
+
+def test_field_issues_reported_once_per_row(tmp_path):
+    """Test filename and size problems are logged once, not once per validator pass."""
+    input_csv = tmp_path / "once.csv"
+    input_csv.write_text("FileName,Size,CRC32,Path\nbad|name.jpg,12a,ABCDEF12,\\a\\\n", encoding='utf-8')
+
+    issues, _, _, _ = validate_and_repair_csv(str(input_csv), dry_run=True)
+
+    assert [(i.field_name, i.issue_type) for i in issues] == [
+        ("FileName", "Invalid filename characters"),
+        ("Size", "Non-digit characters detected"),
+    ]
+
+
+@pytest.mark.parametrize("repair", [False, True])
+def test_clean_row_fast_path_matches_validators(tmp_path, repair):
+    """Test clean rows taking the fast path come out exactly as the validators would leave them."""
+    input_csv = tmp_path / "fast.csv"
+    input_csv.write_text(
+        "FileName,Size,CRC32,Path,Comment\n"
+        "a.jpg,10,ABCDEF12,\\a\\, note \n"
+        "b.jpg,11,abcdef13,\\b\\\n"
+        " c.jpg,12,ABCDEF14,\\c\\\n",
+        encoding='utf-8'
+    )
+    output_csv = tmp_path / "fast_out.csv"
+
+    issues, _, _, _ = validate_and_repair_csv(str(input_csv), str(output_csv), repair=repair)
+
+    with open(output_csv, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[1] == ['a.jpg', '10', 'ABCDEF12', '\\a\\', 'note']
+    assert rows[2] == ['b.jpg', '11', 'ABCDEF13' if repair else 'abcdef13', '\\b\\', '']
+    assert rows[3][0] == ('c.jpg' if repair else ' c.jpg')
+    assert bool(issues) == repair
+
+
+def test_bulk_archives_originals_in_background(tmp_path):
+    """Test bulk archiving waits for every background archive and counts them."""
+    folder = tmp_path / "bulk_archive"
+    folder.mkdir()
+    for i in range(6):
+        (folder / f"file{i}.csv").write_text(
+            f"FileName,Size,CRC32,Path\nf{i}.jpg,{i},ABCDEF1{i},\\d\\\n", encoding='utf-8')
+
+    results = process_folder_bulk(str(folder), archive_originals=True)
+
+    assert results['archived_count'] == 6
+    archive = folder / "Archive"
+    assert len(list(archive.glob("file*_*.zip"))) == 6
+    assert sorted(p.name for p in archive.glob("*.csv")) == [f"file{i}.csv" for i in range(6)]
+    assert not list(folder.glob("*.csv")), "originals should have been moved"
+
+
+def test_charset_detection_used_for_non_utf8(tmp_path, monkeypatch):
+    """Test the charset_normalizer guess is tried before the fixed fallback list."""
+    class _Best:
+        encoding = 'cp1252'
+
+    class _Matches:
+        def best(self):
+            return _Best()
+
+    monkeypatch.setattr(csv_module, "_charset_from_path", lambda path: _Matches())
+    csv_module._ENCODING_CACHE.clear()
+    input_csv = tmp_path / "western.csv"
+    input_csv.write_bytes(CP1252_CSV)
+
+    issues, _, _, _ = validate_and_repair_csv(str(input_csv), dry_run=True, flag_nonutf8=True)
+
+    assert [i.issue_type for i in issues] == ["Non-UTF-8 encoding detected: cp1252"]
+
+
+@pytest.mark.parametrize("path,row_count", [
+    ("Urlaub Café Müller", 200),
+    ("été", 1),
+    ("Jürgen Noël", 1),
+    ("Müller Urlaub Zürich", 2),
+])
+def test_real_charset_detection_keeps_western_text(tmp_path, path, row_count):
+    """Test cp1252 exports repair to the right characters with charset_normalizer installed."""
+    pytest.importorskip("charset_normalizer")
+    csv_module._ENCODING_CACHE.clear()
+    input_csv = tmp_path / "western.csv"
+    input_csv.write_bytes(("FileName,Size,CRC32,Path\n" + "".join(
+        f"img{i}.jpg,{i},ABCDEF{i % 100:02d},\\{path}\\\n" for i in range(row_count))).encode('cp1252'))
+    output_csv = tmp_path / "western_repaired.csv"
+
+    validate_and_repair_csv(str(input_csv), str(output_csv), repair=True)
+
+    # A detector guess such as big5 or mac_latin2 also decodes these bytes; it must not win
+    assert output_csv.read_text(encoding='utf-8').count(f'"\\{path}\\"') == row_count
+
+
+@pytest.mark.parametrize("value", ['0x1234AB', '1234_567', ' 1234567', '1234567\n', '１２３４５６７８', 'ABCDEFG1'])
+def test_is_hex8_rejects_int_parsable_lookalikes(value):
+    """Test the hex-8 check rejects strings int(s, 16) would accept or that are not ASCII hex."""
+    assert not csv_module._is_hex8(value)
+
+
+def test_header_detected_after_blank_lines_and_first_row_validated(tmp_path):
+    """Test the header is found on the first non-blank line and a headerless first row is still validated."""
+    with_header = tmp_path / "with_header.csv"
+    with_header.write_text("\n\nFileName,Size,CRC32,Path\na.jpg,1,ABCDEF12,\\a\\\n", encoding='utf-8')
+    issues, rows, _, _ = validate_and_repair_csv(str(with_header), dry_run=True)
+    assert issues == [] and rows == 2
+
+    no_header = tmp_path / "no_header.csv"
+    no_header.write_text("\nbad|name.jpg,1,ABCDEF12,\\a\\\nb.jpg,2,ABCDEF13,\\b\\\n", encoding='utf-8')
+    issues, rows, _, _ = validate_and_repair_csv(str(no_header), dry_run=True)
+    assert rows == 2
+    assert [(i.line_num, i.issue_type) for i in issues] == [(1, "Invalid filename characters")]
+
+
+def test_bulk_workers_match_sequential_results(tmp_path):
+    """Test bulk mode with worker processes reports and caches like the sequential run."""
+    summaries = {}
+    for workers in (1, 3):
+        folder = tmp_path / f"workers{workers}"
+        folder.mkdir()
+        for i in range(4):
+            size = 'x' if i == 2 else i
+            (folder / f"file{i}.csv").write_text(
+                f"FileName,Size,CRC32,Path\nf{i}.jpg,{size},ABCDEF1{i},\\d\\\n", encoding='utf-8')
+
+        results = process_folder_bulk(str(folder), skip_rewrite_if_clean=True, use_cache=True, workers=workers)
+        cache = json.loads((folder / csv_module.VALIDATION_CACHE_NAME).read_text(encoding='utf-8'))
+        summaries[workers] = (
+            [(f['name'], f['status'], f['issues'], f['rows']) for f in results['files']],
+            sorted(os.path.basename(key) for key in cache),
+        )
+
+    assert summaries[3] == summaries[1]
+    assert summaries[1][1] == ['file0.csv', 'file1.csv', 'file3.csv']
+
+
+def test_bulk_worker_failure_recorded_per_file(tmp_path, monkeypatch):
+    """Test a worker that dies (e.g. a broken process pool) marks only its file as ERROR."""
+    class _Pool:
+        # Runs jobs inline; the job for file1.csv behaves like a crashed child process
+        def __init__(self, max_workers):
+            pass
+
+        def submit(self, fn, job, *args):
+            future = Future()
+            if job[2] == 'file1.csv':
+                future.set_exception(BrokenProcessPool('worker died'))
+            else:
+                future.set_result(fn(job, *args))
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    monkeypatch.setattr(csv_module, "ProcessPoolExecutor", _Pool)
+    for i in range(3):
+        (tmp_path / f"file{i}.csv").write_text(
+            f"FileName,Size,CRC32,Path\nf{i}.jpg,{i},ABCDEF1{i},\\d\\\n", encoding='utf-8')
+
+    results = process_folder_bulk(str(tmp_path), dry_run=True, workers=3)
+
+    files = {f['name']: f for f in results['files']}
+    assert {name: f['status'] for name, f in files.items()} == {
+        'file0.csv': 'CLEAN', 'file1.csv': 'ERROR', 'file2.csv': 'CLEAN'}
+    assert results['failed'] == 1
+    assert files['file1.csv']['error'] == 'worker died'
+
+
+
+def test_bulk_pools_shut_down_when_interrupted(tmp_path, monkeypatch):
+    """Test an interrupted bulk run still shuts down its worker and archive pools."""
+    shutdowns = []
+
+    class _Pool:
+        # Every job's future fails as if Ctrl+C arrived while waiting for it
+        def __init__(self, max_workers):
+            pass
+
+        def submit(self, fn, job, *args):
+            future = Future()
+            future.set_exception(KeyboardInterrupt())
+            return future
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            shutdowns.append(('process', cancel_futures))
+
+    class _ArchivePool(csv_module.ThreadPoolExecutor):
+        def shutdown(self, wait=True, cancel_futures=False):
+            shutdowns.append(('archive', cancel_futures))
+            super().shutdown(wait, cancel_futures=cancel_futures)
+
+    def interrupted(*args):
+        raise KeyboardInterrupt()
+
+    monkeypatch.setattr(csv_module, "ProcessPoolExecutor", _Pool)
+    monkeypatch.setattr(csv_module, "ThreadPoolExecutor", _ArchivePool)
+    monkeypatch.setattr(csv_module, "_process_one", interrupted)
+    for i in range(2):
+        (tmp_path / f"file{i}.csv").write_text(
+            f"FileName,Size,CRC32,Path\nf{i}.jpg,{i},ABCDEF1{i},\\d\\\n", encoding='utf-8')
+
+    with pytest.raises(KeyboardInterrupt):
+        process_folder_bulk(str(tmp_path), dry_run=True, workers=2)
+    with pytest.raises(KeyboardInterrupt):
+        process_folder_bulk(str(tmp_path), archive_originals=True)
+    assert shutdowns == [('process', True), ('archive', True)]
+
+def test_duplicate_crc_one_issue_per_group(tmp_path):
+    """Test group_duplicates reports each duplicate CRC32/Size group once with all its lines."""
+    input_csv = tmp_path / "groups.csv"
+    input_csv.write_text(
+        "FileName,Size,CRC32,Path\n"
+        "a.jpg,10,ABCDEF12,\\a\\\n"
+        "b.jpg,10,ABCDEF12,\\b\\\n"
+        "c.jpg,10,ABCDEF12,\\c\\\n"
+        "d.jpg,20,12345678,\\d\\\n",
+        encoding='utf-8'
+    )
+
+    per_row, _, _, _ = validate_and_repair_csv(str(input_csv), dry_run=True)
+    grouped, _, _, _ = validate_and_repair_csv(str(input_csv), dry_run=True, group_duplicates=True)
+
+    assert len(per_row) == 3
+    assert len(grouped) == 1
+    assert grouped[0].line_num == 2
+    assert "3 rows on lines: 2, 3, 4" in grouped[0].issue_type
+
+
+@pytest.mark.parametrize("archive_compress, expected", [
+    ('none', zipfile.ZIP_STORED),
+    ('fast', zipfile.ZIP_DEFLATED),
+    ('default', zipfile.ZIP_DEFLATED),
+])
+def test_archive_compress_choice(tmp_path, archive_compress, expected):
+    """Test archive_compress selects the zip compression used for archived originals."""
+    input_csv = tmp_path / "arch.csv"
+    content = "FileName,Size,CRC32,Path\na.jpg,1,ABCDEF12,\\a\\\n"
+    input_csv.write_text(content, encoding='utf-8')
+
+    _, _, _, archive_path = validate_and_repair_csv(
+        str(input_csv), str(tmp_path / "out.csv"), archive_original=True, archive_compress=archive_compress)
+
+    with zipfile.ZipFile(archive_path) as zf:
+        info = zf.getinfo("arch.csv")
+        assert info.compress_type == expected
+        assert zf.read("arch.csv").decode('utf-8') == content
+
+
+def test_normalize_only_skips_duplicate_detection(tmp_path):
+    """Test normalize-only runs do not scan for duplicate CRC32 values."""
+    input_csv = tmp_path / "norm_dups.csv"
+    input_csv.write_text(
+        "FileName,Size,CRC32,Path\na.jpg,10,abcdef12,\\a\\\nb.jpg,10,ABCDEF12,\\b\\\n",
+        encoding='utf-8'
+    )
+
+    issues, _, _, _ = validate_and_repair_csv(str(input_csv), dry_run=True)
+    assert any(i.issue_type.startswith("Duplicate CRC32") for i in issues)
+
+    issues, _, _, _ = validate_and_repair_csv(str(input_csv), dry_run=True, normalize_only=True)
+    assert not any(i.issue_type.startswith("Duplicate CRC32") for i in issues)
+
+
+def test_streamed_output_matches_buffered_output(tmp_path, monkeypatch):
+    """Test rows streamed to the writer thread in batches match the buffered write, duplicates included."""
+    monkeypatch.setattr(csv_module, "WRITE_BATCH_ROWS", 3)
+    lines = ["FileName,Size,CRC32,Path"]
+    lines += [f"f{i}.jpg,{i},{i:08X},\\d\\" for i in range(10)]
+    lines += ["dup.jpg,4,00000004,\\e\\", " bad.jpg,x,abc,\\f\\"]
+    input_csv = tmp_path / "stream.csv"
+    input_csv.write_text("\n".join(lines) + "\n", encoding='utf-8')
+
+    streamed_csv = tmp_path / "streamed.csv"
+    streamed, _, _, _ = validate_and_repair_csv(str(input_csv), str(streamed_csv), repair=True)
+    buffered_csv = tmp_path / "buffered.csv"
+    buffered, _, _, _ = validate_and_repair_csv(str(input_csv), str(buffered_csv), repair=True, skip_rewrite_if_clean=True)
+
+    assert streamed_csv.read_bytes() == buffered_csv.read_bytes()
+    assert [str(i) for i in streamed] == [str(i) for i in buffered]
+    assert [i.line_num for i in streamed if i.issue_type.startswith("Duplicate")] == [6, 12]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_streamed_output_failure_keeps_previous_file(tmp_path, monkeypatch):
+    """Test a run that fails mid-way leaves the existing output file untouched."""
+    monkeypatch.setattr(csv_module, "WRITE_BATCH_ROWS", 2)
+    input_csv = tmp_path / "fail.csv"
+    input_csv.write_text("".join(f"f{i}.jpg,{i},ABCDEF1{i},\\d\\\n" for i in range(6)), encoding='utf-8')
+    output_csv = tmp_path / "fail_out.csv"
+    output_csv.write_text("previous", encoding='utf-8')
+
+    real_validate = csv_module.validate_path
+    def failing_validate_path(value, line_num, *args, **kwargs):
+        if line_num == 5:
+            raise RuntimeError("boom")
+        return real_validate(value, line_num, *args, **kwargs)
+    monkeypatch.setattr(csv_module, "validate_path", failing_validate_path)
+    monkeypatch.setattr(csv_module, "_INVALID_PATH_SET", frozenset('\\'))
+
+    issues, _, _, _ = validate_and_repair_csv(str(input_csv), str(output_csv))
+
+    assert issues is None
+    assert output_csv.read_text(encoding='utf-8') == "previous"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("skip_rewrite_if_clean", [False, True])
+@pytest.mark.parametrize("quote, expected", [
+    ('all', '"a.jpg","1","ABCDEF12","\\a,b\\",""'),
+    ('minimal', 'a.jpg,1,ABCDEF12,"\\a,b\\",'),
+])
+def test_quote_mode_of_repaired_csv(tmp_path, quote, expected, skip_rewrite_if_clean):
+    """Test --quote controls field quoting in both the streamed and the buffered write."""
+    input_csv = tmp_path / "quote.csv"
+    input_csv.write_text('FileName,Size,CRC32,Path\n a.jpg,1,abcdef12,"\\a,b\\"\n', encoding='utf-8')
+    output_csv = tmp_path / "quote_out.csv"
+
+    validate_and_repair_csv(str(input_csv), str(output_csv), repair=True, quote=quote,
+                            skip_rewrite_if_clean=skip_rewrite_if_clean)
+
+    assert output_csv.read_text(encoding='utf-8').splitlines()[1] == expected
+
+
+def test_skip_rewrite_if_clean_still_writes_silent_normalization(tmp_path):
+    """Test skip_rewrite_if_clean only skips the write when no field would change."""
+    lower = tmp_path / "lower.csv"
+    lower.write_text("FileName,Size,CRC32,Path\na.jpg,1,abcdef12,\\a\\\n", encoding='utf-8')
+    lower_out = tmp_path / "lower_out.csv"
+    issues, _, output, _ = validate_and_repair_csv(
+        str(lower), str(lower_out), normalize_crc32=True, skip_rewrite_if_clean=True)
+    assert issues == []
+    assert output == str(lower_out)
+    assert '"ABCDEF12"' in lower_out.read_text(encoding='utf-8')
+
+    upper = tmp_path / "upper.csv"
+    upper.write_text("FileName,Size,CRC32,Path\na.jpg,1,ABCDEF12,\\a\\\n", encoding='utf-8')
+    upper_out = tmp_path / "upper_out.csv"
+    issues, _, output, _ = validate_and_repair_csv(
+        str(upper), str(upper_out), normalize_crc32=True, skip_rewrite_if_clean=True)
+    assert issues == [] and output is None
+    assert not upper_out.exists()
+
+
+
+def test_skip_rewrite_if_clean_ignores_validation_only_trimming(tmp_path):
+    """Test a validation-only run does not rewrite a clean file whose CRC32 has padding."""
+    padded = tmp_path / "padded.csv"
+    padded.write_text("FileName,Size,CRC32,Path,Comment\na.bin,12,ABCDEF12 ,/x,\n", encoding='utf-8')
+    padded_out = tmp_path / "padded_out.csv"
+    issues, _, output, _ = validate_and_repair_csv(str(padded), str(padded_out), skip_rewrite_if_clean=True)
+    assert issues == [] and output is None
+    assert not padded_out.exists()
+
+def test_bulk_mode_block_buffers_console_stdout(tmp_path, monkeypatch):
+    """Test bulk mode turns off line buffering while it runs and restores it afterwards."""
+    import io
+    folder = tmp_path / "buffered"
+    folder.mkdir()
+    (folder / "a.csv").write_text("FileName,Size,CRC32,Path\na.jpg,1,ABCDEF12,\\a\\\n", encoding='utf-8')
+    raw = io.BytesIO()
+    console = io.TextIOWrapper(raw, encoding='utf-8', line_buffering=True)
+    monkeypatch.setattr(sys, "stdout", console)
+
+    seen = []
+    real_process_one = csv_module._process_one
+    def recording_process_one(*args, **kwargs):
+        seen.append(sys.stdout.line_buffering)
+        return real_process_one(*args, **kwargs)
+    monkeypatch.setattr(csv_module, "_process_one", recording_process_one)
+
+    results = process_folder_bulk(str(folder), use_subfolders=False)
+
+    assert results['successful'] == 1
+    assert seen == [False]
+    assert console.line_buffering is True
+    assert b"BULK PROCESSING SUMMARY" in raw.getvalue()
+
+
+def test_bulk_mode_uses_one_run_timestamp(tmp_path):
+    """Test every file of a bulk run shares the run's archive and log timestamps."""
+    folder = tmp_path / "stamped"
+    folder.mkdir()
+    for i in range(3):
+        (folder / f"file{i}.csv").write_text(
+            f"FileName,Size,CRC32,Path\n f{i}.jpg,{i},ABCDEF1{i},\\d\\\n", encoding='utf-8')
+
+    process_folder_bulk(str(folder), archive_originals=True, repair=True)
+
+    stamps = {p.stem.split('_', 1)[1] for p in (folder / "Archive").glob("*.zip")}
+    assert len(stamps) == 1
+    log_stamps = {
+        next(line for line in p.read_text(encoding='utf-8').splitlines() if line.startswith("Timestamp:"))
+        for p in (folder / "Logs").glob("*_repair_log.txt")
+    }
+    assert len(log_stamps) == 1
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -1,19 +1,25 @@
+import contextlib
 import csv
-import subprocess
-import sys
+import os
+from dataclasses import dataclass
 from pathlib import Path
 
+import pytest
 
-REPO_ROOT = Path(__file__).resolve().parent.parent
-SCRIPT = REPO_ROOT / 'CSV-Validate-Repair.py'
+from _fs_helpers import write_file
+from _repair_runner import DiscardWriter
 
 
-def run_script(csv_path, extra_args=None):
-    args = [sys.executable, str(SCRIPT), str(csv_path)]
-    if extra_args:
-        args += extra_args
-    proc = subprocess.run(args, capture_output=True, text=True)
-    return proc
+@pytest.fixture
+def tmp_path(shared_tmp):
+    """Tests here only write a few small files; use the cheaper shared_tmp (see conftest.py)."""
+    return shared_tmp
+
+
+@pytest.fixture
+def run_script(run_repair):
+    """Run the script's main() in-process (see conftest.py)."""
+    return run_repair
 
 
 def read_csv_rows(path):
@@ -22,42 +28,110 @@ def read_csv_rows(path):
         return [row for row in reader]
 
 
-def test_semicolon_delimiter_flags_issue(tmp_path):
-    csv_file = tmp_path / 'semi.csv'
-    # Semicolon-delimited CSV (legacy) — script expects commas
-    content = 'FileName;Size;CRC32;Path;Comment\nimg.jpg;10;ABCDEF01;folder;ok\n'
-    csv_file.write_text(content, encoding='utf-8')
+def read_plain_rows(path):
+    """
+    Split a QUOTE_ALL repaired CSV without the csv module.
 
-    proc = run_script(csv_file, extra_args=['--repair'])
-    # Should flag issues due to insufficient fields when parsed by comma
-    assert proc.returncode == 2
-    log = tmp_path / 'semi_repair_log.txt'
-    assert log.exists()
+    Only for outputs whose fields contain no quotes, commas or line breaks;
+    use read_csv_rows() for anything else.
+    """
+    text = path.read_text(encoding='utf-8')
+    return [line[1:-1].split('","') for line in text.splitlines()]
 
 
-def test_tab_delimited_flags_issue(tmp_path):
-    csv_file = tmp_path / 'tab.csv'
-    content = 'FileName\tSize\tCRC32\tPath\tComment\nimg.jpg\t10\tABCDEF01\tfolder\tok\n'
-    csv_file.write_text(content, encoding='utf-8')
+# Inputs that only need a plain --repair, repaired together by one bulk run:
+# file stem -> bytes
+EXOTIC_CSVS = {
+    # Semicolon-delimited CSV (legacy) — script expects commas
+    'semi': b'FileName;Size;CRC32;Path;Comment\nimg.jpg;10;ABCDEF01;folder;ok\n',
+    'tab': b'FileName\tSize\tCRC32\tPath\tComment\nimg.jpg\t10\tABCDEF01\tfolder\tok\n',
+    'single_comma': (
+        b'FileName,Size,CRC32,Path,Comment\n'
+        b'a.jpg,1,AAAABBBB,,\n'
+        # explicit single-comma path value
+        b'b.jpg,2,CCCCDDDD,",",note\n'
+    ),
+    # path contains multiple backslashes before a comma sequence
+    'backslashes': b'FileName,Size,CRC32,Path,Comment\nx.jpg,5,ABC12345,folder\\\\,,note\n',
+    # Null bytes are unusual in CSVs
+    'nullbyte': b'FileName,Size,CRC32,Path,Comment\nimg.jpg,1,ABCDEF01,folder\x00,ok\n',
+    # Fields quoted with single quotes are non-standard; parser should treat them as literal quotes
+    'singlequote': b"'FileName','Size','CRC32','Path','Comment'\n'q.jpg','3','ABCDEF02','folder','c'\n",
+}
+
+
+@dataclass
+class ExoticRepairRun:
+    """Outputs of one process_folder_bulk(repair=True) run over EXOTIC_CSVS."""
+    output_dir: Path
+    files: dict  # CSV name -> that file's entry in results['files']
+    written: frozenset  # names in output_dir, listed once instead of a stat per check
+
+    def status(self, stem):
+        # Bulk statuses match the single-file exit codes: CLEAN 0, ISSUES_FOUND 2, ERROR/FAILED 1
+        return self.files[stem + '.csv']['status']
+
+    def repaired(self, stem):
+        # Bulk mode writes the repaired CSV under its original name
+        return self.output_dir / (stem + '.csv')
+
+    def log(self, stem):
+        return self.output_dir / (stem + '_repair_log.txt')
+
+    def wrote(self, path):
+        return path.name in self.written
+
+
+@pytest.fixture(scope="module")
+def bulk_repair(tmp_path_factory, csv_validate_module):
+    """Repair every EXOTIC_CSVS input in a single bulk-mode call."""
+    source_dir = tmp_path_factory.mktemp("exotic_src")
+    for stem, data in EXOTIC_CSVS.items():
+        write_file(source_dir / (stem + '.csv'), data)
+    output_dir = tmp_path_factory.mktemp("exotic_out")
+    with contextlib.redirect_stdout(DiscardWriter()):
+        results = csv_validate_module.process_folder_bulk(
+            str(source_dir), output_folder=str(output_dir), use_subfolders=False, repair=True)
+    assert results['total_files'] == len(EXOTIC_CSVS)
+    return ExoticRepairRun(output_dir, {entry['name']: entry for entry in results['files']},
+                           frozenset(os.listdir(output_dir)))
+
+
+# Formats the comma parser cannot read: each should be flagged and logged.
+# Semicolon/tab: insufficient fields when parsed by comma; single quotes: header
+# detection mismatch, since they are kept as literal characters
+FLAGGED_FORMATS = ('semi', 'tab', 'singlequote')
+
+
+@pytest.mark.parametrize("stem", FLAGGED_FORMATS)
+def test_nonstandard_format_flags_issue(bulk_repair, stem):
+    assert bulk_repair.status(stem) == 'ISSUES_FOUND'
+    assert bulk_repair.wrote(bulk_repair.log(stem))
+
+
+@pytest.mark.parametrize("stem,returncodes", [
+    ('semi', (2,)),
+    ('tab', (2,)),
+    ('singlequote', (2,)),
+    # Expect the script to error or flag the encoding/parse issue
+    ('nullbyte', (1, 2)),
+])
+def test_single_file_repair_exit_code(tmp_path, run_script, stem, returncodes):
+    # End-to-end single-file `--repair` run through main(): the shared bulk run
+    # reports per-file statuses and never reaches these exit codes
+    csv_file = tmp_path / (stem + '.csv')
+    write_file(csv_file, EXOTIC_CSVS[stem])
 
     proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode == 2
-    log = tmp_path / 'tab_repair_log.txt'
-    assert log.exists()
-
+    assert proc.returncode in returncodes
+    # Ensure a log exists when issues flagged
+    assert (tmp_path / (stem + '_repair_log.txt')).exists() or proc.returncode == 1
 
-def test_single_comma_path_preserved(tmp_path):
-    csv_file = tmp_path / 'single_comma.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write('FileName,Size,CRC32,Path,Comment\n')
-        f.write('a.jpg,1,AAAABBBB,,\n')
-        # explicit single-comma path value
-        f.write('b.jpg,2,CCCCDDDD,",",note\n')
 
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    repaired = tmp_path / 'single_comma_repaired.csv'
-    assert repaired.exists()
+def test_single_comma_path_preserved(bulk_repair):
+    assert bulk_repair.status('single_comma') in ('CLEAN', 'ISSUES_FOUND')
+    repaired = bulk_repair.repaired('single_comma')
+    assert bulk_repair.wrote(repaired)
     rows = read_csv_rows(repaired)
     # find row for b.jpg and ensure Path is a single comma or quoted comma preserved
     found = False
@@ -68,55 +142,26 @@ def test_single_comma_path_preserved(tmp_path):
     assert found
 
 
-def test_multiple_backslashes_before_comma(tmp_path):
-    csv_file = tmp_path / 'backslashes.csv'
-    # path contains multiple backslashes before a comma sequence
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write('FileName,Size,CRC32,Path,Comment\n')
-        f.write('x.jpg,5,ABC12345,folder\\\\,,note\n')
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    assert proc.returncode in (0, 2)
-    repaired = tmp_path / 'backslashes_repaired.csv'
-    assert repaired.exists()
+def test_multiple_backslashes_before_comma(bulk_repair):
+    assert bulk_repair.status('backslashes') in ('CLEAN', 'ISSUES_FOUND')
+    repaired = bulk_repair.repaired('backslashes')
+    assert bulk_repair.wrote(repaired)
     rows = read_csv_rows(repaired)
     # Ensure Path field contains backslashes (one or more)
     assert any('\\' in r[3] for r in rows if len(r) > 3)
 
 
-def test_null_byte_in_field_reports_issue(tmp_path):
-    csv_file = tmp_path / 'nullbyte.csv'
-    # Null bytes are unusual in CSVs; write using bytes mode
-    b = b'FileName,Size,CRC32,Path,Comment\nimg.jpg,1,ABCDEF01,folder\x00,ok\n'
-    csv_file.write_bytes(b)
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    # Expect the script to error or flag the encoding/parse issue (exit 1 or 2)
-    assert proc.returncode in (1, 2)
+def test_null_byte_in_field_reports_issue(bulk_repair):
+    status = bulk_repair.status('nullbyte')
+    # Expect the script to error or flag the encoding/parse issue
+    assert status in ('ERROR', 'FAILED', 'ISSUES_FOUND')
     # Ensure a log exists when issues flagged
-    log = tmp_path / 'nullbyte_repair_log.txt'
-    assert log.exists() or proc.returncode == 1
+    assert bulk_repair.wrote(bulk_repair.log('nullbyte')) or status != 'ISSUES_FOUND'
 
 
-def test_single_quote_quoting_is_flagged(tmp_path):
-    csv_file = tmp_path / 'singlequote.csv'
-    # Fields quoted with single quotes are non-standard; parser should treat them as literal quotes
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write("'FileName','Size','CRC32','Path','Comment'\n")
-        f.write("'q.jpg','3','ABCDEF02','folder','c'\n")
-
-    proc = run_script(csv_file, extra_args=['--repair'])
-    # Likely flagged as issues due to header detection mismatch or format
-    assert proc.returncode == 2
-    log = tmp_path / 'singlequote_repair_log.txt'
-    assert log.exists()
-
-
-def test_leading_trailing_spaces_behavior(tmp_path):
+def test_leading_trailing_spaces_behavior(tmp_path, run_script):
     csv_file = tmp_path / 'spaces.csv'
-    with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-        f.write('FileName,Size,CRC32,Path,Comment\n')
-        f.write('  spaced.jpg  ,  10 , abcdef01 , folder , note \n')
+    write_file(csv_file, b'FileName,Size,CRC32,Path,Comment\n  spaced.jpg  ,  10 , abcdef01 , folder , note \n')
 
     # Validation-only: spaces should be reported but not trimmed
     proc = run_script(csv_file, extra_args=[])
@@ -127,6 +172,6 @@ def test_leading_trailing_spaces_behavior(tmp_path):
     assert proc2.returncode in (0, 2)
     repaired = tmp_path / 'spaces_repaired.csv'
     assert repaired.exists()
-    rows = read_csv_rows(repaired)
+    rows = read_plain_rows(repaired)
     # filename should be trimmed
     assert rows[1][0] == 'spaced.jpg'